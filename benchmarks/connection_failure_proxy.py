@@ -0,0 +1,39 @@
+# -*- encoding: UTF-8 -*-
+"""
+Micro-benchmark of the per-call overhead of ConnectionFailureProxy.
+Compares resolving the proxied pymongo methods with the cache of child
+proxies enabled against resolving them with the cache disabled.
+No database is needed, the proxied methods are only resolved, not called.
+
+Usage: PYTHONPATH=. python benchmarks/connection_failure_proxy.py
+"""
+from __future__ import absolute_import, print_function, unicode_literals
+
+import timeit
+
+from mongorest.database import ConnectionFailureProxy, db
+
+NUMBER = 100000
+
+
+def resolve():
+    return db['collection'].find_one, db.collection.insert_one
+
+
+def benchmark(cache_size):
+    ConnectionFailureProxy.cache_size = cache_size
+    db._attributes.clear()
+    db._items.clear()
+
+    return min(timeit.repeat(resolve, number=NUMBER, repeat=5)) / NUMBER
+
+
+if __name__ == '__main__':
+    default = ConnectionFailureProxy.cache_size
+
+    uncached, cached = benchmark(0), benchmark(default)
+    ConnectionFailureProxy.cache_size = default
+
+    print('uncached: {0:.3f} us per call'.format(uncached * 1e6))
+    print('cached:   {0:.3f} us per call'.format(cached * 1e6))
+    print('speedup:  {0:.1f}x'.format(uncached / cached))
@@ -4,5 +4,6 @@ from __future__ import absolute_import, unicode_literals
 from .collection import Collection
 from .wrappers import Request, Response
 from .utils import deserialize, serialize
+from .wsgi import warmup
 
 __version__ = '3.2.8'
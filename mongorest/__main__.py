@@ -0,0 +1,71 @@
+# -*- encoding: UTF-8 -*-
+from __future__ import absolute_import, unicode_literals
+
+import argparse
+import logging
+import os
+from pydoc import locate
+
+__all__ = [
+    'main',
+]
+
+
+def main(argv=None):
+    """
+    Command line interface, run as python -m mongorest serve <app>
+    """
+    parser = argparse.ArgumentParser(prog='python -m mongorest')
+    commands = parser.add_subparsers(dest='command')
+    commands.required = True
+
+    serve = commands.add_parser(
+        'serve', help='Serve a WSGI app with pre-forked worker processes'
+    )
+    serve.add_argument(
+        'app', help='Dotted path to the WSGI app, like myproject.wsgi.app'
+    )
+    serve.add_argument('--host', help='Defaults to SERVER[\'HOST\']')
+    serve.add_argument(
+        '--port', type=int, help='Defaults to SERVER[\'PORT\'], 0 for any'
+    )
+    serve.add_argument(
+        '--workers', type=int,
+        help='Defaults to SERVER[\'WORKERS\'] or the number of CPUs'
+    )
+    serve.add_argument(
+        '--reuse-port', action='store_true', default=None,
+        help='Every worker binds its own socket with SO_REUSEPORT'
+    )
+    serve.add_argument(
+        '--graceful-timeout', type=float,
+        help='Seconds a worker has to stop before it is killed'
+    )
+    serve.add_argument(
+        '--settings',
+        help='Settings module, like one for a local test database. '
+             'Defaults to MONGOREST_SETTINGS_MODULE'
+    )
+
+    args = parser.parse_args(argv)
+
+    if args.settings:
+        os.environ['MONGOREST_SETTINGS_MODULE'] = args.settings
+
+    app = locate(args.app) if args.app else None
+    if app is None:
+        parser.error('Could not find the app \'{0}\''.format(args.app))
+
+    logging.basicConfig(
+        level=logging.INFO, format='[%(process)d] %(levelname)s %(message)s'
+    )
+
+    from .server import Server
+    Server(
+        app, args.host, args.port, args.workers, args.reuse_port,
+        args.graceful_timeout
+    ).run()
+
+
+if __name__ == '__main__':
+    main()
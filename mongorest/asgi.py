@@ -0,0 +1,251 @@
+# -*- encoding: UTF-8 -*-
+"""
+ASGI counterparts of the WSGI classes and an awaitable Collection API.
+PyMongo is blocking, so the blocking work runs on a bounded thread pool of
+ASYNC_WORKERS threads while reading requests and writing responses is done
+on the event loop.
+This module requires Python 3.6 or newer and is not imported by mongorest.
+"""
+from __future__ import absolute_import, unicode_literals
+
+import asyncio
+import io
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from .settings import DEFAULT, settings
+from .wsgi import WSGIDispatcher
+
+__all__ = [
+    'ASGIWrapper',
+    'ASGIDispatcher',
+    'AsyncCollection',
+    'get_executor',
+    'iterate',
+    'run_in_executor',
+]
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    """
+    Returns the thread pool blocking calls run on, creating it on first use
+    and again in every forked process
+    """
+    global _executor
+
+    pid = os.getpid()
+    if _executor is None or _executor[0] != pid:
+        with _executor_lock:
+            if _executor is None or _executor[0] != pid:
+                _executor = (pid, ThreadPoolExecutor(settings.ASYNC_WORKERS))
+
+    return _executor[1]
+
+
+async def run_in_executor(function, *args, **kwargs):
+    """
+    Runs the blocking function on the executor and returns its result
+    """
+    return await asyncio.get_event_loop().run_in_executor(
+        get_executor(), partial(function, *args, **kwargs)
+    )
+
+
+async def iterate(iterable):
+    """
+    Asynchronously iterates over a blocking iterable, like the generator of a
+    streamed find, getting each item on the executor
+    """
+    iterator = await run_in_executor(iter, iterable)
+    sentinel = object()
+
+    while True:
+        item = await run_in_executor(next, iterator, sentinel)
+        if item is sentinel:
+            break
+
+        yield item
+
+
+class AsyncCollection(object):
+    """
+    Awaitable version of a Collection, or of one of its documents.
+    Its methods are the ones of the wrapped object, but they return
+    coroutines that run them on the executor, like:
+        books = await AsyncCollection(Book).find({'genre': 'fantasy'})
+        errors = await AsyncCollection(Book(document)).insert()
+    """
+
+    def __init__(self, wrapped):
+        self.wrapped = wrapped
+
+    def __getattr__(self, name):
+        if name == 'wrapped':
+            raise AttributeError(name)
+
+        attribute = getattr(self.wrapped, name)
+        if not hasattr(attribute, '__call__'):
+            return attribute
+
+        async def method(*args, **kwargs):
+            return await run_in_executor(attribute, *args, **kwargs)
+
+        method.__name__ = name
+        method.__doc__ = attribute.__doc__
+
+        return method
+
+
+class ASGIWrapper(object):
+    """
+    ASGI application that runs a WSGI application, like a WSGIWrapper, on the
+    executor.
+    The request body is read and the response is sent on the event loop, so
+    only the work of the WSGI application itself holds a thread.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            return await self.lifespan(scope, receive, send)
+
+        if scope['type'] != 'http':
+            raise ValueError(
+                'Unsupported scope type: \'{0}\''.format(scope['type'])
+            )
+
+        body = io.BytesIO()
+        more_body = True
+        while more_body:
+            message = await receive()
+            body.write(message.get('body', b''))
+            more_body = message.get('more_body', False)
+        length = body.tell()
+        body.seek(0)
+
+        response = {}
+
+        def start_response(status, headers, exc_info=None):
+            response['status'] = int(status.split(' ', 1)[0])
+            response['headers'] = [
+                (name.lower().encode('latin-1'), value.encode('latin-1'))
+                for (name, value) in headers
+            ]
+
+        environ = self.environ(scope, body)
+        environ.setdefault('CONTENT_LENGTH', str(length))
+
+        chunks = await run_in_executor(self.app, environ, start_response)
+
+        try:
+            started = False
+            async for chunk in iterate(chunks):
+                if not started:
+                    started = True
+                    await send(dict(response, type='http.response.start'))
+
+                if chunk:
+                    await send({
+                        'type': 'http.response.body',
+                        'body': chunk,
+                        'more_body': True,
+                    })
+
+            if not started:
+                await send(dict(response, type='http.response.start'))
+
+            await send({'type': 'http.response.body', 'body': b''})
+        finally:
+            if hasattr(chunks, 'close'):
+                await run_in_executor(chunks.close)
+
+    async def lifespan(self, scope, receive, send):
+        """
+        Answers the startup and shutdown messages of the server
+        """
+        while True:
+            message = await receive()
+
+            if message['type'] == 'lifespan.startup':
+                await run_in_executor(self.startup)
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    def startup(self):
+        """
+        Called on the executor when the server starts
+        """
+
+    @staticmethod
+    def environ(scope, body):
+        """
+        Returns the WSGI environ of the request of the scope
+        """
+        server = scope.get('server') or ('localhost', 80)
+        client = scope.get('client') or ('', 0)
+
+        environ = {
+            'REQUEST_METHOD': scope['method'],
+            'SCRIPT_NAME': scope.get('root_path', ''),
+            'PATH_INFO': scope['path'].encode('utf-8').decode('latin-1'),
+            'QUERY_STRING': scope.get('query_string', b'').decode('latin-1'),
+            'SERVER_NAME': server[0],
+            'SERVER_PORT': str(server[1]),
+            'SERVER_PROTOCOL': 'HTTP/{0}'.format(
+                scope.get('http_version', '1.1')
+            ),
+            'REMOTE_ADDR': client[0],
+            'REMOTE_PORT': str(client[1]),
+            'wsgi.version': (1, 0),
+            'wsgi.url_scheme': scope.get('scheme', 'http'),
+            'wsgi.input': body,
+            'wsgi.errors': sys.stderr,
+            'wsgi.multithread': True,
+            'wsgi.multiprocess': False,
+            'wsgi.run_once': False,
+        }
+
+        for (name, value) in scope.get('headers', []):
+            name = name.decode('latin-1').upper().replace('-', '_')
+            value = value.decode('latin-1')
+
+            if name not in ('CONTENT_TYPE', 'CONTENT_LENGTH'):
+                name = 'HTTP_{0}'.format(name)
+
+            if name in environ:
+                value = '{0},{1}'.format(environ[name], value)
+
+            environ[name] = value
+
+        return environ
+
+
+class ASGIDispatcher(ASGIWrapper):
+    """
+    ASGI counterpart of the WSGIDispatcher.
+    It mounts the resources the same way, with the MIDDLEWARES setting, and
+    warms them up when the server starts.
+    """
+
+    def __init__(self, app=None, resources=None):
+        dispatcher = WSGIDispatcher(app, resources)
+        self.resources = dispatcher.resources
+
+        super(ASGIDispatcher, self).__init__(dispatcher)
+
+    def startup(self):
+        self.app.warm_up(
+            None if dict(
+                DEFAULT['WARMUP'], **settings.WARMUP
+            )['ENABLED'] else 0
+        )
@@ -0,0 +1,181 @@
+# -*- encoding: UTF-8 -*-
+from __future__ import absolute_import, unicode_literals
+
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from .utils import serialize
+
+__all__ = [
+    'DocumentCache',
+]
+
+
+class DocumentCache(object):
+    """
+    Thread-safe cache of the documents read by a Collection.
+    Holds up to size documents for ttl seconds each, evicting the least
+    recently used one when full, and counts its hits and misses.
+    Documents read by their _id alone are indexed by it, and the ones read
+    by other filters are kept apart, so evict only touches the documents it
+    removes.
+    """
+
+    def __init__(self, size, ttl):
+        self.size = size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._documents = OrderedDict()
+        self._ids = {}
+        self._filtered = set()
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._documents)
+
+    @staticmethod
+    def key(filter=None, *args, **kwargs):
+        """
+        Returns the key of a read with the given arguments.
+        The order of the fields of the filter does not change the key.
+        """
+        if filter is None:
+            filter = {}
+        elif not isinstance(filter, dict):
+            filter = {'_id': filter}
+
+        return serialize(
+            [sorted(filter.items()), args, sorted(kwargs.items())]
+        )
+
+    @staticmethod
+    def id_of(filter=None, *args, **kwargs):
+        """
+        Returns the _id the filter reads the document by, if it reads it by
+        its _id alone, or None otherwise
+        """
+        if filter is None:
+            return None
+
+        if not isinstance(filter, dict):
+            return filter
+
+        if list(filter) == ['_id'] and not isinstance(filter['_id'], dict):
+            return filter['_id']
+
+        return None
+
+    def get(self, key, load, _id=None):
+        """
+        Returns a copy of the cached document with the given key.
+        If it is not cached or is expired, returns the document returned by
+        load, caching it unless the cache was cleared while it was loaded.
+        _id is the one the document is read by, if it is read by its _id.
+        """
+        now = time.time()
+
+        with self._lock:
+            entry = self._documents.pop(key, None)
+
+            if entry is not None and entry[0] > now:
+                self._documents[key] = entry
+                self.hits += 1
+
+                return copy.deepcopy(entry[1])
+
+            if entry is not None:
+                self._unindex(key, entry)
+
+            self.misses += 1
+            generation = self._generation
+
+        document = load()
+
+        with self._lock:
+            if generation == self._generation:
+                self._remove(key)
+                self._add(key, (now + self.ttl, copy.deepcopy(document), _id))
+
+                while len(self._documents) > self.size:
+                    self._unindex(*self._documents.popitem(last=False))
+
+        return document
+
+    def evict(self, _id):
+        """
+        Removes the documents that may have changed when the document with
+        the given _id was written: the ones read by that _id and all the
+        ones read by other filters, which it may now pass or not.
+        """
+        with self._lock:
+            try:
+                keys = self._ids.pop(_id, ())
+            except TypeError:
+                keys = ()
+
+            for key in list(keys) + list(self._filtered):
+                self._documents.pop(key, None)
+
+            self._filtered.clear()
+            self._generation += 1
+
+    def clear(self):
+        """
+        Removes all the cached documents
+        """
+        with self._lock:
+            self._documents.clear()
+            self._ids.clear()
+            self._filtered.clear()
+            self._generation += 1
+
+    def _add(self, key, entry):
+        """
+        Caches the entry under the given key and indexes it by the _id it
+        was read by, or with the ones read by other filters.
+        Documents with an _id that cannot be hashed are kept with the latter.
+        """
+        self._documents[key] = entry
+
+        try:
+            if entry[2] is not None:
+                self._ids.setdefault(entry[2], set()).add(key)
+                return
+        except TypeError:
+            pass
+
+        self._filtered.add(key)
+
+    def _remove(self, key):
+        """
+        Removes the entry cached under the given key, if any
+        """
+        entry = self._documents.pop(key, None)
+        if entry is not None:
+            self._unindex(key, entry)
+
+    def _unindex(self, key, entry):
+        """
+        Removes the key of the entry from the index it was added to
+        """
+        self._filtered.discard(key)
+
+        try:
+            keys = self._ids.get(entry[2])
+        except TypeError:
+            return
+
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._ids[entry[2]]
+
+    def stats(self):
+        """
+        Returns the hits, misses and the number of cached documents
+        """
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self)}
@@ -7,21 +7,78 @@ import re
 import six
 import types
 
-from pymongo.errors import PyMongoError as PyMongoException
+from pymongo import ReturnDocument
+from pymongo.errors import (
+    BulkWriteError,
+    PyMongoError as PyMongoException,
+)
+from pymongo.read_preferences import (
+    make_read_preference,
+    read_pref_mode_from_name,
+)
 
+from .cache import DocumentCache
+from .database import resolve
 from .decorators import serializable
 from .errors import (
     PyMongoError,
     DocumentNotFoundError,
-    UnidentifiedDocumentError
+    DocumentValidationError,
+    ReadOnlyFieldError,
+    RequiredFieldError,
+    UnidentifiedDocumentError,
+    UnknownFieldError,
 )
-from .validator import Validator
+from .settings import settings
+from .validator import ThreadLocalValidator
+from .watcher import watch
 
 __all__ = [
     'Collection',
 ]
 
 
+class CollectionAttributes(object):
+    """
+    Table of the attributes that a Collection delegates to its DB Collection
+    Built once per DB Collection, so resolving an attribute is a dict lookup
+    """
+
+    def __init__(self, collection):
+        self.collection = collection
+        self.names = frozenset(dir(collection))
+        self.callables = {}
+
+        for name in self.names:
+            if not name.startswith('_'):
+                try:
+                    attribute = getattr(collection, name)
+                except AttributeError:
+                    continue
+
+                if hasattr(attribute, '__call__'):
+                    self.callables[name] = (
+                        attribute, inspect.isfunction(attribute)
+                    )
+
+    def resolve(self, owner, name):
+        """
+        Returns the attribute from the DB Collection bound to the owner if it
+        is a function.
+        Raises AttributeError if the DB Collection has no such attribute.
+        """
+        try:
+            attribute, is_function = self.callables[name]
+        except KeyError:
+            if name not in self.names:
+                raise AttributeError(name)
+
+            attribute = getattr(self.collection, name)
+            is_function = inspect.isfunction(attribute)
+
+        return types.MethodType(attribute, owner) if is_function else attribute
+
+
 class CollectionMeta(type):
     """
     MetaClass that knows how to get its own DB Collection
@@ -32,9 +89,14 @@ class CollectionMeta(type):
         bases = args[1]
         members = args[2].copy()
 
-        from .database import db
+        from .database import get_db
         if 'collection' not in members:
-            members['collection'] = db[
+            database = members.get('database_name')
+            for base in bases:
+                if database is None and isinstance(base, CollectionMeta):
+                    database = base.database_name
+
+            members['collection'] = get_db(database)[
                 re.sub(
                     r'((?<=[a-z0-9])[A-Z]|(?!^)[A-Z](?=[a-z]))', r'_\1', name
                 ).lower()
@@ -46,40 +108,69 @@ class CollectionMeta(type):
         if 'allow_unknown' not in members:
             members['allow_unknown'] = True
 
-        members['validator'] = Validator(
+        members['validator'] = ThreadLocalValidator(
             schema=members['schema'],
             allow_unknown=members['allow_unknown']
         )
 
-        return super(mcs, mcs).__new__(mcs, *(name, bases, members), **kwargs)
+        members['_attributes'] = None
+        members['_readers'] = {}
+
+        cls = super(mcs, mcs).__new__(mcs, *(name, bases, members), **kwargs)
+        cls.cache = DocumentCache(
+            cls.cache_size, cls.cache_ttl
+        ) if cls.cache_size else None
+
+        return cls
 
     def __getattr__(self, name):
         """
-        Returns the attribute from the _document if it exists.
-        Returns it from the collection if not on _document, but on collection.
+        Returns the attribute from the collection if it exists on it.
         """
-        if name in dir(self.collection):
-            attribute = getattr(self.collection, name)
+        if name == '_attributes':
+            raise AttributeError(name)
 
-            if inspect.isfunction(attribute):
-                attribute = types.MethodType(attribute, self)
+        return self._get_attributes().resolve(self, name)
 
-            return attribute
-        else:
-            raise AttributeError(name)
+    def _get_attributes(cls):
+        """
+        Returns the attribute table of the DB Collection, building it on
+        first use and again whenever the DB Collection changes, like after a
+        fork.
+        """
+        collection = resolve(cls.collection)
+
+        attributes = cls._attributes
+        if attributes is None or attributes.collection is not collection:
+            attributes = cls._attributes = CollectionAttributes(collection)
+
+        return attributes
 
 
 class Collection(six.with_metaclass(CollectionMeta, object)):
     """
     Base Class for Collections.
+    The database_name is the name of the connection from the DATABASES
+    setting the collection is on, the MONGODB setting is used if it is None.
+    Reads are routed according to default_read_preference, the name of a
+    pymongo read preference mode, like 'secondaryPreferred', and
+    default_max_staleness, in seconds. Writes always go to the primary.
+    Setting cache_size caches up to that many documents read by find_one, and
+    so by get, for cache_ttl seconds. Writes by _id evict their document from
+    the cache and any other write clears it.
     """
+    database_name = None
+    default_read_preference = None
+    default_max_staleness = None
+    cache_size = 0
+    cache_ttl = 60
 
-    def __init__(self, document=None):
+    def __init__(self, document=None, partial=False):
         self._document = copy.deepcopy(document or {})
         self._errors = {}
 
         if not self.before_validation():
-            if self.validator.validate_document(self):
+            if self.validator.validate_document(self, partial):
                 self._document = self.validator.document
 
                 if not self.after_validation():
@@ -118,15 +209,8 @@ class Collection(six.with_metaclass(CollectionMeta, object)):
         """
         if name in self._document:
             return self._document[name]
-        elif name in dir(self.collection):
-            attribute = getattr(self.collection, name)
 
-            if inspect.isfunction(attribute):
-                attribute = types.MethodType(attribute, self)
-
-            return attribute
-        else:
-            raise AttributeError(name)
+        return type(self)._get_attributes().resolve(self, name)
 
     def __deepcopy__(self, memo):
         copy = self.__class__(self._document)
@@ -192,31 +276,49 @@ class Collection(six.with_metaclass(CollectionMeta, object)):
         """
         if self.is_valid:
             if '_id' in self._document:
-                to_update = self.find_one({'_id': self._id})
+                callbacks = self._overrides('before_update', 'after_update')
+                acknowledged = self.collection.write_concern.acknowledged
+
+                if self._overrides('before_update'):
+                    to_update = self.find_one(
+                        {'_id': self._id}, read_preference='primary',
+                        cache=False
+                    )
+                    if not to_update:
+                        return DocumentNotFoundError(
+                            type(self).__name__, self._id
+                        )
 
-                if to_update:
                     before = self.before_update(old=to_update)
                     if before:
                         return before
 
-                    try:
-                        self.replace_one({'_id': self._id}, self._document)
-
-                        self.after_update(old=to_update)
-
-                        return self._document
-                    except PyMongoException as exc:
-                        return PyMongoError(
-                            error_message=exc.details.get(
-                                'errmsg', exc.details.get(
-                                    'err', 'PyMongoError.'
-                                )
-                            ),
-                            operation='update', collection=type(self).__name__,
-                            document=self._document,
+                try:
+                    if callbacks or not acknowledged:
+                        to_update = self.find_one_and_replace(
+                            {'_id': self._id}, self._document
                         )
-                else:
+                        found = to_update is not None
+                    else:
+                        found = self.replace_one(
+                            {'_id': self._id}, self._document
+                        )['n'] > 0
+                except PyMongoException as exc:
+                    return PyMongoError(
+                        error_message=exc.details.get(
+                            'errmsg', exc.details.get('err', 'PyMongoError.')
+                        ),
+                        operation='update', collection=type(self).__name__,
+                        document=self._document,
+                    )
+
+                if not found:
                     return DocumentNotFoundError(type(self).__name__, self._id)
+
+                if callbacks:
+                    self.after_update(old=to_update)
+
+                return self._document
             else:
                 return UnidentifiedDocumentError(
                     type(self).__name__, self._document
@@ -224,6 +326,156 @@ class Collection(six.with_metaclass(CollectionMeta, object)):
 
         return self._errors
 
+    @serializable
+    def patch(self, unset=(), **kwargs):
+        """
+        Sets the fields of the document and removes the unset ones on the
+        document with the same _id saved in the collection, with a single
+        find_one_and_update, if they are valid.
+        The document should have only the fields to set, validated with
+        partial=True. Nested documents are merged into the saved ones, field
+        by field, and unset fields may be dotted to remove nested fields.
+        Returns the updated document, or errors otherwise.
+        """
+        if not self.is_valid:
+            return self._errors
+
+        if '_id' not in self._document:
+            return UnidentifiedDocumentError(
+                type(self).__name__, self._document
+            )
+
+        fields = dict(
+            (keys, value) for (keys, value) in _paths(self._document)
+            if keys != ('_id',)
+        )
+        unset = [
+            tuple(field.split('.')) for field in unset
+            if tuple(field.split('.')) not in fields
+        ]
+
+        errors = self._patch_errors(fields, unset)
+        if errors:
+            return errors
+
+        old = None
+        if self._overrides('before_update'):
+            old = self.find_one(
+                {'_id': self._id}, read_preference='primary', cache=False
+            )
+            if old is None:
+                return DocumentNotFoundError(type(self).__name__, self._id)
+
+            before = self.before_update(old=old)
+            if before:
+                return before
+
+        update = {}
+        if fields:
+            update['$set'] = dict(
+                ('.'.join(keys), value) for (keys, value) in fields.items()
+            )
+        if unset:
+            update['$unset'] = dict(('.'.join(keys), '') for keys in unset)
+
+        try:
+            if update:
+                old = self.find_one_and_update({'_id': self._id}, update)
+            elif old is None:
+                old = self.find_one(
+                    {'_id': self._id}, read_preference='primary', cache=False
+                )
+        except PyMongoException as exc:
+            return PyMongoError(
+                error_message=exc.details.get(
+                    'errmsg', exc.details.get('err', 'PyMongoError.')
+                ),
+                operation='update', collection=type(self).__name__,
+                document=self._document,
+            )
+
+        if old is None:
+            return DocumentNotFoundError(type(self).__name__, self._id)
+
+        document = copy.deepcopy(old)
+        for (keys, value) in fields.items():
+            _set_path(document, keys, value)
+        for keys in unset:
+            _unset_path(document, keys)
+        self._document = document
+
+        self.after_update(old=old)
+
+        return self._document
+
+    def _patch_errors(self, fields, unset):
+        """
+        Returns the errors of a patch that sets fields and removes the unset
+        ones that the partial validation does not catch: fields that would
+        write into other fields or be operators, and unset fields that are
+        unknown, required or read only.
+        Fields and unset fields are given as tuples of their keys.
+        """
+        collection, errors = type(self).__name__, []
+
+        for keys in sorted(fields):
+            if not all(_is_key(key) for key in keys):
+                errors.append(UnknownFieldError(collection, '.'.join(keys)))
+
+        for keys in sorted(unset):
+            field = '.'.join(keys)
+            definition, readonly = self._unset_definition(keys)
+
+            if definition is False:
+                errors.append(UnknownFieldError(collection, field))
+            elif readonly:
+                errors.append(ReadOnlyFieldError(collection, field))
+            elif definition and definition.get('required') is True:
+                errors.append(RequiredFieldError(collection, field))
+
+        if errors:
+            return DocumentValidationError(
+                collection, self.schema, self._document,
+                sorted(errors, key=lambda error: error['field'])
+            )
+
+        return None
+
+    def _unset_definition(self, keys):
+        """
+        Returns the definition of the field with the given keys, None if it
+        has none but may be written, or False if it is unknown, and whether
+        it or any of the fields it is nested in is read only
+        """
+        if keys == ('_id',) or not all(_is_key(key) for key in keys):
+            return False, False
+
+        schema, allow_unknown = self.schema, self.allow_unknown
+        definition, readonly = None, False
+
+        for key in keys:
+            if schema is None:
+                definition = None
+                continue
+
+            definition = schema.get(key)
+            if definition is None:
+                if not allow_unknown:
+                    return False, readonly
+
+                schema = None
+                continue
+
+            readonly = readonly or definition.get('readonly') is True
+            allow_unknown = allow_unknown or definition.get('allow_unknown')
+
+            schema = definition.get('schema')
+            if definition.get('type') != 'dict' or \
+                    not isinstance(schema, dict):
+                schema = None
+
+        return definition, readonly
+
     @serializable
     def delete(self, **kwargs):
         """
@@ -231,52 +483,142 @@ class Collection(six.with_metaclass(CollectionMeta, object)):
         """
         if self.is_valid:
             if '_id' in self._document:
-                to_delete = self.find_one({'_id': self._id})
+                if self._overrides('before_delete'):
+                    to_delete = self.find_one(
+                        {'_id': self._id}, read_preference='primary',
+                        cache=False
+                    )
+                    if not to_delete:
+                        return DocumentNotFoundError(
+                            type(self).__name__, self._id
+                        )
 
-                if to_delete:
                     before = self.before_delete()
                     if before:
                         return before
 
-                    try:
-                        self.delete_one({'_id': self._id})
-
-                        self.after_delete()
-
-                        return self._document
-                    except PyMongoException as exc:
-                        return PyMongoError(
-                            error_message=exc.details.get(
-                                'errmsg', exc.details.get(
-                                    'err', 'PyMongoError.'
-                                )
-                            ),
-                            operation='delete', collection=type(self).__name__,
-                            document=self._document,
-                        )
-                else:
-                    return DocumentNotFoundError(type(self).__name__, self._id)
+                return self._delete()
             else:
                 return UnidentifiedDocumentError(
                     type(self).__name__, self._document
                 )
 
+    def _delete(self):
+        """
+        Deletes the saved document with the _id of the Document, with a
+        delete_one, or a find_one_and_delete if writes are unacknowledged,
+        and calls after_delete.
+        Returns the document, or errors otherwise.
+        """
+        try:
+            if self.collection.write_concern.acknowledged:
+                found = self.delete_one({'_id': self._id})['n'] > 0
+            else:
+                found = self.find_one_and_delete({'_id': self._id}) is not None
+        except PyMongoException as exc:
+            return PyMongoError(
+                error_message=exc.details.get(
+                    'errmsg', exc.details.get('err', 'PyMongoError.')
+                ),
+                operation='delete', collection=type(self).__name__,
+                document=self._document,
+            )
+
+        if not found:
+            return DocumentNotFoundError(type(self).__name__, self._id)
+
+        self.after_delete()
+
+        return self._document
+
+    @classmethod
+    @serializable
+    def delete_by_id(cls, _id, **kwargs):
+        """
+        Deletes the document with the given _id and returns it, without
+        building and validating a Document, with a single
+        find_one_and_delete.
+        If the class overrides before_delete or after_delete, the Document
+        is built from a single read of the primary, without validating it,
+        so they run around a delete_one, or a find_one_and_delete if writes
+        are unacknowledged.
+        Returns errors otherwise.
+        """
+        if cls._overrides('before_delete', 'after_delete'):
+            found = cls.find_one(
+                {'_id': _id}, read_preference='primary', cache=False
+            )
+            if found is None:
+                return DocumentNotFoundError(cls.__name__, _id)
+
+            document = cls.__new__(cls)
+            document._document, document._errors = found, {}
+
+            before = document.before_delete()
+            if before:
+                return before
+
+            return document._delete()
+
+        try:
+            deleted = cls.find_one_and_delete({'_id': _id})
+        except PyMongoException as exc:
+            return PyMongoError(
+                error_message=exc.details.get(
+                    'errmsg', exc.details.get('err', 'PyMongoError.')
+                ),
+                operation='delete', collection=cls.__name__,
+                document={'_id': _id},
+            )
+
+        if deleted is None:
+            return DocumentNotFoundError(cls.__name__, _id)
+
+        return deleted
+
     @classmethod
     @serializable
     def find_one(cls, filter=None, *args, **kwargs):
         """
         Returns one document dict if one passes the filter.
         Returns None otherwise.
+        Uses the cache of the class unless cache=False is passed or its
+        CacheWatcher could not be started, keeping the documents read with
+        each read preference apart.
         """
-        return cls.collection.find_one(filter, *args, **kwargs)
+        reader = cls.reader(
+            kwargs.pop('read_preference', None),
+            kwargs.pop('max_staleness', None)
+        )
+
+        if not kwargs.pop('cache', True) or cls.cache is None or \
+                watch(cls) is False:
+            return reader.find_one(filter, *args, **kwargs)
+
+        return cls.cache.get(
+            cls.cache.key(
+                filter, reader.read_preference.document, *args, **kwargs
+            ),
+            lambda: reader.find_one(filter, *args, **kwargs),
+            cls.cache.id_of(filter)
+        )
 
     @classmethod
     @serializable
     def find(cls, *args, **kwargs):
         """
         Returns all document dicts that pass the filter
+        If stream=True is passed, returns a lazy iterator over them instead
         """
-        return list(cls.collection.find(*args, **kwargs))
+        reader = cls.reader(
+            kwargs.pop('read_preference', None),
+            kwargs.pop('max_staleness', None)
+        )
+
+        if kwargs.pop('stream', False):
+            return reader.find(*args, stream=True, **kwargs)
+
+        return list(reader.find(*args, **kwargs))
 
     @classmethod
     @serializable
@@ -284,7 +626,76 @@ class Collection(six.with_metaclass(CollectionMeta, object)):
         """
         Returns the document dicts returned from the Aggregation Pipeline
         """
-        return list(cls.collection.aggregate(pipeline or [], **kwargs))
+        reader = cls.reader(
+            kwargs.pop('read_preference', None),
+            kwargs.pop('max_staleness', None)
+        )
+
+        return list(reader.aggregate(pipeline or [], **kwargs))
+
+    @classmethod
+    @serializable
+    def insert_documents(cls, documents, ordered=True, **kwargs):
+        """
+        Saves the valid Documents to the database with insert_many calls of
+        up to BULK_BATCH_SIZE documents, calling before_insert and
+        after_insert on each of them like insert does.
+        Returns the saved document or the errors of each Document, in order.
+        If ordered, no Document is saved after one that fails to be saved.
+        """
+        results, to_insert = [None] * len(documents), []
+
+        for (i, document) in enumerate(documents):
+            if not document.is_valid:
+                results[i] = document.errors
+                continue
+
+            before = document.before_insert()
+            if before:
+                results[i] = before
+                continue
+
+            to_insert.append(i)
+
+        failed, size = False, settings.BULK_BATCH_SIZE
+        for batch in [to_insert[start:start + size]
+                      for start in range(0, len(to_insert), size)]:
+            errors = {}
+
+            if not failed:
+                try:
+                    cls.insert_many(
+                        [documents[i]._document for i in batch], ordered
+                    )
+                except BulkWriteError as exc:
+                    errors = dict(
+                        (error['index'], error.get('errmsg', 'PyMongoError.'))
+                        for error in exc.details.get('writeErrors', [])
+                    )
+                except PyMongoException as exc:
+                    errors = dict.fromkeys(
+                        range(len(batch)), str(exc) or 'PyMongoError.'
+                    )
+
+            for (j, i) in enumerate(batch):
+                document = documents[i]
+
+                if j in errors or failed:
+                    results[i] = PyMongoError(
+                        error_message=errors.get(
+                            j, 'Not inserted because a previous document '
+                               'could not be inserted.'
+                        ),
+                        operation='insert',
+                        collection=type(document).__name__,
+                        document=document._document,
+                    )
+                    failed = failed or ordered
+                else:
+                    document.after_insert()
+                    results[i] = document._document
+
+        return results
 
     @classmethod
     @serializable
@@ -292,7 +703,10 @@ class Collection(six.with_metaclass(CollectionMeta, object)):
         """
         Inserts a document into the Collection and returns its _id
         """
-        return cls.collection.insert_one(document).inserted_id
+        try:
+            return cls.collection.insert_one(document).inserted_id
+        finally:
+            cls.evict_cache({'_id': document.get('_id')})
 
     @classmethod
     @serializable
@@ -300,7 +714,10 @@ class Collection(six.with_metaclass(CollectionMeta, object)):
         """
         Inserts a list of documents into the Collection and returns their _ids
         """
-        return cls.collection.insert_many(documents, ordered).inserted_ids
+        try:
+            return cls.collection.insert_many(documents, ordered).inserted_ids
+        finally:
+            cls.clear_cache()
 
     @classmethod
     @serializable
@@ -309,7 +726,10 @@ class Collection(six.with_metaclass(CollectionMeta, object)):
         Updates a document that passes the filter with the update value
         Will upsert a new document if upsert=True and no document is filtered
         """
-        return cls.collection.update_one(filter, update, upsert).raw_result
+        try:
+            return cls.collection.update_one(filter, update, upsert).raw_result
+        finally:
+            cls.evict_cache(filter)
 
     @classmethod
     @serializable
@@ -318,7 +738,12 @@ class Collection(six.with_metaclass(CollectionMeta, object)):
         Updates all documents that pass the filter with the update value
         Will upsert a new document if upsert=True and no document is filtered
         """
-        return cls.collection.update_many(filter, update, upsert).raw_result
+        try:
+            return cls.collection.update_many(
+                filter, update, upsert
+            ).raw_result
+        finally:
+            cls.evict_cache(filter)
 
     @classmethod
     @serializable
@@ -327,9 +752,56 @@ class Collection(six.with_metaclass(CollectionMeta, object)):
         Replaces a document that passes the filter.
         Will upsert a new document if upsert=True and no document is filtered
         """
-        return cls.collection.replace_one(
-            filter, replacement, upsert
-        ).raw_result
+        try:
+            return cls.collection.replace_one(
+                filter, replacement, upsert
+            ).raw_result
+        finally:
+            cls.evict_cache(filter)
+
+    @classmethod
+    @serializable
+    def find_one_and_update(cls, filter, update, **kwargs):
+        """
+        Updates a document that passes the filter with the update value.
+        Returns the document as it was before the update, or None if no
+        document is filtered, unless return_document=ReturnDocument.AFTER.
+        """
+        kwargs.setdefault('return_document', ReturnDocument.BEFORE)
+
+        try:
+            return cls.collection.find_one_and_update(filter, update, **kwargs)
+        finally:
+            cls.evict_cache(filter)
+
+    @classmethod
+    @serializable
+    def find_one_and_replace(cls, filter, replacement, **kwargs):
+        """
+        Replaces a document that passes the filter.
+        Returns the document as it was before the replacement, or None if no
+        document is filtered, unless return_document=ReturnDocument.AFTER.
+        """
+        kwargs.setdefault('return_document', ReturnDocument.BEFORE)
+
+        try:
+            return cls.collection.find_one_and_replace(
+                filter, replacement, **kwargs
+            )
+        finally:
+            cls.evict_cache(filter)
+
+    @classmethod
+    @serializable
+    def find_one_and_delete(cls, filter, **kwargs):
+        """
+        Deletes a document that passes the filter.
+        Returns the deleted document, or None if no document is filtered.
+        """
+        try:
+            return cls.collection.find_one_and_delete(filter, **kwargs)
+        finally:
+            cls.evict_cache(filter)
 
     @classmethod
     @serializable
@@ -337,7 +809,10 @@ class Collection(six.with_metaclass(CollectionMeta, object)):
         """
         Deletes one document that passes the filter
         """
-        return cls.collection.delete_one(filter).raw_result
+        try:
+            return cls.collection.delete_one(filter).raw_result
+        finally:
+            cls.evict_cache(filter)
 
     @classmethod
     @serializable
@@ -345,7 +820,10 @@ class Collection(six.with_metaclass(CollectionMeta, object)):
         """
         Deletes all documents that pass the filter
         """
-        return cls.collection.delete_many(filter).raw_result
+        try:
+            return cls.collection.delete_many(filter).raw_result
+        finally:
+            cls.evict_cache(filter)
 
     @classmethod
     @serializable
@@ -353,7 +831,89 @@ class Collection(six.with_metaclass(CollectionMeta, object)):
         """
         Returns the number of documents that pass the filter
         """
-        return cls.collection.count(filter, **kwargs)
+        return cls.reader(
+            kwargs.pop('read_preference', None),
+            kwargs.pop('max_staleness', None)
+        ).count(filter, **kwargs)
+
+    @classmethod
+    def clear_cache(cls):
+        """
+        Removes all the documents from the cache of the class, if it has one
+        """
+        if cls.cache is not None:
+            cls.cache.clear()
+
+    @classmethod
+    def evict_cache(cls, filter):
+        """
+        Removes the documents that may have changed when the ones that pass
+        the filter were written from the cache of the class, if it has one.
+        Only the ones of a single document are removed if the filter is by
+        _id, all of them otherwise.
+        """
+        if cls.cache is None:
+            return
+
+        _id = cls.cache.id_of(filter)
+        if _id is None:
+            cls.cache.clear()
+        else:
+            cls.cache.evict(_id)
+
+    @classmethod
+    def _overrides(cls, *callbacks):
+        """
+        Returns True if the class overrides any of the given callbacks, so the
+        writes have to read the documents they pass to them
+        """
+        return any(
+            six.get_unbound_function(getattr(cls, callback)) is not
+            _callbacks[callback] for callback in callbacks
+        )
+
+    @classmethod
+    def reader(cls, read_preference=None, max_staleness=None):
+        """
+        Returns the DB Collection to read from using the given read preference
+        and max staleness, or the ones of the class for the ones not given.
+        The max staleness of the class is only used with its read preference.
+        Raises ValueError if a max staleness is given without any read
+        preference, as the primary does not take one.
+        """
+        if read_preference is None:
+            read_preference = cls.default_read_preference
+
+            if max_staleness is None:
+                max_staleness = cls.default_max_staleness
+
+        if read_preference is None:
+            if max_staleness is not None:
+                raise ValueError(
+                    'max_staleness needs a read preference other than '
+                    'primary on {0}'.format(cls.__name__)
+                )
+
+            return cls.collection
+
+        if not isinstance(read_preference, six.string_types):
+            return cls.collection.with_options(read_preference=read_preference)
+
+        key = (read_preference, max_staleness)
+        cached = cls._readers.get(key)
+        collection = resolve(cls.collection)
+
+        if not cached or cached[0] is not collection:
+            cached = cls._readers[key] = (
+                collection, collection.with_options(
+                    read_preference=make_read_preference(
+                        read_pref_mode_from_name(read_preference), None,
+                        -1 if max_staleness is None else max_staleness
+                    )
+                )
+            )
+
+        return cached[1]
 
     @classmethod
     def get(cls, filter=None, **kwargs):
@@ -445,3 +1005,57 @@ class Collection(six.with_metaclass(CollectionMeta, object)):
         Callback called after a delete occurs.
         """
         return
+
+
+_callbacks = dict(
+    (callback, six.get_unbound_function(getattr(Collection, callback)))
+    for callback in (
+        'before_update', 'after_update', 'before_delete', 'after_delete'
+    )
+)
+
+
+def _is_key(key):
+    """
+    Returns True if the key can be written as part of a dotted field
+    """
+    return bool(key) and '.' not in key and not key.startswith('$')
+
+
+def _paths(document, parent=()):
+    """
+    Yields the keys and the value of each field of the document that is not
+    a nested document, walking into the non empty nested documents
+    """
+    for (key, value) in document.items():
+        if isinstance(value, dict) and value:
+            for path in _paths(value, parent + (key,)):
+                yield path
+        elif not isinstance(value, dict):
+            yield parent + (key,), value
+
+
+def _set_path(document, keys, value):
+    """
+    Sets the value of the field with the given keys, creating the nested
+    documents it is in, like $set
+    """
+    for key in keys[:-1]:
+        if not isinstance(document.get(key), dict):
+            document[key] = {}
+
+        document = document[key]
+
+    document[keys[-1]] = value
+
+
+def _unset_path(document, keys):
+    """
+    Removes the field with the given keys, like $unset
+    """
+    for key in keys[:-1]:
+        document = document.get(key)
+        if not isinstance(document, dict):
+            return
+
+    document.pop(keys[-1], None)
@@ -2,25 +2,298 @@
 from __future__ import absolute_import, unicode_literals
 
 import logging
+import os
+import random
+import re
+import threading
 import time
+from collections import OrderedDict
+from functools import partial
+from pydoc import locate
 
+from pymongo import ASCENDING
 from pymongo.collection import Collection
 from pymongo.cursor import Cursor
 from pymongo.database import Database
-from pymongo.errors import ConnectionFailure
+from pymongo.errors import ConnectionFailure, ServerSelectionTimeoutError
 from pymongo.mongo_client import MongoClient
 from pymongo.uri_parser import parse_uri
 
+from .utils import (
+    _get_field,
+    _keyset_filter,
+    _keyset_projection,
+    _pop_field,
+)
+
 __all__ = [
     'db',
+    'get_db',
 ]
 
+RECOVERY_MODES = frozenset([
+    'client',
+    'server',
+])
+
+STREAM_METHODS = frozenset([
+    'find',
+])
+
+WRITE_METHODS = frozenset([
+    'bulk_write',
+    'delete_many',
+    'delete_one',
+    'find_and_modify',
+    'find_one_and_delete',
+    'find_one_and_replace',
+    'find_one_and_update',
+    'insert',
+    'insert_many',
+    'insert_one',
+    'remove',
+    'replace_one',
+    'save',
+    'update',
+    'update_many',
+    'update_one',
+])
+
+
+class CircuitOpenError(ConnectionFailure):
+    """
+    Raised instead of calling the database while the circuit is open
+    """
+
+
+class CircuitBreaker(object):
+    """
+    Circuit Breaker shared by all the proxies of a client.
+    It opens after FAILURE_THRESHOLD consecutive connection failures and then
+    fails fast for RECOVERY_TIME seconds. After that it is half-open and lets
+    only HALF_OPEN_PROBES calls through, closing again if one of them
+    succeeds or reopening if one of them fails.
+    Every state change is logged and sent to the LISTENER setting, the path
+    of a callable, checked when the breaker is built.
+    """
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half-open'
+
+    def __init__(self, name=''):
+        self.name = name
+        self.state = self.CLOSED
+        self.failures = 0
+        self.probes = 0
+        self.changed_at = time.time()
+        self.lock = threading.Lock()
+        self.logger = logging.getLogger(__name__)
+
+        listener = self.config['LISTENER']
+        self.listener = locate(listener) if listener else None
+        if listener and not callable(self.listener):
+            raise ValueError(
+                'CIRCUIT_BREAKER LISTENER must be the path of a callable'
+            )
+
+    @property
+    def config(self):
+        from .settings import DEFAULT, settings
+        return dict(DEFAULT['CIRCUIT_BREAKER'], **settings.CIRCUIT_BREAKER)
+
+    @property
+    def is_open(self):
+        """
+        Returns True if calls are currently failing fast.
+        """
+        return self.state == self.OPEN
+
+    def allow(self):
+        """
+        Returns True if a call can be made to the database, False otherwise.
+        """
+        if self.state == self.CLOSED:
+            return True
+
+        config = self.config
+        if not config['ENABLED']:
+            return True
+
+        with self.lock:
+            changed, elapsed = None, time.time() - self.changed_at
+
+            if self.state == self.OPEN:
+                if elapsed < config['RECOVERY_TIME']:
+                    return False
+
+                changed = self._change(self.HALF_OPEN)
+            elif self.state == self.HALF_OPEN:
+                if elapsed >= config['RECOVERY_TIME']:
+                    self.probes, self.changed_at = 0, time.time()
+
+                if self.probes >= config['HALF_OPEN_PROBES']:
+                    return False
+
+            if self.state == self.HALF_OPEN:
+                self.probes += 1
+
+        self._notify(changed)
+        return True
+
+    def succeeded(self):
+        """
+        Records a successful call, closing the circuit if it was not closed.
+        """
+        if self.state == self.CLOSED and not self.failures:
+            return
+
+        with self.lock:
+            self.failures, changed = 0, None
+
+            if self.state != self.CLOSED:
+                changed = self._change(self.CLOSED)
+
+        self._notify(changed)
+
+    def failed(self):
+        """
+        Records a connection failure, opening the circuit if the failure
+        threshold is reached or if it was a half-open probe that failed.
+        """
+        config = self.config
+        if not config['ENABLED']:
+            return
+
+        with self.lock:
+            self.failures, changed = self.failures + 1, None
+
+            if self.state == self.HALF_OPEN or (
+                self.state == self.CLOSED and
+                self.failures >= config['FAILURE_THRESHOLD']
+            ):
+                changed = self._change(self.OPEN)
+
+        self._notify(changed)
+
+    def _change(self, state):
+        old_state = self.state
+
+        self.state, self.probes, self.changed_at = state, 0, time.time()
+
+        return old_state, state
+
+    def _notify(self, changed):
+        if not changed:
+            return
+
+        self.logger.warning(
+            'Circuit breaker for %s changed from %s to %s.',
+            self.name or 'database', *changed
+        )
+
+        if self.listener is not None:
+            try:
+                self.listener(self, *changed)
+            except Exception:
+                self.logger.exception(
+                    'Circuit breaker LISTENER failed for %s.',
+                    self.name or 'database'
+                )
+
+
+class RetryBudget(object):
+    """
+    Process wide token bucket that caps the retries to a ratio of the calls.
+    Every call deposits RATIO tokens, up to CAPACITY tokens, and every retry
+    withdraws one token. No retries are made while the bucket is empty.
+    """
+
+    def __init__(self):
+        self.tokens = None
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self._config = None
+
+    @property
+    def config(self):
+        """
+        Returns the RETRY_BUDGET setting, read once for each settings module
+        so calls do not load the settings
+        """
+        from .settings import DEFAULT, settings
+
+        module = os.environ.get('MONGOREST_SETTINGS_MODULE')
+
+        config = self._config
+        if config is None or config[0] != module:
+            config = self._config = (
+                module, dict(DEFAULT['RETRY_BUDGET'], **settings.RETRY_BUDGET)
+            )
+
+        return config[1]
+
+    def deposit(self):
+        """
+        Records a call, adding RATIO tokens to the bucket.
+        Each thread counts its own calls and only adds them to the bucket
+        once they are worth a whole token, so most calls take no lock.
+        Does nothing if the budget is disabled.
+        """
+        config = self.config
+        if not config['ENABLED']:
+            return
+
+        calls = getattr(self.local, 'calls', 0) + 1
+        if calls * config['RATIO'] < 1:
+            self.local.calls = calls
+            return
+
+        self.local.calls = 0
+
+        with self.lock:
+            if self.tokens is None:
+                self.tokens = config['CAPACITY']
+
+            self.tokens = min(
+                config['CAPACITY'], self.tokens + calls * config['RATIO']
+            )
+
+    def withdraw(self):
+        """
+        Returns True if there is budget for one more retry, False otherwise.
+        """
+        config = self.config
+        if not config['ENABLED']:
+            return True
+
+        with self.lock:
+            if self.tokens is None:
+                self.tokens = config['CAPACITY']
+
+            if self.tokens < 1:
+                return False
+
+            self.tokens -= 1
+            return True
+
+
+retry_budget = RetryBudget()
+
 
 class ConnectionFailureProxy(object):
+    """
+    Proxy that retries the proxied calls when a ConnectionFailure happens
+    The proxies of its callable attributes and items are created once and
+    cached, up to cache_size of each
+    """
+    cache_size = 128
 
-    def __init__(self, proxied):
+    def __init__(self, proxied, breaker=None):
         self.proxied = proxied
+        self.breaker = breaker or CircuitBreaker()
         self.logger = logging.getLogger(__name__)
+        self._attributes = OrderedDict()
+        self._items = OrderedDict()
 
     def __dir__(self):
         return dir(self.proxied)
@@ -32,70 +305,397 @@ class ConnectionFailureProxy(object):
         return repr(self.proxied)
 
     def __eq__(self, other):
-        return self.proxied == other.proxied
+        return self.proxied == getattr(other, 'proxied', other)
 
     def __getitem__(self, key):
+        try:
+            return self._items[key]
+        except (KeyError, TypeError):
+            pass
+
         item = self.proxied[key]
 
         if hasattr(item, '__call__'):
-            item = ConnectionFailureProxy(item)
+            item = self._cache(
+                self._items, key, ConnectionFailureProxy(item, self.breaker)
+            )
 
         return item
 
     def __getattr__(self, attr):
+        if attr in ('_attributes', '_items'):
+            raise AttributeError(attr)
+
+        try:
+            return self._attributes[attr]
+        except KeyError:
+            pass
+
         attribute = getattr(self.proxied, attr)
 
         if hasattr(attribute, '__call__'):
-            attribute = ConnectionFailureProxy(attribute)
+            attribute = self._cache(
+                self._attributes, attr,
+                ConnectionFailureProxy(attribute, self.breaker)
+            )
 
         return attribute
 
+    def _cache(self, cache, key, proxy):
+        """
+        Caches the proxy under the given key, evicting the oldest cached
+        proxy if the cache is full.
+        """
+        try:
+            if len(cache) >= self.cache_size:
+                cache.popitem(last=False)
+
+            cache[key] = proxy
+        except (KeyError, TypeError):
+            pass
+
+        return proxy
+
     def __call__(self, *args, **kwargs):
-        from .settings import settings
+        if kwargs.pop('stream', False):
+            name = getattr(self.proxied, '__name__', '')
+            if name not in STREAM_METHODS:
+                raise TypeError(
+                    'stream=True is not supported by {0}, only by {1}.'.format(
+                        name or repr(self.proxied),
+                        ', '.join(sorted(STREAM_METHODS))
+                    )
+                )
+
+            return self._stream(*args, **kwargs)
 
         retries = 0
-        while retries < settings.RETRY_LIMIT:
+        retry_budget.deposit()
+
+        while True:
+            self._check_circuit()
+
             try:
                 result = self.proxied(*args, **kwargs)
-                return list(result) if isinstance(result, Cursor) else result
-            except ConnectionFailure:
-                if settings.LINEAR_RETRIES:
-                    sleep_time = settings.BASE_RETRY_TIME
-                else:
-                    sleep_time = pow(settings.BASE_RETRY_TIME, retries)
+
+                if isinstance(result, Cursor):
+                    result = list(result)
+            except ConnectionFailure as exc:
+                if not self._should_retry(retries, exc):
+                    raise
 
                 retries += 1
-                self.logger.warning(
-                    'Retry nº %s in %s seconds.', retries, sleep_time
+                self._recover(retries, exc)
+            else:
+                self.breaker.succeeded()
+
+                if isinstance(result, (Collection, Database)):
+                    result = ConnectionFailureProxy(result, self.breaker)
+
+                return result
+
+    def _stream(self, *args, **kwargs):
+        """
+        Lazily iterates over the Cursor returned by the proxied call.
+        If a ConnectionFailure happens in the middle of the iteration, the
+        query is resumed right after the sort key of the last document
+        yielded, so the documents that were already streamed are not fetched
+        again.
+        The sort always ends with _id, so the sort key is unique, and the
+        projection always keeps the sort key, hiding it from the documents
+        if it was not projected.
+        When no sort is given the documents are streamed ordered by _id.
+        """
+        args = list(args)
+        spec = (args.pop(0) if args else kwargs.pop('filter', None)) or {}
+        skip, limit = kwargs.pop('skip', 0), kwargs.pop('limit', 0)
+
+        sort = list(kwargs.pop('sort', None) or [])
+        if '_id' not in dict(sort):
+            sort.append(('_id', ASCENDING))
+
+        hidden = []
+        projection = args.pop(0) if args else kwargs.pop('projection', None)
+        if projection:
+            if not isinstance(projection, dict):
+                projection = dict.fromkeys(projection, 1)
+
+            projection, hidden = _keyset_projection(projection, sort)
+            projection = projection or None
+        kwargs['projection'] = projection
+
+        last, streamed, retries = None, 0, 0
+        retry_budget.deposit()
+
+        while not limit or streamed < limit:
+            if last is not None:
+                cursor = self.proxied(
+                    {'$and': [spec, _keyset_filter(sort, last)]},
+                    *args, **kwargs
                 )
+            else:
+                cursor = self.proxied(spec, *args, **kwargs).skip(skip)
 
-                client, attempts = self.proxied, 0
-                while attempts <= 3:
-                    if isinstance(client, MongoClient):
-                        client.close()
-                        break
-                    elif isinstance(client, Database):
-                        client = client.client
-                    elif isinstance(client, Collection):
-                        client = client.database
-                    else:
-                        client = client.__self__
+            cursor = cursor.sort(sort).limit(limit - streamed if limit else 0)
 
-                    attempts += 1
+            self._check_circuit()
 
-                time.sleep(sleep_time)
+            connected = False
+            try:
+                for document in cursor:
+                    if not connected:
+                        self.breaker.succeeded()
+                        connected = True
+
+                    last = [_get_field(document, field) for (field, _) in sort]
+                    for field in hidden:
+                        _pop_field(document, field)
+                    streamed += 1
 
-        return self.proxied(*args, **kwargs)
+                    yield document
 
+                if not connected:
+                    self.breaker.succeeded()
 
-def _get_db():
+                return
+            except ConnectionFailure as exc:
+                if not self._should_retry(retries, exc):
+                    raise
+
+                retries += 1
+                self._recover(retries, exc)
+
+    def _should_retry(self, retries, exc):
+        """
+        Records the failure on the circuit breaker and returns True if the
+        call should be retried.
+        Writes are retried up to WRITE_RETRY_LIMIT times, unless no server
+        could be selected, in which case they were never sent.
+        Everything else, and writes if WRITE_RETRY_LIMIT is None, the
+        default, is retried up to RETRY_LIMIT times.
+        Calls are never retried while the circuit is open or the retry budget
+        is exhausted.
+        """
+        from .settings import settings
+
+        self.breaker.failed()
+
+        retry_limit = settings.RETRY_LIMIT
+
+        name = getattr(self.proxied, '__name__', '')
+        if name in WRITE_METHODS and settings.WRITE_RETRY_LIMIT is not None \
+                and not isinstance(exc, ServerSelectionTimeoutError):
+            retry_limit = settings.WRITE_RETRY_LIMIT
+
+        if retries >= retry_limit or self.breaker.is_open:
+            return False
+
+        if not retry_budget.withdraw():
+            self.logger.warning('Retry budget exhausted, not retrying.')
+            return False
+
+        return True
+
+    def _check_circuit(self):
+        """
+        Raises CircuitOpenError if the circuit breaker does not allow calls.
+        """
+        if not self.breaker.allow():
+            raise CircuitOpenError(
+                'Circuit breaker for {0} is open.'.format(
+                    self.breaker.name or 'database'
+                )
+            )
+
+    def _recover(self, retries, exc=None):
+        """
+        Recovers the client of the proxied object from the given failure and
+        waits before the next retry is executed.
+        With the RECOVERY_MODE setting as 'client', the default, the whole
+        client is closed, with 'server' only the pooled connections to the
+        server that failed are dropped, falling back to closing the whole
+        client if that server is not known or cannot be reset alone.
+        Raises ValueError if RECOVERY_MODE is neither of them, which _get_db
+        also checks when the client is created.
+        """
+        from .settings import settings
+
+        mode = _recovery_mode()
+
+        if settings.LINEAR_RETRIES:
+            sleep_time = settings.BASE_RETRY_TIME
+        else:
+            sleep_time = pow(settings.BASE_RETRY_TIME, retries - 1)
+
+        if settings.RETRY_JITTER:
+            sleep_time = random.uniform(0, sleep_time)
+
+        self.logger.warning(
+            'Retry nº %s in %.3f seconds.', retries, sleep_time
+        )
+
+        client = self._client()
+        if client is not None:
+            address = _failed_address(exc)
+
+            if mode == 'server' and address and \
+                    hasattr(client, '_reset_server_and_request_check'):
+                client._reset_server_and_request_check(address)
+            else:
+                client.close()
+
+        time.sleep(sleep_time)
+
+    def _client(self):
+        """
+        Returns the MongoClient the proxied object belongs to, if any.
+        """
+        client, attempts = self.proxied, 0
+        while attempts <= 3:
+            if isinstance(client, MongoClient):
+                return client
+            elif isinstance(client, Database):
+                client = client.client
+            elif isinstance(client, Collection):
+                client = client.database
+            else:
+                client = getattr(client, '__self__', None)
+
+            attempts += 1
+
+
+class LazyProxy(ConnectionFailureProxy):
+    """
+    ConnectionFailureProxy to the proxy returned by factory.
+    The factory is called on first use and again in every process forked
+    after that, so workers of a pre-fork server never share a MongoClient.
+    Its items are LazyProxies too, so getting a collection from it does not
+    connect either.
+    """
+
+    def __init__(self, factory):
+        self._factory = factory
+        self._resolved = None
+        self._lazy_items = {}
+
+    @property
+    def proxied(self):
+        return resolve(self).proxied
+
+    @property
+    def breaker(self):
+        return resolve(self).breaker
+
+    def __getitem__(self, key):
+        try:
+            return self._lazy_items[key]
+        except KeyError:
+            with _lazy_lock:
+                if key not in self._lazy_items:
+                    self._lazy_items[key] = LazyProxy(
+                        partial(_resolve_item, self, key)
+                    )
+
+                return self._lazy_items[key]
+
+    def __getattr__(self, attr):
+        if attr in ('_factory', '_resolved', '_lazy_items'):
+            raise AttributeError(attr)
+
+        return getattr(resolve(self), attr)
+
+    def __call__(self, *args, **kwargs):
+        return resolve(self)(*args, **kwargs)
+
+
+def resolve(proxy):
+    """
+    Returns the proxy a LazyProxy stands for in the current process,
+    creating it if this is its first use in the process.
+    Returns any other object as it is.
+    """
+    if not isinstance(proxy, LazyProxy):
+        return proxy
+
+    pid = os.getpid()
+    resolved = proxy._resolved
+
+    if resolved is None or resolved[0] != pid:
+        with _lazy_lock:
+            resolved = proxy._resolved
+            if resolved is None or resolved[0] != pid:
+                resolved = proxy._resolved = (pid, proxy._factory())
+
+    return resolved[1]
+
+
+def _resolve_item(proxy, key):
+    """
+    Returns the item with the given key of the proxy a LazyProxy resolves to
+    """
+    return resolve(proxy)[key]
+
+
+def _reset_lazy_lock():
+    """
+    Replaces the lock of the LazyProxies in a forked process, it could have
+    been held by another thread of the parent while it forked
+    """
+    global _lazy_lock
+    _lazy_lock = threading.RLock()
+
+
+def _failed_address(exc):
+    """
+    Returns the (host, port) address of the server a ConnectionFailure was
+    raised for, or None if it is not on the error message.
+    """
+    match = re.match(r'^(\S+):(\d+): ', str(exc or ''))
+
+    return (match.group(1), int(match.group(2))) if match else None
+
+
+def _recovery_mode():
+    """
+    Returns the RECOVERY_MODE setting.
+    Raises ValueError if it is not one of RECOVERY_MODES.
+    """
+    from .settings import settings
+
+    if settings.RECOVERY_MODE not in RECOVERY_MODES:
+        raise ValueError(
+            'RECOVERY_MODE must be one of {0}, not {1!r}'.format(
+                ', '.join(sorted(RECOVERY_MODES)), settings.RECOVERY_MODE
+            )
+        )
+
+    return settings.RECOVERY_MODE
+
+
+def _get_db(name=None):
     """
     Returns the connection to the database using the settings.
+    The MONGODB setting is used if no name is given, otherwise the setting
+    with the given name on DATABASES.
     This function should not be called outside of this file.
-    Use db instead.
+    Use db or get_db instead.
     """
-    from .settings import settings
-    mongo = settings.MONGODB
+    from .metrics import listener
+    from .settings import DEFAULT, settings
+
+    _recovery_mode()
+
+    if name:
+        if name not in settings.DATABASES:
+            raise ValueError(
+                '\'{0}\' is not a database on the DATABASES setting'.format(
+                    name
+                )
+            )
+
+        mongo = dict(DEFAULT['MONGODB'], **settings.DATABASES[name])
+    else:
+        mongo = settings.MONGODB
 
     if 'URI' in mongo and mongo['URI']:
         uri = mongo['URI']
@@ -118,10 +718,49 @@ def _get_db():
         if 'OPTIONS' in mongo and mongo['OPTIONS']:
             uri += '?{0}'.format('&'.join(mongo['OPTIONS']))
 
-    client = ConnectionFailureProxy(MongoClient(uri, connect=False))
+    event_listeners = []
+    if dict(DEFAULT['METRICS'], **settings.METRICS)['ENABLED']:
+        event_listeners.append(listener)
+
+    client = ConnectionFailureProxy(
+        MongoClient(
+            uri, connect=False, event_listeners=event_listeners
+        ), CircuitBreaker(
+            ','.join(
+                '{0}:{1}'.format(host, port)
+                for (host, port) in parse_uri(uri)['nodelist']
+            )
+        )
+    )
     database = client[parse_uri(uri)['database']]
 
     return database
 
 
-db = _get_db()
+def get_db(name=None):
+    """
+    Returns the connection to the database with the given name from the
+    DATABASES setting.
+    Like db, it only creates its client when first used in each process.
+    Returns db if no name is given.
+    """
+    if not name:
+        return db
+
+    try:
+        return _databases[name]
+    except KeyError:
+        with _databases_lock:
+            if name not in _databases:
+                _databases[name] = LazyProxy(partial(_get_db, name))
+
+            return _databases[name]
+
+
+_lazy_lock = threading.RLock()
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_lazy_lock)
+
+db = LazyProxy(_get_db)
+_databases = {}
+_databases_lock = threading.Lock()
@@ -9,6 +9,7 @@ __all__ = [
     'DocumentError',
     'UnidentifiedDocumentError',
     'DocumentNotFoundError',
+    'InvalidDocumentError',
     'SchemaValidationError',
     'DocumentValidationError',
     'UnknownFieldError',
@@ -23,6 +24,7 @@ __all__ = [
     'ValuesNotAllowedError',
     'MinValueError',
     'MaxValueError',
+    'InvalidPageTokenError',
 ]
 
 
@@ -100,6 +102,20 @@ class DocumentNotFoundError(DocumentError):
         self['_id'] = _id
 
 
+class InvalidDocumentError(DocumentError):
+
+    def __init__(self, collection=None, document=None):
+        super(InvalidDocumentError, self).__init__(
+            13,
+            'InvalidDocumentError',
+            'The given document from collection \'{0}\' is not an object.'
+            ''.format(collection)
+        )
+
+        self['collection'] = collection
+        self['document'] = document
+
+
 # Schema Validation Errors: 20 - 99
 class SchemaValidationError(MongoRestError):
 
@@ -322,3 +338,16 @@ class MaxValueError(SchemaValidationError):
         self['collection'] = collection
         self['field'] = field
         self['max_value'] = max_value
+
+
+# Pagination Errors: 100 - 109
+class InvalidPageTokenError(MongoRestError):
+
+    def __init__(self, page_token=None):
+        super(InvalidPageTokenError, self).__init__(
+            100,
+            'InvalidPageTokenError',
+            '\'{0}\' is not a valid page token.'.format(page_token)
+        )
+
+        self['page_token'] = page_token
@@ -0,0 +1,235 @@
+# -*- encoding: UTF-8 -*-
+from __future__ import absolute_import, unicode_literals
+
+import bisect
+import os
+import six
+import threading
+import time
+
+from bson import BSON
+from pymongo import monitoring
+
+from .settings import DEFAULT, settings
+
+__all__ = [
+    'metrics',
+]
+
+
+class Histogram(object):
+    """
+    Histogram of values in milliseconds, with fixed buckets
+    """
+    bounds = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+    def __init__(self):
+        self.count = 0
+        self.sum = 0.0
+        self.buckets = [0] * (len(self.bounds) + 1)
+
+    def observe(self, value):
+        """
+        Adds the value to the histogram
+        """
+        self.count += 1
+        self.sum += value
+        self.buckets[bisect.bisect_left(self.bounds, value)] += 1
+
+    def snapshot(self):
+        """
+        Returns the count, sum and the count of each bucket by upper bound
+        """
+        return {
+            'count': self.count,
+            'sum': self.sum,
+            'buckets': dict(
+                zip([str(bound) for bound in self.bounds] + ['inf'],
+                    self.buckets)
+            ),
+        }
+
+
+class Metrics(object):
+    """
+    Metrics of the database commands and of the requests of this process.
+    Commands are recorded by collection and command name, with their latency,
+    errors and, if METRICS['REPLY_SIZES'] is enabled, reply sizes, measured
+    by encoding each reply again.
+    Requests are recorded by Resource endpoint, with their latency, the time
+    spent on the database while handling them and their commands.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.commands = {}
+        self.endpoints = {}
+        self._config = None
+
+    @property
+    def config(self):
+        """
+        Returns the METRICS setting, read once for each settings module so
+        requests do not load the settings
+        """
+        module = os.environ.get('MONGOREST_SETTINGS_MODULE')
+
+        config = self._config
+        if config is None or config[0] != module:
+            config = self._config = (
+                module, dict(DEFAULT['METRICS'], **settings.METRICS)
+            )
+
+        return config[1]
+
+    @property
+    def enabled(self):
+        return self.config['ENABLED']
+
+    def start_request(self, endpoint):
+        """
+        Attributes the commands of the current thread to the endpoint.
+        Returns the request to give to finish_request or None if metrics are
+        disabled.
+        """
+        if not self.enabled:
+            return None
+
+        self.local.request = {
+            'endpoint': endpoint,
+            'started': time.time(),
+            'database': 0.0,
+            'commands': {},
+        }
+
+        return self.local.request
+
+    def finish_request(self, request):
+        """
+        Records the request started by start_request.
+        It may be finished on another thread than the one it started on.
+        """
+        if request is None:
+            return
+
+        latency = (time.time() - request['started']) * 1000
+        if getattr(self.local, 'request', None) is request:
+            self.local.request = None
+
+        with self.lock:
+            stats = self.endpoints.get(request['endpoint'])
+            if stats is None:
+                stats = self.endpoints[request['endpoint']] = {
+                    'requests': Histogram(),
+                    'database': Histogram(),
+                    'commands': {},
+                }
+
+            stats['requests'].observe(latency)
+            stats['database'].observe(request['database'])
+
+            commands = stats['commands']
+            for (name, count) in request['commands'].items():
+                commands[name] = commands.get(name, 0) + count
+
+    def command(self, collection, name, latency, reply_size=None,
+                failed=False):
+        """
+        Records a command that took latency milliseconds
+        """
+        key = '{0}.{1}'.format(collection, name) if collection else name
+
+        with self.lock:
+            stats = self.commands.get(key)
+            if stats is None:
+                stats = self.commands[key] = {
+                    'latency': Histogram(),
+                    'errors': 0,
+                    'reply_size': {'count': 0, 'sum': 0, 'max': 0},
+                }
+
+            stats['latency'].observe(latency)
+
+            if failed:
+                stats['errors'] += 1
+
+            if reply_size is not None:
+                sizes = stats['reply_size']
+                sizes['count'] += 1
+                sizes['sum'] += reply_size
+                sizes['max'] = max(sizes['max'], reply_size)
+
+        request = getattr(self.local, 'request', None)
+        if request is not None:
+            request['database'] += latency
+            request['commands'][key] = request['commands'].get(key, 0) + 1
+
+    def snapshot(self):
+        """
+        Returns a copy of the metrics that can be serialized
+        """
+        with self.lock:
+            return {
+                'commands': dict(
+                    (key, {
+                        'latency': stats['latency'].snapshot(),
+                        'errors': stats['errors'],
+                        'reply_size': dict(stats['reply_size']),
+                    }) for (key, stats) in self.commands.items()
+                ),
+                'endpoints': dict(
+                    (endpoint, {
+                        'requests': stats['requests'].snapshot(),
+                        'database': stats['database'].snapshot(),
+                        'commands': dict(stats['commands']),
+                    }) for (endpoint, stats) in self.endpoints.items()
+                ),
+            }
+
+    def reset(self):
+        """
+        Forgets all the recorded metrics
+        """
+        with self.lock:
+            self.commands = {}
+            self.endpoints = {}
+
+
+class CommandListener(monitoring.CommandListener):
+    """
+    PyMongo command listener that records every command on the metrics
+    """
+
+    def __init__(self, metrics):
+        self.metrics = metrics
+        self.collections = {}
+
+    def started(self, event):
+        collection = event.command.get(event.command_name)
+        if event.command_name == 'getMore':
+            collection = event.command.get('collection')
+
+        self.collections[(event.connection_id, event.request_id)] = (
+            collection if isinstance(collection, six.string_types) else ''
+        )
+
+    def succeeded(self, event):
+        reply_size = None
+        if self.metrics.config['REPLY_SIZES']:
+            reply_size = len(BSON.encode(event.reply))
+
+        self.metrics.command(
+            self.collections.pop((event.connection_id, event.request_id), ''),
+            event.command_name, event.duration_micros / 1000.0, reply_size
+        )
+
+    def failed(self, event):
+        self.metrics.command(
+            self.collections.pop((event.connection_id, event.request_id), ''),
+            event.command_name, event.duration_micros / 1000.0, failed=True
+        )
+
+
+metrics = Metrics()
+listener = CommandListener(metrics)
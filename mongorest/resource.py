@@ -1,13 +1,31 @@
 # -*- encoding: UTF-8 -*-
 from __future__ import absolute_import, unicode_literals
 
+import base64
+import binascii
+import hashlib
 import six
+from bson.son import SON
 from datetime import datetime
 from werkzeug.routing import Map, Rule
 
 from .collection import Collection
-from .errors import DocumentNotFoundError
-from .utils import deserialize, serialize
+from .errors import (
+    DocumentNotFoundError,
+    InvalidDocumentError,
+    InvalidPageTokenError,
+)
+from .metrics import metrics
+from .settings import settings
+from .utils import (
+    deserialize,
+    serialize,
+    serialize_stream,
+    _get_field,
+    _keyset_filter,
+    _keyset_projection,
+    _pop_field,
+)
 from .wrappers import Response
 from .wsgi import WSGIWrapper
 
@@ -17,7 +35,9 @@ __all__ = [
     'CreateResourceMixin',
     'RetrieveResourceMixin',
     'UpdateResourceMixin',
+    'PatchResourceMixin',
     'DeleteResourceMixin',
+    'MetricsResource',
 ]
 
 
@@ -60,31 +80,129 @@ class Resource(six.with_metaclass(ResourceMeta, WSGIWrapper)):
     """
     Just a class that puts together te WSGIWrapper and the ResourceMeta
     To be used as base for any resource to be created.
+    The read_preference and max_staleness override the ones of the collection
+    for the reads made by the list and retrieve actions. A max_staleness
+    alone is used with the read preference of the collection.
     """
     collection = Collection
+    read_preference = None
+    max_staleness = None
 
 
 class ListResourceMixin(Resource):
     """
     Resource Mixin that provides the list action for your endpoint.
+    Pages are sent with an ETag and are not sent again, but answered with a
+    304, to clients that already have them.
     """
     rules = [Rule('/', methods=['GET'], endpoint='list')]
+    streaming = False
 
     def list(self, request):
         """
-        Returns the list of documents found on the collection
+        Returns one page of the documents found on the collection
+        The token for the next page is sent on the X-Next-Page-Token header
+        The documents are streamed instead if streaming is True, as NDJSON
+        if the client accepts application/x-ndjson
         """
-        pipeline = [{'$match': request.args.pop('match', {})}]
+        if self.streaming:
+            return self.stream_list(
+                request, request.accept_mimetypes.best_match(
+                    ['application/json', 'application/x-ndjson']
+                ) == 'application/x-ndjson'
+            )
+
+        match = request.args.pop('match', {})
+
+        sort = list(request.args.pop('sort', {}).items())
+        if '_id' not in dict(sort):
+            sort.append(('_id', 1))
 
-        sort = request.args.pop('sort', {})
-        if sort:
-            pipeline.append({'$sort': sort})
+        page_token = request.args.pop('page_token', None)
+        if page_token:
+            values = _decode_page_token(page_token, len(sort))
+
+            if values is None:
+                return Response(
+                    response=serialize(InvalidPageTokenError(page_token)),
+                    status=400
+                )
 
+            match = {'$and': [match, _keyset_filter(sort, values)]}
+
+        limit = request.args.pop('limit', settings.PAGE_SIZE)
+        if not isinstance(limit, six.integer_types) or limit < 1:
+            limit = settings.PAGE_SIZE
+        limit = min(limit, settings.MAX_PAGE_SIZE)
+
+        pipeline = [
+            {'$match': match},
+            {'$sort': SON(sort)},
+            {'$limit': limit + 1},
+        ]
+
+        hidden = []
         project = request.args.pop('project', {})
         if project:
-            pipeline.append({'$project': project})
+            project, hidden = _keyset_projection(project, sort)
+
+            if project:
+                pipeline.append({'$project': project})
+
+        documents, headers = self.collection.aggregate(
+            pipeline, read_preference=self.read_preference,
+            max_staleness=self.max_staleness
+        ), {}
+        if len(documents) > limit:
+            documents = documents[:limit]
+            headers['X-Next-Page-Token'] = _encode_page_token(
+                [_get_field(documents[-1], field) for (field, _) in sort]
+            )
 
-        return Response(serialize(self.collection.aggregate(pipeline)))
+        for document in documents:
+            for field in hidden:
+                _pop_field(document, field)
+
+        body = None
+        versions = [_version(document) for document in documents]
+        if all(versions):
+            etag = _etag([project, versions, headers])
+        else:
+            body = serialize(documents)
+            etag = _etag(body)
+
+        if _is_not_modified(request, etag):
+            return _not_modified(etag, headers=headers)
+
+        response = Response(
+            body if body is not None else serialize(documents),
+            headers=headers
+        )
+        response.set_etag(etag)
+
+        return response
+
+    def stream_list(self, request, ndjson=False):
+        """
+        Returns all the documents found on the collection as a chunked JSON
+        array, or as newline delimited JSON if ndjson=True
+        Documents are encoded one at a time as they come from the cursor,
+        which resumes after the last document sent if the connection fails
+        """
+        match = request.args.pop('match', {})
+        sort = list(request.args.pop('sort', {}).items())
+        project = request.args.pop('project', {})
+
+        return Response(
+            response=serialize_stream(
+                self.collection.find(
+                    match, projection=project or None, sort=sort or None,
+                    stream=True, read_preference=self.read_preference,
+                    max_staleness=self.max_staleness
+                ), ndjson
+            ),
+            mimetype='application/x-ndjson' if ndjson else None
+        )
 
 
 class CreateResourceMixin(Resource):
@@ -96,7 +214,11 @@ class CreateResourceMixin(Resource):
     def create(self, request):
         """
         Creates a new document based on the given data
+        If the data is a list, creates a document for each of its items
         """
+        if isinstance(request.json, list):
+            return self.create_many(request)
+
         document = self.collection(request.json)
         document.created_at = datetime.utcnow()
         document.updated_at = document.created_at
@@ -113,10 +235,61 @@ class CreateResourceMixin(Resource):
             )
         )
 
+    def create_many(self, request):
+        """
+        Creates the documents of the given list with insert_documents, which
+        is ordered unless ordered=false is passed.
+        Items that are not objects get an InvalidDocumentError in their slot.
+        Returns the created document or the errors of each item, in order,
+        with 201 if all of them were created, 400 if none of them was or
+        207 otherwise.
+        """
+        now = datetime.utcnow()
+
+        documents, invalid = [], {}
+        for index, data in enumerate(request.json):
+            if not isinstance(data, dict):
+                invalid[index] = InvalidDocumentError(
+                    self.collection.__name__, data
+                )
+                continue
+
+            document = self.collection(data)
+            document.created_at = now
+            document.updated_at = now
+
+            documents.append(document)
+
+        inserted = iter(self.collection.insert_documents(
+            documents, request.args.pop('ordered', True) is not False
+        ))
+        created = [
+            invalid[index] if index in invalid else next(inserted)
+            for index in range(len(request.json))
+        ]
+
+        failed = len([
+            result for result in created if all(
+                key in result for key in [
+                    'error_code', 'error_type', 'error_message'
+                ]
+            )
+        ])
+
+        return Response(
+            response=serialize(created),
+            status=(
+                201 if not failed else 400 if failed == len(created) else 207
+            )
+        )
+
 
 class RetrieveResourceMixin(Resource):
     """
     Resource Mixin that provides the retrieve action for your endpoint.
+    Documents are sent with an ETag and, if they have an updated_at, with a
+    Last-Modified date. Clients that already have the document get a 304,
+    found by reading only its _id and updated_at.
     """
     rules = [Rule('/<_id>/', methods=['GET'], endpoint='retrieve')]
 
@@ -126,9 +299,37 @@ class RetrieveResourceMixin(Resource):
         """
         _id = deserialize(_id)
 
-        retrieved = self.collection.find_one({'_id': _id})
+        if request.if_none_match or request.if_modified_since:
+            version = _version(
+                self.collection.find_one(
+                    {'_id': _id}, {'_id': 1, 'updated_at': 1},
+                    read_preference=self.read_preference,
+                    max_staleness=self.max_staleness
+                )
+            )
+
+            if version is not None and _is_not_modified(
+                request, _etag(version), version[1]
+            ):
+                return _not_modified(_etag(version), version[1])
+
+        retrieved = self.collection.find_one(
+            {'_id': _id}, read_preference=self.read_preference,
+            max_staleness=self.max_staleness
+        )
         if retrieved:
-            return Response(serialize(retrieved))
+            body, version = serialize(retrieved), _version(retrieved)
+            etag = _etag(version if version is not None else body)
+            last_modified = version[1] if version is not None else None
+
+            if _is_not_modified(request, etag, last_modified):
+                return _not_modified(etag, last_modified)
+
+            response = Response(body)
+            response.set_etag(etag)
+            response.last_modified = last_modified
+
+            return response
         else:
             return Response(
                 response=serialize(
@@ -150,7 +351,9 @@ class UpdateResourceMixin(Resource):
         """
         _id = deserialize(_id)
 
-        to_update = self.collection.find_one({'_id': _id})
+        to_update = self.collection.find_one(
+            {'_id': _id}, read_preference='primary', cache=False
+        )
         if to_update:
             document = self.collection(dict(to_update, **request.json))
             document.updated_at = datetime.utcnow()
@@ -175,6 +378,51 @@ class UpdateResourceMixin(Resource):
             )
 
 
+class PatchResourceMixin(Resource):
+    """
+    Resource Mixin that provides the patch action for your endpoint.
+    The data is a JSON merge patch: nested objects are merged into the saved
+    ones and null removes a field.
+    """
+    rules = [Rule('/<_id>/', methods=['PATCH'], endpoint='patch')]
+
+    def patch(self, request, _id):
+        """
+        Sets the given fields of the document with the given _id, removing
+        the ones given as null, validating only the given fields.
+        Returns 400 if the given data is not an object.
+        """
+        _id = deserialize(_id)
+
+        data = {} if request.json is None else request.json
+        if not isinstance(data, dict):
+            return Response(
+                response=serialize(
+                    InvalidDocumentError(self.collection.__name__, data)
+                ),
+                status=400
+            )
+
+        data = dict(data)
+        data.pop('_id', None)
+        fields, unset = _merge_patch(data)
+
+        document = self.collection(dict(fields, _id=_id), partial=True)
+        document.updated_at = datetime.utcnow()
+
+        patched = document.patch(unset=unset)
+        return Response(
+            response=serialize(patched),
+            status=(
+                200 if not all(
+                    key in patched for key in [
+                        'error_code', 'error_type', 'error_message'
+                    ]
+                ) else 400
+            )
+        )
+
+
 class DeleteResourceMixin(Resource):
     """
     Resource Mixin that provides the delete action for your endpoint.
@@ -185,26 +433,140 @@ class DeleteResourceMixin(Resource):
         """
         Deletes the document with the given _id if it exists
         """
-        _id = deserialize(_id)
+        deleted = self.collection.delete_by_id(deserialize(_id))
+
+        if isinstance(deleted, DocumentNotFoundError):
+            status = 404
+        elif all(
+            key in deleted for key in [
+                'error_code', 'error_type', 'error_message'
+            ]
+        ):
+            status = 400
+        else:
+            status = 200
 
-        to_delete = self.collection.get({'_id': _id})
-        if to_delete:
-            deleted = to_delete.delete()
+        return Response(response=serialize(deleted), status=status)
 
-            return Response(
-                response=serialize(deleted),
-                status=(
-                    200 if not all(
-                        key in deleted for key in [
-                            'error_code', 'error_type', 'error_message'
-                        ]
-                    ) else 400
-                )
-            )
+
+class MetricsResource(Resource):
+    """
+    Resource that returns the metrics of the process serving the request,
+    add it to the resources of the WSGIDispatcher to expose them.
+    The METRICS setting must be enabled for metrics to be recorded.
+    """
+    endpoint = 'metrics'
+    rules = [Rule('/', methods=['GET'], endpoint='snapshot')]
+
+    def snapshot(self, request):
+        """
+        Returns the metrics of the database commands and of the requests
+        """
+        return Response(response=serialize(metrics.snapshot()), status=200)
+
+
+def _version(document):
+    """
+    Returns the _id and the updated_at of the document, that identify its
+    version, or None if it does not have both
+    """
+    if not isinstance(document, dict) or '_id' not in document or \
+            not isinstance(document.get('updated_at'), datetime):
+        return None
+
+    updated_at = document['updated_at']
+    if updated_at.tzinfo is not None:
+        updated_at = (
+            updated_at - updated_at.utcoffset()
+        ).replace(tzinfo=None)
+
+    return [document['_id'], updated_at]
+
+
+def _etag(value):
+    """
+    Returns the ETag of the given version or serialized body
+    """
+    if not isinstance(value, six.string_types):
+        value = serialize(value)
+
+    return hashlib.md5(value.encode('utf-8')).hexdigest()
+
+
+def _is_not_modified(request, etag, last_modified=None):
+    """
+    Returns True if the If-None-Match or, when it is not sent, the
+    If-Modified-Since header of the request show the client already has the
+    representation with the given ETag and Last-Modified date
+    """
+    if request.if_none_match:
+        return request.if_none_match.contains_weak(etag)
+
+    if last_modified is not None and request.if_modified_since:
+        return last_modified.replace(microsecond=0) <= \
+            request.if_modified_since.replace(tzinfo=None)
+
+    return False
+
+
+def _not_modified(etag, last_modified=None, headers=None):
+    """
+    Returns the 304 response for a representation with the given ETag
+    """
+    response = Response(status=304, headers=headers)
+    response.set_etag(etag)
+    response.last_modified = last_modified
+
+    return response
+
+
+def _merge_patch(patch, parent=''):
+    """
+    Splits a JSON merge patch into the fields to set, without the nulls, and
+    the dotted fields to unset, the ones given as null
+    Empty objects change nothing, like merging them into the saved ones
+    """
+    fields, unset = {}, []
+
+    for (key, value) in patch.items():
+        if value is None:
+            unset.append(parent + key)
+        elif isinstance(value, dict):
+            nested, nested_unset = _merge_patch(value, parent + key + '.')
+            if nested:
+                fields[key] = nested
+
+            unset.extend(nested_unset)
         else:
-            return Response(
-                response=serialize(
-                    DocumentNotFoundError(self.collection.__name__, _id)
-                ),
-                status=404
-            )
+            fields[key] = value
+
+    return fields, unset
+
+
+def _encode_page_token(values):
+    """
+    Encodes the sort key values of the last document of a page into an opaque
+    url safe token
+    """
+    token = base64.urlsafe_b64encode(serialize(values).encode('utf-8'))
+    return token.decode('ascii').rstrip('=')
+
+
+def _decode_page_token(token, length):
+    """
+    Decodes a page token into the sort key values it was created from
+    Returns None if the token is not valid for a sort with the given length
+    """
+    try:
+        values = deserialize(
+            base64.urlsafe_b64decode(
+                (token + '=' * (-len(token) % 4)).encode('ascii')
+            ).decode('utf-8')
+        )
+    except (binascii.Error, TypeError, ValueError):
+        return None
+
+    if not isinstance(values, list) or len(values) != length:
+        return None
+
+    return values
@@ -0,0 +1,230 @@
+# -*- encoding: UTF-8 -*-
+from __future__ import absolute_import, unicode_literals
+
+import errno
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+import time
+
+from werkzeug.serving import BaseWSGIServer
+
+from .settings import DEFAULT, settings
+from .wsgi import warmup
+
+__all__ = [
+    'Server',
+]
+
+
+class Server(object):
+    """
+    Pre-fork server for WSGI apps, like a WSGIDispatcher.
+    The master process binds the listening socket and forks the workers that
+    share it, or, with reuse_port, that bind their own with SO_REUSEPORT so
+    the kernel balances the connections between them.
+    Each worker gets its own MongoClient, warms up the resources of the app
+    and serves one request at a time until it is told to stop.
+    SIGHUP gracefully restarts the workers, SIGTERM and SIGINT gracefully
+    stop the server, workers that die are replaced and workers that do not
+    stop within graceful_timeout seconds are killed.
+    """
+    interval = 0.5
+
+    def __init__(self, app, host=None, port=None, workers=None,
+                 reuse_port=None, graceful_timeout=None):
+        config = dict(DEFAULT['SERVER'], **settings.SERVER)
+
+        self.app = app
+        self.host = host or config['HOST']
+        self.port = config['PORT'] if port is None else port
+        self.workers = (
+            workers or config['WORKERS'] or multiprocessing.cpu_count()
+        )
+        self.reuse_port = (
+            config['REUSE_PORT'] if reuse_port is None else reuse_port
+        )
+        self.graceful_timeout = (
+            config['GRACEFUL_TIMEOUT'] if graceful_timeout is None
+            else graceful_timeout
+        )
+        self.logger = logging.getLogger(__name__)
+        self.socket = None
+        self.children = {}
+        self.stopping = {}
+        self.running = False
+        self.restarting = False
+
+    def bind(self):
+        """
+        Returns a new socket listening on host and port
+        """
+        sock = socket.socket(
+            socket.AF_INET6 if ':' in self.host else socket.AF_INET,
+            socket.SOCK_STREAM
+        )
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+
+        if self.reuse_port:
+            if not hasattr(socket, 'SO_REUSEPORT'):
+                raise ValueError('SO_REUSEPORT is not supported')
+
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+
+        sock.bind((self.host, self.port))
+        sock.listen(BaseWSGIServer.request_queue_size)
+
+        return sock
+
+    def run(self):
+        """
+        Runs the master process until it is stopped
+        """
+        sock = self.bind()
+        self.port = sock.getsockname()[1]
+
+        if self.reuse_port:
+            sock.close()
+        else:
+            self.socket = sock
+
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+        signal.signal(signal.SIGHUP, self.restart)
+
+        self.logger.info(
+            'Listening on http://%s:%s with %s workers',
+            self.host, self.port, self.workers
+        )
+
+        self.running = True
+        while self.running:
+            if self.restarting:
+                self.restarting = False
+                self.terminate(list(self.children))
+
+            while len(self.children) - len(self.stopping) < self.workers:
+                self.spawn()
+
+            self.reap()
+            time.sleep(self.interval)
+
+        self.terminate(list(self.children))
+        while self.children:
+            self.reap()
+            time.sleep(self.interval / 10)
+
+        if self.socket is not None:
+            self.socket.close()
+
+        self.logger.info('Stopped')
+
+    def stop(self, *args):
+        """
+        Gracefully stops the workers and then the master process
+        """
+        self.running = False
+
+    def restart(self, *args):
+        """
+        Starts new workers and gracefully stops the current ones
+        """
+        self.restarting = True
+
+    def spawn(self):
+        """
+        Forks a new worker
+        """
+        master = os.getpid()
+        pid = os.fork()
+
+        if pid:
+            self.children[pid] = time.time()
+            return pid
+
+        code = 0
+        try:
+            self.serve(master)
+        except BaseException:
+            self.logger.exception('Worker %s failed', os.getpid())
+            code = 1
+        finally:
+            os._exit(code)
+
+    def terminate(self, pids):
+        """
+        Asks the workers to stop after their current request
+        """
+        for pid in pids:
+            if pid not in self.stopping:
+                self.stopping[pid] = time.time() + self.graceful_timeout
+                self.kill(pid, signal.SIGTERM)
+
+    def reap(self):
+        """
+        Forgets the workers that exited and kills the ones that did not stop
+        within graceful_timeout seconds
+        """
+        for pid in list(self.children):
+            try:
+                exited, status = os.waitpid(pid, os.WNOHANG)
+            except OSError as exc:
+                if exc.errno != errno.ECHILD:
+                    raise
+
+                exited, status = pid, 0
+
+            if exited:
+                self.children.pop(pid)
+                if self.stopping.pop(pid, None) is None:
+                    self.logger.warning(
+                        'Worker %s exited with status %s', pid, status
+                    )
+            elif pid in self.stopping and self.stopping[pid] < time.time():
+                self.kill(pid, signal.SIGKILL)
+
+    def kill(self, pid, sig):
+        """
+        Sends the signal to the worker if it is still running
+        """
+        try:
+            os.kill(pid, sig)
+        except OSError as exc:
+            if exc.errno != errno.ESRCH:
+                raise
+
+    def serve(self, master=None):
+        """
+        Runs a worker process until it receives SIGTERM or its master dies
+        """
+        self.running = True
+
+        def stop(*args):
+            self.running = False
+
+        signal.signal(signal.SIGTERM, stop)
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        signal.signal(signal.SIGHUP, signal.SIG_IGN)
+
+        connections = None if dict(
+            DEFAULT['WARMUP'], **settings.WARMUP
+        )['ENABLED'] else 0
+        if hasattr(self.app, 'warm_up'):
+            self.app.warm_up(connections)
+        else:
+            warmup(getattr(self.app, 'resources', None), connections)
+
+        sock = self.bind() if self.reuse_port else self.socket
+        server = BaseWSGIServer(
+            self.host, self.port, self.app, fd=sock.fileno()
+        )
+        server.socket.settimeout(self.interval)
+        server.timeout = self.interval
+
+        while self.running and os.getppid() == (master or os.getppid()):
+            server.handle_request()
+
+        server.server_close()
+        sock.close()
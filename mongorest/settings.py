@@ -12,7 +12,21 @@ __all__ = [
 
 
 DEFAULT = {
+    'ASYNC_WORKERS': 32,
     'AUTH_COLLECTION': '',
+    'BULK_BATCH_SIZE': 1000,
+    'CACHE_WATCHER': {
+        'ENABLED': False,
+        'INTERVAL': 1,
+        'RETRY_TIME': 60,
+    },
+    'CIRCUIT_BREAKER': {
+        'ENABLED': False,
+        'FAILURE_THRESHOLD': 5,
+        'RECOVERY_TIME': 30,
+        'HALF_OPEN_PROBES': 1,
+        'LISTENER': '',
+    },
     'CORS': {
         'Access-Control-Allow-Origin': '*',
         'Access-Control-Allow-Methods': 'GET,POST,PUT,PATCH,DELETE,OPTIONS',
@@ -22,6 +36,12 @@ DEFAULT = {
                                         'X-Requested-With',
         'Access-Control-Allow-Credentials': 'true',
     },
+    'DATABASES': {},
+    'METRICS': {
+        'ENABLED': False,
+        # Measuring a reply encodes it again, once for every command
+        'REPLY_SIZES': False,
+    },
     'MIDDLEWARES': [],
     'MONGODB': {
         'URI': '',
@@ -34,10 +54,31 @@ DEFAULT = {
         'DATABASE': 'mongorest',
         'OPTIONS': [],
     },
+    'PAGE_SIZE': 100,
+    'MAX_PAGE_SIZE': 1000,
+    'RECOVERY_MODE': 'client',
     'RETRY_LIMIT': 5,
+    'WRITE_RETRY_LIMIT': None,
     'BASE_RETRY_TIME': 2,
     'LINEAR_RETRIES': False,
+    'RETRY_JITTER': False,
+    'RETRY_BUDGET': {
+        'ENABLED': False,
+        'RATIO': 0.1,
+        'CAPACITY': 10,
+    },
+    'SERVER': {
+        'HOST': '127.0.0.1',
+        'PORT': 5000,
+        'WORKERS': 0,
+        'REUSE_PORT': False,
+        'GRACEFUL_TIMEOUT': 30,
+    },
     'SESSION_STORE': '',
+    'WARMUP': {
+        'ENABLED': False,
+        'MIN_CONNECTIONS': 1,
+    },
 }
 
 
@@ -10,6 +10,7 @@ from six import string_types
 __all__ = [
     'deserialize',
     'serialize',
+    'serialize_stream',
 ]
 
 
@@ -33,3 +34,120 @@ def serialize(to_serialize, *args, **kwargs):
     Serializes a PyMongo BSON into a string
     """
     return bson_dumps(to_serialize, *args, **kwargs)
+
+
+def serialize_stream(to_serialize, ndjson=False, chunk_size=8192, *args,
+                     **kwargs):
+    """
+    Serializes an iterable of PyMongo BSONs into chunks of a JSON array
+    If ndjson=True the chunks are of newline delimited JSON instead
+    Documents are consumed one at a time, so the iterable is never loaded
+    """
+    buffered, length = [] if ndjson else ['['], 0
+
+    for i, document in enumerate(to_serialize):
+        serialized = serialize(document, *args, **kwargs)
+
+        if ndjson:
+            serialized += '\n'
+        elif i:
+            serialized = ', ' + serialized
+
+        buffered.append(serialized)
+        length += len(serialized)
+
+        if length >= chunk_size:
+            yield ''.join(buffered)
+            buffered, length = [], 0
+
+    if not ndjson:
+        buffered.append(']')
+
+    if buffered:
+        yield ''.join(buffered)
+
+
+def _keyset_filter(sort, values):
+    """
+    Returns the filter that matches the documents that come after the given
+    sort key values on the given sort
+    Null and missing fields sort before any value, but are not matched by
+    $gt or $lt, so they are matched explicitly
+    """
+    clauses = []
+    for i, (field, direction) in enumerate(sort):
+        clause = dict(
+            (previous, values[j]) for (j, (previous, _)) in enumerate(sort[:i])
+        )
+
+        if values[i] is None:
+            if direction < 0:
+                continue
+
+            clause[field] = {'$ne': None}
+        elif direction > 0:
+            clause[field] = {'$gt': values[i]}
+        else:
+            clause['$or'] = [{field: {'$lt': values[i]}}, {field: None}]
+
+        clauses.append(clause)
+
+    return {'$or': clauses} if clauses else {'_id': {'$exists': False}}
+
+
+def _keyset_projection(project, sort):
+    """
+    Returns the projection changed to keep the sort keys needed to resume
+    after the last document and the list of fields that must be hidden from
+    the documents
+    Excluded fields that contain a sort key are kept and hidden instead
+    """
+    project, hidden = dict(project), []
+    inclusion = all(project.values()) or any(
+        value for (key, value) in project.items() if key != '_id'
+    )
+
+    for (field, _) in sort:
+        if not inclusion:
+            excluded = [
+                key for (key, value) in project.items()
+                if not value and (field == key or field.startswith(key + '.'))
+            ]
+
+            for key in excluded:
+                project.pop(key)
+                hidden.append(key)
+        elif field == '_id':
+            if not project.get('_id', 1):
+                project['_id'] = 1
+                hidden.append(field)
+        elif not any(
+            value and (field == key or field.startswith(key + '.'))
+            for (key, value) in project.items()
+        ):
+            project[field] = 1
+            hidden.append(field)
+
+    return project, hidden
+
+
+def _get_field(document, field):
+    """
+    Returns the value of the given dotted field from the document
+    """
+    for key in field.split('.'):
+        document = document.get(key) if isinstance(document, dict) else None
+
+    return document
+
+
+def _pop_field(document, field):
+    """
+    Removes the given dotted field from the document
+    """
+    keys = field.split('.')
+    for key in keys[:-1]:
+        document = document.get(key) if isinstance(document, dict) else None
+
+    if isinstance(document, dict):
+        document.pop(keys[-1], None)
@@ -1,14 +1,25 @@
 # -*- encoding: UTF-8 -*-
 from __future__ import absolute_import, unicode_literals
 
+import copy
+import re
+import six
+import threading
+from datetime import datetime
+
 from bson.objectid import ObjectId
-from collections import Mapping
-from cerberus import Validator as CerberusValidator
+from collections import Mapping, Sequence
+from cerberus import (
+    ValidationError, Validator as CerberusValidator, errors as messages
+)
 
 from .errors import *
 
 __all__ = [
     'Validator',
+    'ThreadLocalValidator',
+    'ErrorTranslator',
+    'compile_schema',
 ]
 
 
@@ -22,73 +33,56 @@ class Validator(CerberusValidator):
             schema=schema or {}, allow_unknown=allow_unknown, **kwargs
         )
 
+        self.compiled = None
+
     def _validate_type_objectid(self, field, value):
         if not isinstance(value, ObjectId):
             self._error(field, 'must be of ObjectId type')
 
-    def validate_document(self, document):
+    def compile(self, schema):
+        """
+        Compiles the schema with compile_schema, and indexes it for the
+        ErrorTranslator, unless it is the schema that was compiled last
+        """
+        if self.compiled is None or self.compiled[0] is not schema:
+            self.compiled = (
+                schema, compile_schema(self, schema, self.allow_unknown),
+                ErrorTranslator(schema),
+                compile_schema(self, schema, self.allow_unknown, True),
+            )
+
+        return self.compiled[1]
+
+    def validate_document(self, document, partial=False):
+        """
+        Validates the document, setting its errors if it is not valid.
+        If partial, the document has only some of the fields, so required
+        fields are not checked.
+        """
         self.schema = document.schema
         collection_name, errors = type(document).__name__, {}
 
-        self.validate(document.document)
-        for key, _errors in self.flattened_errors.items():
-            field = key
-            field_schema = self.get_field_schema(field)
+        self.compile(self.schema)
+        check = self.compiled[3 if partial else 1]
+        if check is not None:
+            if document.document is None:
+                raise ValidationError(messages.ERROR_DOCUMENT_MISSING)
 
+            if not isinstance(document.document, Mapping):
+                raise ValidationError(
+                    messages.ERROR_DOCUMENT_FORMAT.format(document.document)
+                )
+
+            self.document = copy.copy(document.document)
+            self._errors = check(self.document)
+        else:
+            self.validate(document.document, update=partial)
+
+        translator = self.compiled[2]
+        for key, _errors in self.flattened_errors.items():
             _errors = [_errors] if not isinstance(_errors, list) else _errors
             for _error in _errors:
-                error = None
-
-                if _error == 'unknown field':
-                    error = UnknownFieldError(collection_name, field)
-                elif _error == 'required field':
-                    error = RequiredFieldError(collection_name, field)
-                elif _error == 'field is read-only':
-                    error = ReadOnlyFieldError(collection_name, field)
-                elif _error.startswith('must be ') and _error.endswith('type'):
-                    type_or_types = field_schema['type']
-
-                    if isinstance(type_or_types, list):
-                        type_or_types = ' or '.join(type_or_types)
-
-                    error = FieldTypeError(
-                        collection_name, field, type_or_types
-                    )
-                elif 'does not match regex' in _error:
-                    error = RegexMatchError(
-                        collection_name, field,
-                        _error.split('match regex \'')[1][:-1]
-                    )
-                elif _error.startswith('min length is'):
-                    error = MinLengthError(
-                        collection_name, field, field_schema['minlength']
-                    )
-                elif _error.startswith('max length is'):
-                    error = MaxLengthError(
-                        collection_name, field, field_schema['maxlength']
-                    )
-                elif _error.startswith('length of '):
-                    error = LengthError(
-                        collection_name, field, len(field_schema['items'])
-                    )
-                elif _error.startswith('unallowed value '):
-                    error = ValueNotAllowedError(
-                        collection_name, field,
-                        _error.split('unallowed value ')[1]
-                    )
-                elif _error.startswith('unallowed values '):
-                    error = ValuesNotAllowedError(
-                        collection_name, field,
-                        _error.split('unallowed values ')[1]
-                    )
-                elif _error.startswith('min value is '):
-                    error = MinValueError(
-                        collection_name, field, field_schema['min']
-                    )
-                elif _error.startswith('max value is '):
-                    error = MaxValueError(
-                        collection_name, field, field_schema['max']
-                    )
+                error = translator.translate(collection_name, key, _error)
 
                 if error and isinstance(error, SchemaValidationError):
                     try:
@@ -128,14 +122,513 @@ class Validator(CerberusValidator):
         return dict(items)
 
     def get_field_schema(self, field):
-        schema, fields = self.schema, field.split('.')
+        return get_field_schema(self.schema, field)
+
+
+class ThreadLocalValidator(object):
+    """
+    Proxy to a Validator of the current thread, created with the given
+    arguments on its first use by the thread, or right away for the thread
+    that creates the proxy, so invalid schemas are found early.
+    Validating a document changes the state of the Validator, so each thread
+    gets its own and documents are validated concurrently without locks.
+    The schema is compiled once and shared by the Validators of all threads.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        self.local = threading.local()
+        self.local.validator = Validator(*args, **kwargs)
+        self.local.validator.compile(self.local.validator.schema)
+        self.compiled = self.local.validator.compiled
+
+    def __getattr__(self, name):
+        if name in ('args', 'kwargs', 'local', 'compiled'):
+            raise AttributeError(name)
+
+        return getattr(self.validator, name)
+
+    @property
+    def validator(self):
+        """
+        Returns the Validator of the current thread
+        """
+        try:
+            return self.local.validator
+        except AttributeError:
+            validator = Validator(*self.args, **self.kwargs)
+            validator.compiled = self.compiled
+
+            self.local.validator = validator
+
+            return validator
+
+
+def get_field_schema(schema, field):
+    """
+    Returns the schema of the dotted field, walking the schema from its root
+    """
+    for field in field.split('.'):
+        if field in schema:
+            schema = schema.get(field)
+        elif 'schema' in schema and field in schema.get('schema'):
+            schema = schema.get('schema').get(field)
+        elif 'schema' in schema:
+            schema = schema.get('schema')
+
+    return schema
+
+
+def _field_types(field_schema):
+    type_or_types = field_schema['type']
+
+    if isinstance(type_or_types, list):
+        type_or_types = ' or '.join(type_or_types)
+
+    return type_or_types
+
+
+ERRORS = [
+    (lambda message: message == messages.ERROR_UNKNOWN_FIELD,
+     UnknownFieldError, None),
+    (lambda message: message == messages.ERROR_REQUIRED_FIELD,
+     RequiredFieldError, None),
+    (lambda message: message == messages.ERROR_READONLY_FIELD,
+     ReadOnlyFieldError, None),
+    (lambda message: message.startswith('must be ') and
+     message.endswith('type'),
+     FieldTypeError, lambda schema, message: _field_types(schema)),
+    (lambda message: 'does not match regex' in message,
+     RegexMatchError,
+     lambda schema, message: message.split('match regex \'')[1][:-1]),
+    (lambda message: message.startswith('min length is'),
+     MinLengthError, lambda schema, message: schema['minlength']),
+    (lambda message: message.startswith('max length is'),
+     MaxLengthError, lambda schema, message: schema['maxlength']),
+    (lambda message: message.startswith('length of '),
+     LengthError, lambda schema, message: len(schema['items'])),
+    (lambda message: message.startswith('unallowed value '),
+     ValueNotAllowedError,
+     lambda schema, message: message.split('unallowed value ')[1]),
+    (lambda message: message.startswith('unallowed values '),
+     ValuesNotAllowedError,
+     lambda schema, message: message.split('unallowed values ')[1]),
+    (lambda message: message.startswith('min value is '),
+     MinValueError, lambda schema, message: schema['min']),
+    (lambda message: message.startswith('max value is '),
+     MaxValueError, lambda schema, message: schema['max']),
+]
+
+
+class ErrorTranslator(object):
+    """
+    Translates the cerberus error messages of the fields of a schema into
+    mongorest errors, using the ERRORS table of message rules, error classes
+    and the functions that get their argument.
+    The schemas of the fields are indexed by path when it is created and the
+    rule of each field and message is cached, up to cache_size of them.
+    """
+    cache_size = 4096
+
+    def __init__(self, schema):
+        self.schema = schema
+        self.paths = dict(
+            (path, get_field_schema(schema, path))
+            for path in self._walk(schema)
+        )
+        self.rules = {}
+
+    def _walk(self, schema, parent=''):
+        if not isinstance(schema, Mapping):
+            return
+
+        for (field, definition) in schema.items():
+            if not isinstance(field, six.string_types):
+                continue
+
+            path = '{0}.{1}'.format(parent, field) if parent else field
+            yield path
+
+            nested = definition.get('schema') \
+                if isinstance(definition, Mapping) else None
+            if isinstance(nested, Mapping) and nested and all(
+                isinstance(value, Mapping) for value in nested.values()
+            ):
+                for nested_path in self._walk(nested, path):
+                    yield nested_path
+
+    def field_schema(self, field):
+        """
+        Returns the schema of the dotted field
+        """
+        try:
+            return self.paths[field]
+        except KeyError:
+            return get_field_schema(self.schema, field)
+
+    def translate(self, collection, field, message):
+        """
+        Returns the mongorest error of the message of the field or None
+        """
+        key = (field, message)
+
+        try:
+            rule = self.rules[key]
+        except (KeyError, TypeError):
+            rule = None
+            for (matches, error, argument) in ERRORS:
+                if matches(message):
+                    rule = (error, argument)
+                    break
+
+            if len(self.rules) >= self.cache_size:
+                self.rules.clear()
+
+            try:
+                self.rules[key] = rule
+            except TypeError:
+                pass
+
+        if rule is None:
+            return None
+
+        error, argument = rule
+        if argument is None:
+            return error(collection, field)
+
+        return error(
+            collection, field, argument(self.field_schema(field), message)
+        )
+
+
+class NotCompiledError(Exception):
+    """
+    Raised by the schema compiler for rules it does not compile
+    """
+
+
+TYPES = {
+    'boolean': lambda value: isinstance(value, bool),
+    'datetime': lambda value: isinstance(value, datetime),
+    'dict': lambda value: isinstance(value, Mapping),
+    'float': lambda value: isinstance(value, (float,) + six.integer_types),
+    'integer': lambda value: isinstance(value, six.integer_types),
+    'list': lambda value: isinstance(value, Sequence) and
+    not isinstance(value, six.string_types),
+    'number': lambda value: isinstance(value, (float,) + six.integer_types),
+    'objectid': lambda value: isinstance(value, ObjectId),
+    'set': lambda value: isinstance(value, set),
+    'string': lambda value: isinstance(value, six.string_types),
+}
+
+TYPE_MESSAGES = {
+    'objectid': 'must be of ObjectId type',
+}
+
+RULES = ('allowed', 'empty', 'max', 'maxlength', 'min', 'minlength', 'regex')
+
+
+def compile_schema(validator, schema, allow_unknown, update=False):
+    """
+    Compiles the schema into a function that checks a document and returns
+    the same errors the validator would, without interpreting the schema.
+    With update=True required fields are not checked, like on validate.
+    Returns None if the schema has rules that are not compiled, like coerce,
+    dependencies, items or anyof, which are left to the validator.
+    """
+    if validator.ignore_none_values:
+        return None
+
+    try:
+        return _compile_document(validator, schema, allow_unknown, update)
+    except NotCompiledError:
+        return None
+
+
+def _error(errors, field, error):
+    """
+    Adds the error to the errors of the field like Validator._error
+    """
+    field_errors = errors.get(field, [])
+    if not isinstance(field_errors, list):
+        field_errors = [field_errors]
+
+    if isinstance(error, (six.string_types, dict)):
+        field_errors.append(error)
+    else:
+        field_errors.extend(error)
+
+    if len(field_errors) == 1:
+        field_errors = field_errors.pop()
+
+    errors[field] = field_errors
+
+
+def _compile_document(validator, schema, allow_unknown, update=False):
+    """
+    Compiles the checks of a document with the given fields schema
+    """
+    if not isinstance(schema, Mapping) or isinstance(allow_unknown, Mapping):
+        raise NotCompiledError()
+
+    fields = dict(
+        (field, _compile_definition(
+            validator, definition, allow_unknown, update
+        )) for (field, definition) in schema.items()
+    )
+    required = set() if update else set(
+        field for (field, definition) in schema.items()
+        if definition.get('required') is True
+    )
+
+    def check(document):
+        errors = {}
+
+        for field in [field for field in document]:
+            check_field = fields.get(field)
+
+            if check_field is not None:
+                check_field(errors, field, document[field])
+            elif not allow_unknown:
+                _error(errors, field, messages.ERROR_UNKNOWN_FIELD)
+
+        for field in required - set(document.keys()):
+            _error(errors, field, messages.ERROR_REQUIRED_FIELD)
+
+        return errors
+
+    return check
+
+
+def _compile_definition(validator, definition, allow_unknown, update=False):
+    """
+    Compiles the checks of a field with the given definition, in the order
+    the validator applies them
+    """
+    if not isinstance(definition, Mapping) or \
+            'coerce' in definition or 'dependencies' in definition:
+        raise NotCompiledError()
+
+    nullable = definition.get('nullable', False) is True
+    readonly = 'readonly' in definition
+    check_type = _compile_type(validator, definition['type']) \
+        if 'type' in definition else None
+    check_schema = _compile_nested(
+        validator, definition, allow_unknown, update
+    ) if 'schema' in definition else None
+
+    rules = []
+    for rule in definition:
+        if rule in validator.special_rules or \
+                not hasattr(validator, '_validate_' + rule):
+            continue
+
+        if rule not in RULES:
+            raise NotCompiledError()
+
+        rules.append(globals()['_compile_' + rule](definition[rule]))
+
+    def check(errors, field, value):
+        if value is None:
+            if nullable:
+                return
+
+            _error(errors, field, messages.ERROR_NOT_NULLABLE)
+
+        if readonly:
+            if definition['readonly']:
+                _error(errors, field, messages.ERROR_READONLY_FIELD)
+
+            if errors.get(field):
+                return
+
+        if check_type is not None:
+            check_type(errors, field, value)
+
+            if errors.get(field):
+                return
+
+        if check_schema is not None:
+            check_schema(errors, field, value)
+
+        for check_rule in rules:
+            check_rule(errors, field, value)
+
+    return check
+
+
+def _compile_type(validator, data_type):
+    """
+    Compiles the check of one type, or of any of a list of types
+    """
+    types = [data_type] if isinstance(data_type, six.string_types) \
+        else list(data_type)
+
+    checks = []
+    for name in types:
+        if name not in TYPES or \
+                not hasattr(validator, '_validate_type_' + name):
+            raise NotCompiledError()
+
+        checks.append((
+            TYPES[name],
+            TYPE_MESSAGES.get(name, messages.ERROR_BAD_TYPE.format(name))
+        ))
+
+    if isinstance(data_type, six.string_types):
+        is_type, message = checks[0]
+
+        def check(errors, field, value):
+            if not is_type(value):
+                _error(errors, field, message)
+
+        return check
+
+    message = messages.ERROR_BAD_TYPE.format(
+        ', '.join(data_type[:-1]) + ' or ' + data_type[-1]
+    )
+
+    def check_any(errors, field, value):
+        previous = errors.copy()
+
+        for (is_type, type_message) in checks:
+            if not is_type(value):
+                _error(errors, field, type_message)
+
+            if len(errors) == len(previous):
+                return
+
+            errors.clear()
+            errors.update(previous)
+
+        _error(errors, field, message)
+
+    return check_any
+
+
+def _compile_nested(validator, definition, allow_unknown, update=False):
+    """
+    Compiles the schema rule, which checks each item of a list or the fields
+    of a dict. Like on the validator, update only applies to dicts.
+    """
+    if 'type' not in definition:
+        raise NotCompiledError()
+
+    schema, is_list = definition['schema'], 'list' in definition['type']
+
+    if is_list:
+        check_item = _compile_definition(validator, schema, allow_unknown)
+    elif 'dict' in definition['type']:
+        check_document = _compile_document(
+            validator, schema,
+            allow_unknown or definition.get('allow_unknown'), update
+        )
+    else:
+        return None
+
+    def check(errors, field, value):
+        if isinstance(value, Sequence) and \
+                not isinstance(value, six.string_types):
+            list_errors = {}
+
+            for i in range(len(value)):
+                item_errors = {}
+                check_item(item_errors, i, value[i])
+                list_errors.update(item_errors)
+
+            if len(list_errors):
+                _error(errors, field, list_errors)
+        elif isinstance(value, Mapping) and not is_list:
+            document_errors = check_document(value)
+
+            if len(document_errors):
+                _error(errors, field, document_errors)
+
+    return check
+
+
+def _compile_allowed(allowed_values):
+    def check(errors, field, value):
+        if isinstance(value, six.string_types):
+            if value not in allowed_values:
+                _error(
+                    errors, field,
+                    messages.ERROR_UNALLOWED_VALUE.format(value)
+                )
+        elif isinstance(value, Sequence):
+            disallowed = set(value) - set(allowed_values)
+            if disallowed:
+                _error(
+                    errors, field,
+                    messages.ERROR_UNALLOWED_VALUES.format(list(disallowed))
+                )
+        elif isinstance(value, int):
+            if value not in allowed_values:
+                _error(
+                    errors, field,
+                    messages.ERROR_UNALLOWED_VALUE.format(value)
+                )
+
+    return check
+
+
+def _compile_empty(empty):
+    def check(errors, field, value):
+        if isinstance(value, six.string_types) and len(value) == 0 and \
+                not empty:
+            _error(errors, field, messages.ERROR_EMPTY_NOT_ALLOWED)
+
+    return check
+
+
+def _compile_max(max_value):
+    message = messages.ERROR_MAX_VALUE.format(max_value)
+
+    def check(errors, field, value):
+        if isinstance(value, (float,) + six.integer_types) and \
+                value > max_value:
+            _error(errors, field, message)
+
+    return check
+
+
+def _compile_maxlength(max_length):
+    message = messages.ERROR_MAX_LENGTH.format(max_length)
+
+    def check(errors, field, value):
+        if isinstance(value, Sequence) and len(value) > max_length:
+            _error(errors, field, message)
+
+    return check
+
+
+def _compile_min(min_value):
+    message = messages.ERROR_MIN_VALUE.format(min_value)
+
+    def check(errors, field, value):
+        if isinstance(value, (float,) + six.integer_types) and \
+                value < min_value:
+            _error(errors, field, message)
+
+    return check
+
+
+def _compile_minlength(min_length):
+    message = messages.ERROR_MIN_LENGTH.format(min_length)
+
+    def check(errors, field, value):
+        if isinstance(value, Sequence) and len(value) < min_length:
+            _error(errors, field, message)
+
+    return check
+
+
+def _compile_regex(match):
+    pattern, message = re.compile(match), messages.ERROR_REGEX.format(match)
 
-        for field in fields:
-            if field in schema:
-                schema = schema.get(field)
-            elif 'schema' in schema and field in schema.get('schema'):
-                schema = schema.get('schema').get(field)
-            elif 'schema' in schema:
-                schema = schema.get('schema')
+    def check(errors, field, value):
+        if isinstance(value, six.string_types) and not pattern.match(value):
+            _error(errors, field, message)
 
-        return schema
+    return check
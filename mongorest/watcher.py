@@ -0,0 +1,235 @@
+# -*- encoding: UTF-8 -*-
+from __future__ import absolute_import, unicode_literals
+
+import logging
+import os
+import threading
+import time
+
+from bson.timestamp import Timestamp
+from pymongo import ASCENDING, DESCENDING
+from pymongo.cursor import CursorType
+from pymongo.errors import PyMongoError
+
+from .database import resolve
+from .settings import DEFAULT, settings
+
+__all__ = [
+    'CacheWatcher',
+    'watch',
+]
+
+_configs = {}
+_failures = {}
+_watchers = {}
+_watchers_lock = threading.Lock()
+
+
+class CacheWatcher(object):
+    """
+    Background thread that tails the oplog of a replica set and evicts the
+    documents written by any process, this one or others, from the caches of
+    the Collections it watches.
+    When the connection fails it resumes right after the last entry it saw,
+    clearing the caches if the oplog no longer has the entries it missed.
+    """
+
+    def __init__(self, client, interval=1):
+        self.client = client
+        self.interval = interval
+        self.collections = {}
+        self.token = None
+        self.thread = None
+        self.running = False
+        self.lock = threading.Lock()
+        self.logger = logging.getLogger(__name__)
+
+    @property
+    def oplog(self):
+        return self.client['local']['oplog.rs']
+
+    def add(self, collection, namespace):
+        """
+        Watches the writes to the namespace for the cache of the Collection
+        """
+        if collection in self.collections.get(namespace, ()):
+            return
+
+        with self.lock:
+            collections = set(self.collections.get(namespace, ()))
+            collections.add(collection)
+            self.collections[namespace] = collections
+
+    def start(self):
+        """
+        Starts tailing the oplog from its last entry.
+        Raises ValueError if the client is not connected to a replica set.
+        """
+        if not self.client.admin.command('ismaster').get('setName'):
+            raise ValueError('Watching caches requires a replica set')
+
+        self.token = self.last()
+        self.running = True
+
+        self.thread = threading.Thread(target=self.run, name=__name__)
+        self.thread.daemon = True
+        self.thread.start()
+
+    def stop(self):
+        """
+        Stops tailing the oplog within interval seconds
+        """
+        self.running = False
+
+    def last(self):
+        """
+        Returns the timestamp of the last entry of the oplog
+        """
+        entry = self.oplog.find_one(sort=[('$natural', DESCENDING)])
+
+        return entry['ts'] if entry else Timestamp(0, 0)
+
+    def run(self):
+        """
+        Tails the oplog until stopped, resuming after failures
+        """
+        while self.running:
+            try:
+                self.tail()
+            except PyMongoError as exc:
+                self.logger.warning(
+                    'Cache watcher failed, resuming in %s seconds: %s',
+                    self.interval, exc
+                )
+
+            if self.running:
+                time.sleep(self.interval)
+
+    def tail(self):
+        """
+        Applies the entries of the oplog after the last one seen, until
+        stopped or until the cursor dies
+        """
+        first = self.oplog.find_one(sort=[('$natural', ASCENDING)])
+        if first is not None and first['ts'] > self.token:
+            self.logger.warning(
+                'Cache watcher missed entries of the oplog, clearing caches'
+            )
+            self.clear()
+
+        cursor = self.oplog.find(
+            {'ts': {'$gt': self.token}},
+            cursor_type=CursorType.TAILABLE_AWAIT,
+            oplog_replay=True
+        ).max_await_time_ms(int(self.interval * 1000))
+
+        while self.running and cursor.alive:
+            for entry in cursor:
+                self.apply(entry)
+                self.token = entry['ts']
+
+                if not self.running:
+                    break
+
+        cursor.close()
+
+    def apply(self, entry):
+        """
+        Evicts the document written by the oplog entry from the caches of
+        the Collections of its namespace.
+        Commands, like drops and renames, clear the caches of all the
+        Collections of their database.
+        """
+        op, namespace = entry.get('op'), entry.get('ns', '')
+
+        if op == 'c':
+            database = namespace.split('.', 1)[0] + '.'
+
+            return self.clear(lambda name: name.startswith(database))
+
+        if op in ('i', 'd'):
+            _id = entry.get('o', {}).get('_id')
+        elif op == 'u':
+            _id = entry.get('o2', {}).get('_id')
+        else:
+            return
+
+        for collection in self.collections.get(namespace, ()):
+            collection.cache.evict(_id)
+
+    def clear(self, matches=None):
+        """
+        Clears the caches of the Collections of the namespaces that match,
+        or of all of them
+        """
+        for (namespace, collections) in list(self.collections.items()):
+            if matches is None or matches(namespace):
+                for collection in collections:
+                    collection.cache.clear()
+
+
+def watch(collection):
+    """
+    Makes the CacheWatcher of the client of the Collection, started once in
+    each process, evict the documents written to it from its cache.
+    Does nothing unless the CACHE_WATCHER setting is enabled.
+    Returns False if the CacheWatcher could not be started, like when the
+    server is not a replica set, so the cache must not be used. The failure
+    is logged and starting it is retried after RETRY_TIME seconds.
+    """
+    config = _config(collection)
+    if not config['ENABLED'] or collection.cache is None:
+        return None
+
+    proxied = resolve(collection.collection).proxied
+    client = proxied.database.client
+    key = (os.getpid(), id(client))
+
+    watcher = _watchers.get(key)
+    if watcher is None:
+        if time.time() < _failures.get(key, 0):
+            return False
+
+        started = CacheWatcher(client, config['INTERVAL'])
+        started.add(collection, proxied.full_name)
+
+        try:
+            started.start()
+        except (PyMongoError, ValueError):
+            logging.getLogger(__name__).exception(
+                'Cache watcher could not be started, caches of its client '
+                'will not be used for %s seconds', config['RETRY_TIME']
+            )
+            _failures[key] = time.time() + config['RETRY_TIME']
+
+            return False
+
+        with _watchers_lock:
+            for other in [k for k in _watchers if k[0] != key[0]]:
+                del _watchers[other]
+
+            watcher = _watchers.setdefault(key, started)
+            _failures.pop(key, None)
+
+        if watcher is not started:
+            started.stop()
+
+    watcher.add(collection, proxied.full_name)
+
+    return watcher
+
+
+def _config(collection):
+    """
+    Returns the CACHE_WATCHER setting, read once for each Collection and
+    settings module so cached reads do not load the settings
+    """
+    module = os.environ.get('MONGOREST_SETTINGS_MODULE')
+
+    config = _configs.get(collection)
+    if config is None or config[0] != module:
+        config = _configs[collection] = (
+            module, dict(DEFAULT['CACHE_WATCHER'], **settings.CACHE_WATCHER)
+        )
+
+    return config[1]
@@ -1,17 +1,24 @@
 # -*- encoding: UTF-8 -*-
 from __future__ import absolute_import, unicode_literals
 
+import logging
+import os
+import threading
+from functools import partial
 from pydoc import locate
+from pymongo.errors import PyMongoError
 from werkzeug.exceptions import HTTPException, NotFound
 from werkzeug.routing import Map
-from werkzeug.wsgi import DispatcherMiddleware
+from werkzeug.wsgi import ClosingIterator, DispatcherMiddleware
 
-from .settings import settings
+from .metrics import metrics
+from .settings import DEFAULT, settings
 from .wrappers import Request
 
 __all__ = [
     'WSGIWrapper',
     'WSGIDispatcher',
+    'warmup',
 ]
 
 
@@ -27,6 +34,24 @@ class WSGIWrapper(object):
     url_map = Map()
 
     def __call__(self, environ, start_response):
+        request = metrics.start_request(self.endpoint)
+        if request is None:
+            return self.dispatch(environ, start_response)
+
+        try:
+            response = self.dispatch(environ, start_response)
+        except BaseException:
+            metrics.finish_request(request)
+            raise
+
+        return ClosingIterator(
+            response, partial(metrics.finish_request, request)
+        )
+
+    def dispatch(self, environ, start_response):
+        """
+        Routes the request to the view that matches it
+        """
         adapter = self.url_map.bind_to_environ(environ)
 
         try:
@@ -62,6 +87,9 @@ class WSGIDispatcher(DispatcherMiddleware):
     def __init__(self, app=None, resources=None):
         app = app or NotFound()
         resources = resources or []
+        self.resources = resources
+        self.warmed_up = None
+        self.lock = threading.Lock()
 
         mounts = {}
         for resource in resources:
@@ -74,3 +102,88 @@ class WSGIDispatcher(DispatcherMiddleware):
             mounts[key] = resource_to_mount
 
         super(WSGIDispatcher, self).__init__(app, mounts)
+
+        if dict(DEFAULT['WARMUP'], **settings.WARMUP)['ENABLED']:
+            self.warm_up()
+
+    def __call__(self, environ, start_response):
+        if self.warmed_up != os.getpid():
+            self.warm_up()
+
+        return super(WSGIDispatcher, self).__call__(environ, start_response)
+
+    def warm_up(self, connections=None):
+        """
+        Warms up the resources once in each process.
+        The app warms up when it is built, and again on the first request of
+        every worker forked after that, so each one opens its own connections.
+        Does nothing unless the WARMUP setting is enabled or the number of
+        connections is given.
+        """
+        with self.lock:
+            if self.warmed_up == os.getpid():
+                return
+
+            if connections is not None or dict(
+                DEFAULT['WARMUP'], **settings.WARMUP
+            )['ENABLED']:
+                warmup(self.resources, connections)
+
+            self.warmed_up = os.getpid()
+
+
+def warmup(resources=None, connections=None):
+    """
+    Prepares the worker to accept traffic before the first request arrives.
+    Pings the servers of the databases used by the resources, opening up to
+    connections pooled connections to each (WARMUP['MIN_CONNECTIONS'] by
+    default, none if 0), then compiles the url_map and checks the validator
+    schema of every resource.
+    """
+    from .database import ConnectionFailureProxy, db
+
+    logger = logging.getLogger(__name__)
+    resources = resources or []
+    if connections is None:
+        connections = dict(
+            DEFAULT['WARMUP'], **settings.WARMUP
+        )['MIN_CONNECTIONS']
+
+    clients = {}
+    if connections:
+        databases = [db] + [
+            resource.collection.collection.database for resource in resources
+            if hasattr(getattr(resource, 'collection', None), 'collection')
+        ]
+
+        for database in databases:
+            client = database.client
+            if isinstance(client, ConnectionFailureProxy):
+                client = client.proxied
+            clients[id(client)] = client
+
+    def ping(client):
+        try:
+            client.admin.command('ping')
+        except PyMongoError as exc:
+            logger.warning('Warmup ping to %s failed: %s', client, exc)
+
+    threads = [
+        threading.Thread(target=ping, args=(client,))
+        for client in clients.values() for _ in range(connections)
+    ]
+
+    for thread in threads:
+        thread.start()
+
+    for thread in threads:
+        thread.join()
+
+    for resource in resources:
+        resource.url_map.update()
+
+        collection = getattr(resource, 'collection', None)
+        validator = getattr(collection, 'validator', None)
+
+        if validator is not None and collection.schema:
+            validator.validate_schema(collection.schema)
@@ -1,15 +1,23 @@
 # -*- encoding: UTF-8 -*-
 from __future__ import absolute_import, unicode_literals
 
+import sys
+
+if sys.version_info >= (3, 6):
+    from .asgi import *
+from .cache import *
 from .collection import *
 from .database import *
 from .decorators import *
 from .errors import *
+from .metrics import *
 from .middlewares import *
 from .resource import *
+from .server import *
 from .settings import *
 from .testcase import *
 from .utils import *
 from .validator import *
+from .watcher import *
 from .wrappers import *
 from .wsgi import *
@@ -0,0 +1,6 @@
+# -*- encoding: UTF-8 -*-
+from __future__ import absolute_import, unicode_literals
+
+from .asgi_wrapper import *
+from .asgi_dispatcher import *
+from .async_collection import *
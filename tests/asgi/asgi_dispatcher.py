@@ -0,0 +1,44 @@
+# -*- encoding: UTF-8 -*-
+from __future__ import absolute_import, unicode_literals
+
+from mock import patch
+
+from mongorest.asgi import ASGIDispatcher
+from mongorest.testcase import TestCase
+from tests.asgi.asgi_wrapper import TestWSGIWrapper, http, request
+
+__all__ = [
+    'TestASGIDispatcher',
+]
+
+
+class TestASGIDispatcher(TestCase):
+
+    def setUp(self):
+        class EchoWrapper(TestWSGIWrapper):
+            endpoint = 'test'
+
+        self.resource = EchoWrapper
+
+    def test_asgi_dispatcher_mounts_the_resources(self):
+        app = ASGIDispatcher(resources=[self.resource])
+
+        self.assertEqual(list(app.app.mounts.keys()), ['/test'])
+        self.assertEqual(app.resources, [self.resource])
+
+    def test_asgi_dispatcher_dispatches_requests_to_the_resources(self):
+        app = ASGIDispatcher(resources=[self.resource])
+
+        found = request(app, http('GET', '/test/echo/'))
+        not_found = request(app, http('GET', '/invalid/'))
+
+        self.assertEqual(found[0]['status'], 405)
+        self.assertEqual(not_found[0]['status'], 404)
+
+    @patch('mongorest.wsgi.warmup')
+    def test_asgi_dispatcher_warms_up_the_resources_on_startup(self, warmup):
+        app = ASGIDispatcher(resources=[self.resource])
+        app.startup()
+        request(app, http('GET', '/test/echo/'))
+
+        warmup.assert_called_once_with([self.resource], 0)
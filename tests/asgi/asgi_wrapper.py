@@ -0,0 +1,147 @@
+# -*- encoding: UTF-8 -*-
+from __future__ import absolute_import, unicode_literals
+
+import asyncio
+
+from werkzeug.routing import Map, Rule
+
+from mongorest.asgi import ASGIWrapper
+from mongorest.testcase import TestCase
+from mongorest.wrappers import Response
+from mongorest.wsgi import WSGIWrapper
+
+__all__ = [
+    'TestASGIWrapper',
+]
+
+
+class TestWSGIWrapper(WSGIWrapper):
+    url_map = Map([Rule('/echo/', methods=['POST'], endpoint='echo')])
+
+    def echo(self, request):
+        return Response(
+            response=[
+                request.args['name'].encode('utf-8'),
+                request.headers['X-Test'].encode('utf-8'),
+                request.get_data(),
+            ],
+            status=201,
+            headers=[('X-Test', 'test')]
+        )
+
+
+def request(app, scope, body=(b'',)):
+    received = [
+        {'type': 'http.request', 'body': chunk, 'more_body': i + 1 < len(body)}
+        for (i, chunk) in enumerate(body)
+    ]
+    sent = []
+
+    async def receive():
+        return received.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.get_event_loop().run_until_complete(app(scope, receive, send))
+
+    return sent
+
+
+def http(method, path, query_string=b'', headers=None):
+    return {
+        'type': 'http',
+        'method': method,
+        'path': path,
+        'query_string': query_string,
+        'headers': headers or [],
+    }
+
+
+class TestASGIWrapper(TestCase):
+
+    def test_asgi_wrapper_runs_the_wsgi_app_and_sends_its_response(self):
+        sent = request(
+            ASGIWrapper(TestWSGIWrapper()),
+            http(
+                'POST', '/echo/', b'name="test"',
+                [(b'x-test', b'header'), (b'content-type', b'text/plain')]
+            ),
+            [b'bo', b'dy']
+        )
+
+        self.assertEqual(sent[0]['type'], 'http.response.start')
+        self.assertEqual(sent[0]['status'], 201)
+        self.assertIn((b'x-test', b'test'), sent[0]['headers'])
+        self.assertEqual(
+            [message['body'] for message in sent[1:]],
+            [b'test', b'header', b'body', b'']
+        )
+        self.assertTrue(all(message['more_body'] for message in sent[1:-1]))
+        self.assertFalse(sent[-1].get('more_body', False))
+
+    def test_asgi_wrapper_sends_errors_of_the_wsgi_app(self):
+        sent = request(ASGIWrapper(TestWSGIWrapper()), http('GET', '/echo/'))
+
+        self.assertEqual(sent[0]['status'], 405)
+
+    def test_asgi_wrapper_closes_the_response_of_the_wsgi_app(self):
+        closed = []
+
+        class Chunks(list):
+            def close(self):
+                closed.append(True)
+
+        def app(environ, start_response):
+            start_response('200 OK', [])
+            return Chunks()
+
+        sent = request(ASGIWrapper(app), http('GET', '/'))
+
+        self.assertEqual(sent[0]['status'], 200)
+        self.assertEqual(sent[1]['body'], b'')
+        self.assertEqual(closed, [True])
+
+    def test_asgi_wrapper_raises_error_if_scope_is_not_supported(self):
+        with self.assertRaises(ValueError):
+            request(ASGIWrapper(TestWSGIWrapper()), {'type': 'websocket'})
+
+    def test_environ_returns_wsgi_environ_of_the_scope(self):
+        environ = ASGIWrapper.environ(
+            dict(
+                http(
+                    'GET', '/test', b'a=1',
+                    [(b'accept', b'a'), (b'accept', b'b'), (b'content-length', b'0')]
+                ),
+                root_path='/api', server=('example.com', 8000)
+            ), None
+        )
+
+        self.assertEqual(environ['SCRIPT_NAME'], '/api')
+        self.assertEqual(environ['PATH_INFO'], '/test')
+        self.assertEqual(environ['QUERY_STRING'], 'a=1')
+        self.assertEqual(environ['SERVER_NAME'], 'example.com')
+        self.assertEqual(environ['SERVER_PORT'], '8000')
+        self.assertEqual(environ['HTTP_ACCEPT'], 'a,b')
+        self.assertEqual(environ['CONTENT_LENGTH'], '0')
+
+    def test_lifespan_answers_startup_and_shutdown(self):
+        messages = [{'type': 'lifespan.startup'}, {'type': 'lifespan.shutdown'}]
+        sent = []
+
+        async def receive():
+            return messages.pop(0)
+
+        async def send(message):
+            sent.append(message)
+
+        asyncio.get_event_loop().run_until_complete(
+            ASGIWrapper(TestWSGIWrapper())({'type': 'lifespan'}, receive, send)
+        )
+
+        self.assertEqual(
+            sent, [
+                {'type': 'lifespan.startup.complete'},
+                {'type': 'lifespan.shutdown.complete'},
+            ]
+        )
@@ -0,0 +1,62 @@
+# -*- encoding: UTF-8 -*-
+from __future__ import absolute_import, unicode_literals
+
+import asyncio
+import threading
+
+from mock import patch
+
+from mongorest.asgi import AsyncCollection, get_executor, iterate
+from mongorest.collection import Collection
+from mongorest.testcase import TestCase
+
+__all__ = [
+    'TestAsyncCollection',
+]
+
+
+def run(coroutine):
+    return asyncio.get_event_loop().run_until_complete(coroutine)
+
+
+class TestAsyncCollection(TestCase):
+
+    def test_get_executor_is_bounded_by_async_workers_setting(self):
+        self.assertEqual(get_executor()._max_workers, 32)
+
+    def test_get_executor_creates_executor_again_after_a_fork(self):
+        executor = get_executor()
+
+        with patch('os.getpid', return_value=-1):
+            self.assertIsNot(get_executor(), executor)
+            self.assertIs(get_executor(), get_executor())
+
+    def test_async_collection_methods_run_on_the_executor(self):
+        class TestCollection(object):
+            @classmethod
+            def find_one(cls, filter):
+                return threading.current_thread(), filter
+
+        thread, filter = run(
+            AsyncCollection(TestCollection).find_one({'_id': 1})
+        )
+
+        self.assertIsNot(thread, threading.current_thread())
+        self.assertEqual(filter, {'_id': 1})
+
+    def test_async_collection_returns_other_attributes_as_they_are(self):
+        self.assertIs(AsyncCollection(Collection).schema, Collection.schema)
+
+    def test_async_collection_finds_inserted_documents(self):
+        collection = AsyncCollection(Collection)
+
+        run(collection.insert_one({'_id': 1}))
+
+        self.assertEqual(run(collection.find_one({'_id': 1})), {'_id': 1})
+        self.assertEqual(run(collection.count()), 1)
+
+    def test_iterate_iterates_over_a_blocking_iterable(self):
+        async def collect():
+            return [item async for item in iterate(range(3))]
+
+        self.assertEqual(run(collect()), [0, 1, 2])
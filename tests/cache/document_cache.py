@@ -0,0 +1,127 @@
+# -*- encoding: UTF-8 -*-
+from __future__ import absolute_import, unicode_literals
+
+from mock import Mock, patch
+
+from mongorest.cache import DocumentCache
+from mongorest.testcase import TestCase
+
+__all__ = [
+    'TestDocumentCache',
+]
+
+
+class TestDocumentCache(TestCase):
+
+    def test_key_does_not_depend_on_the_order_of_the_filter(self):
+        self.assertEqual(
+            DocumentCache.key({'a': 1, 'b': 2}),
+            DocumentCache.key({'b': 2, 'a': 1})
+        )
+        self.assertNotEqual(
+            DocumentCache.key({'a': 1}), DocumentCache.key({'a': 1}, {'b': 1})
+        )
+        self.assertEqual(DocumentCache.key(1), DocumentCache.key({'_id': 1}))
+        self.assertEqual(DocumentCache.key(None), DocumentCache.key({}))
+
+    def test_get_loads_document_once_and_counts_hits_and_misses(self):
+        cache = DocumentCache(10, 60)
+        load = Mock(return_value={'_id': 1})
+
+        self.assertEqual(cache.get('key', load), {'_id': 1})
+        self.assertEqual(cache.get('key', load), {'_id': 1})
+        self.assertEqual(load.call_count, 1)
+        self.assertEqual(cache.stats(), {'hits': 1, 'misses': 1, 'size': 1})
+
+    def test_id_of_returns_id_if_filter_reads_document_by_id_alone(self):
+        self.assertEqual(DocumentCache.id_of(1), 1)
+        self.assertEqual(DocumentCache.id_of({'_id': 1}), 1)
+        self.assertIsNone(DocumentCache.id_of())
+        self.assertIsNone(DocumentCache.id_of({'_id': {'$in': [1]}}))
+        self.assertIsNone(DocumentCache.id_of({'_id': 1, 'a': 1}))
+
+    def test_get_returns_copies_of_the_cached_document(self):
+        cache = DocumentCache(10, 60)
+        cache.get('key', lambda: {'_id': 1})
+
+        cache.get('key', None)['_id'] = 2
+
+        self.assertEqual(cache.get('key', None), {'_id': 1})
+
+    def test_get_loads_document_again_after_ttl(self):
+        cache = DocumentCache(10, 60)
+        load = Mock(return_value={'_id': 1})
+
+        with patch('time.time', return_value=0):
+            cache.get('key', load)
+
+        with patch('time.time', return_value=61):
+            cache.get('key', load)
+
+        self.assertEqual(load.call_count, 2)
+
+    def test_get_evicts_least_recently_used_document_if_full(self):
+        cache = DocumentCache(2, 60)
+        cache.get('a', lambda: 'a')
+        cache.get('b', lambda: 'b')
+        cache.get('a', None)
+        cache.get('c', lambda: 'c')
+
+        self.assertEqual(list(cache._documents), ['a', 'c'])
+
+    def test_get_does_not_cache_document_loaded_while_cache_was_cleared(self):
+        cache = DocumentCache(10, 60)
+
+        def load():
+            cache.clear()
+            return {'_id': 1}
+
+        cache.get('key', load)
+
+        self.assertEqual(len(cache), 0)
+
+    def test_evict_removes_documents_read_by_the_id_or_by_other_filters(self):
+        cache = DocumentCache(10, 60)
+        cache.get('1', lambda: {'_id': 1}, 1)
+        cache.get('2', lambda: {'_id': 2}, 2)
+        cache.get('filter', lambda: {'_id': 2})
+
+        cache.evict(1)
+
+        self.assertEqual(list(cache._documents), ['2'])
+
+    def test_evict_only_touches_documents_it_removes(self):
+        cache = DocumentCache(10, 60)
+        cache.get('1', lambda: {'_id': 1}, 1)
+        cache.get('2', lambda: {'_id': 2}, 2)
+        cache.get('filter', lambda: {'_id': 2})
+
+        cache.evict(1)
+
+        self.assertEqual(cache._ids, {2: set(['2'])})
+        self.assertEqual(cache._filtered, set())
+
+    def test_get_removes_documents_evicted_when_full_from_the_indexes(self):
+        cache = DocumentCache(1, 60)
+        cache.get('1', lambda: {'_id': 1}, 1)
+        cache.get('filter', lambda: {'_id': 2})
+        cache.get('2', lambda: {'_id': 2}, 2)
+
+        self.assertEqual(cache._ids, {2: set(['2'])})
+        self.assertEqual(cache._filtered, set())
+
+    def test_evict_removes_documents_with_unhashable_ids_with_filtered_ones(self):
+        cache = DocumentCache(10, 60)
+        cache.get('list', lambda: {'_id': [1]}, [1])
+
+        cache.evict([2])
+
+        self.assertEqual(len(cache), 0)
+
+    def test_clear_removes_all_documents(self):
+        cache = DocumentCache(10, 60)
+        cache.get('key', lambda: {'_id': 1})
+
+        cache.clear()
+
+        self.assertEqual(len(cache), 0)
@@ -2,7 +2,8 @@
 from __future__ import absolute_import, unicode_literals
 
 from bson.objectid import ObjectId
-from mock import patch
+from mock import MagicMock, call, patch
+from pymongo.read_preferences import Nearest, Primary, SecondaryPreferred
 
 from mongorest.collection import Collection
 from mongorest.testcase import TestCase
@@ -255,12 +256,11 @@ class TestCollection(TestCase):
     def test_update_is_decorated_with_serializable(self):
         self.assertIn('serializable', Collection.update.decorators)
 
+    @patch('mongorest.collection.Collection.before_update', lambda self, old: {
+        'error_code': 7, 'error_type': 'NotUnique',
+        'error_message': 'Document is not unique.',
+    })
     def test_update_returns_before_if_before_update_returns_something(self):
-        Collection.before_update = lambda self, old: {
-            'error_code': 7, 'error_type': 'NotUnique',
-            'error_message': 'Document is not unique.',
-        }
-
         Collection({'_id': 1}).insert()
         errors = Collection({'_id': 1}).update()
 
@@ -272,8 +272,6 @@ class TestCollection(TestCase):
             }
         )
 
-        Collection.before_update = lambda self, old: None
-
     def test_update_returns_errors_if_document_is_not_valid(self):
         document = Collection().insert()
         Collection.schema = {'test': {'required': True}}
@@ -361,6 +359,224 @@ class TestCollection(TestCase):
         self.assertEqual(updated, {'_id': _id, 'test': 'test2'})
         self.assertEqual(after_update.call_count, 1)
 
+    @patch('mongorest.collection.Collection.find_one_and_replace')
+    @patch('mongorest.collection.Collection.replace_one')
+    @patch('mongorest.collection.Collection.find_one')
+    def test_update_only_replaces_if_callbacks_are_not_overridden(
+            self, find_one, replace_one, find_one_and_replace):
+        replace_one.return_value = {'n': 1, 'nModified': 1, 'ok': 1}
+
+        updated = Collection({'_id': 1, 'test': 1}).update()
+
+        self.assertEqual(updated, {'_id': 1, 'test': 1})
+        replace_one.assert_called_once_with({'_id': 1}, {'_id': 1, 'test': 1})
+        self.assertEqual(find_one.call_count, 0)
+        self.assertEqual(find_one_and_replace.call_count, 0)
+
+    @patch('mongorest.collection.Collection.replace_one')
+    def test_update_returns_not_found_if_nothing_is_replaced(
+            self, replace_one):
+        replace_one.return_value = {'n': 0, 'nModified': 0, 'ok': 1}
+
+        errors = Collection({'_id': 1}).update()
+
+        self.assertEqual(errors['error_type'], 'DocumentNotFoundError')
+
+    @patch('mongorest.collection.Collection.after_update')
+    @patch('mongorest.collection.Collection.find_one_and_replace')
+    @patch('mongorest.collection.Collection.find_one')
+    def test_update_passes_replaced_document_to_after_update(
+            self, find_one, find_one_and_replace, after_update):
+        old = {'_id': 1, 'test': 0}
+        find_one_and_replace.return_value = old
+
+        updated = Collection({'_id': 1, 'test': 1}).update()
+
+        self.assertEqual(updated, {'_id': 1, 'test': 1})
+        self.assertEqual(find_one.call_count, 0)
+        after_update.assert_called_once_with(old=old)
+
+    @patch('mongorest.collection.Collection.after_update')
+    @patch('mongorest.collection.Collection.find_one_and_replace')
+    def test_update_returns_not_found_if_replaced_document_is_none(
+            self, find_one_and_replace, after_update):
+        find_one_and_replace.return_value = None
+
+        errors = Collection({'_id': 1}).update()
+
+        self.assertEqual(errors['error_type'], 'DocumentNotFoundError')
+        self.assertEqual(after_update.call_count, 0)
+
+    @patch('mongorest.collection.Collection.replace_one')
+    @patch('mongorest.collection.Collection.find_one_and_replace')
+    @patch('mongorest.collection.Collection.collection')
+    def test_update_uses_find_one_and_replace_if_writes_are_unacknowledged(
+            self, collection, find_one_and_replace, replace_one):
+        collection.write_concern.acknowledged = False
+        find_one_and_replace.return_value = None
+
+        errors = Collection({'_id': 1}).update()
+
+        self.assertEqual(errors['error_type'], 'DocumentNotFoundError')
+        self.assertEqual(replace_one.call_count, 0)
+
+    # patch
+    def test_patch_is_decorated_with_serializable(self):
+        self.assertIn('serializable', Collection.patch.decorators)
+
+    def test_patch_returns_errors_if_document_is_not_valid(self):
+        Collection.schema = {'test': {'type': 'integer'}}
+        errors = Collection({'_id': 1, 'test': '1'}, partial=True).patch()
+        Collection.schema = {}
+
+        self.assertEqual(errors['error_type'], 'DocumentValidationError')
+        self.assertEqual(errors['errors'][0]['error_type'], 'FieldTypeError')
+
+    def test_patch_returns_errors_if_document_has_no_id(self):
+        errors = Collection({}, partial=True).patch()
+
+        self.assertEqual(errors['error_type'], 'UnidentifiedDocumentError')
+
+    @patch('mongorest.collection.Collection.find_one_and_update')
+    def test_patch_returns_errors_if_fields_or_unset_are_not_valid(
+            self, find_one_and_update):
+        Collection.schema = {
+            'required': {'required': True},
+            'readonly': {'readonly': True},
+            'a': {'type': 'dict'},
+        }
+
+        errors = Collection({'_id': 1, 'a.b': 1}, partial=True).patch(
+            unset=['required', 'readonly', '$unset', '_id']
+        )
+
+        Collection.schema = {}
+
+        self.assertEqual(
+            [(error['error_type'], error['field']) for error in errors['errors']],
+            [
+                ('UnknownFieldError', '$unset'),
+                ('UnknownFieldError', '_id'),
+                ('UnknownFieldError', 'a.b'),
+                ('ReadOnlyFieldError', 'readonly'),
+                ('RequiredFieldError', 'required'),
+            ]
+        )
+        self.assertEqual(find_one_and_update.call_count, 0)
+
+    @patch('mongorest.collection.Collection.find_one_and_update')
+    def test_patch_returns_not_found_if_no_document_is_updated(
+            self, find_one_and_update):
+        find_one_and_update.return_value = None
+
+        errors = Collection({'_id': 1, 'test': 1}, partial=True).patch()
+
+        self.assertEqual(errors['error_type'], 'DocumentNotFoundError')
+
+    @patch('mongorest.collection.Collection.after_update')
+    @patch('mongorest.collection.Collection.find_one')
+    @patch('mongorest.collection.Collection.find_one_and_update')
+    def test_patch_updates_with_a_single_find_one_and_update(
+            self, find_one_and_update, find_one, after_update):
+        old = {'_id': 1, 'test': 1, 'other': 1, 'unset': 1}
+        find_one_and_update.return_value = old
+
+        patched = Collection({'_id': 1, 'test': 2}, partial=True).patch(
+            unset=['unset']
+        )
+
+        self.assertEqual(patched, {'_id': 1, 'test': 2, 'other': 1})
+        find_one_and_update.assert_called_once_with(
+            {'_id': 1}, {'$set': {'test': 2}, '$unset': {'unset': ''}}
+        )
+        self.assertEqual(find_one.call_count, 0)
+        after_update.assert_called_once_with(old=old)
+
+    @patch('mongorest.collection.Collection.find_one_and_update')
+    def test_patch_merges_nested_documents_field_by_field(
+            self, find_one_and_update):
+        find_one_and_update.return_value = {
+            '_id': 1, 'a': {'b': 1, 'c': 1, 'd': {'e': 1}, 'h': {'i': 1}},
+            'f': 1,
+        }
+        Collection.schema = {
+            'a': {'type': 'dict', 'schema': {
+                'b': {'type': 'integer'}, 'c': {'required': True},
+                'd': {'type': 'dict'},
+            }},
+        }
+
+        patched = Collection(
+            {'_id': 1, 'a': {'b': 2, 'd': {'g': 1}, 'h': {}}}, partial=True
+        ).patch(unset=['a.d.e'])
+
+        Collection.schema = {}
+
+        find_one_and_update.assert_called_once_with(
+            {'_id': 1},
+            {'$set': {'a.b': 2, 'a.d.g': 1}, '$unset': {'a.d.e': ''}}
+        )
+        self.assertEqual(
+            patched,
+            {
+                '_id': 1, 'a': {'b': 2, 'c': 1, 'd': {'g': 1}, 'h': {'i': 1}},
+                'f': 1,
+            }
+        )
+
+    @patch('mongorest.collection.Collection.find_one_and_update')
+    def test_patch_returns_errors_if_nested_unset_fields_are_not_valid(
+            self, find_one_and_update):
+        Collection.schema = {
+            'a': {'type': 'dict', 'schema': {'b': {'required': True}}},
+            'c': {'type': 'dict', 'readonly': True},
+        }
+        Collection.allow_unknown = False
+
+        errors = Collection({'_id': 1}, partial=True).patch(
+            unset=['a.b', 'a.x', 'c.d', 'a..b']
+        )
+
+        Collection.schema = {}
+        Collection.allow_unknown = True
+
+        self.assertEqual(
+            [(error['error_type'], error['field']) for error in errors['errors']],
+            [
+                ('UnknownFieldError', 'a..b'),
+                ('RequiredFieldError', 'a.b'),
+                ('UnknownFieldError', 'a.x'),
+                ('ReadOnlyFieldError', 'c.d'),
+            ]
+        )
+        self.assertEqual(find_one_and_update.call_count, 0)
+
+    @patch('mongorest.collection.Collection.find_one')
+    @patch('mongorest.collection.Collection.find_one_and_update')
+    def test_patch_reads_old_document_if_before_update_is_overridden(
+            self, find_one_and_update, find_one):
+        class Test(Collection):
+            def before_update(self, old):
+                return {'error_code': 7} if old['test'] == 1 else None
+
+        find_one.return_value = {'_id': 1, 'test': 1}
+
+        self.assertEqual(
+            Test({'_id': 1, 'test': 2}, partial=True).patch(),
+            {'error_code': 7}
+        )
+        self.assertEqual(find_one_and_update.call_count, 0)
+
+    def test_patch_sets_and_unsets_the_fields_of_a_saved_document(self):
+        _id = Collection.insert_one({'test': 1, 'other': 1})
+
+        patched = Collection({'_id': _id, 'test': 2}, partial=True).patch(
+            unset=['other']
+        )
+
+        self.assertEqual(patched, {'_id': _id, 'test': 2})
+        self.assertEqual(Collection.find_one({'_id': _id}), patched)
+
     # delete
     def test_delete_is_decorated_with_serializable(self):
         self.assertIn('serializable', Collection.delete.decorators)
@@ -379,12 +595,11 @@ class TestCollection(TestCase):
             }
         )
 
+    @patch('mongorest.collection.Collection.before_delete', lambda self: {
+        'error_code': 9, 'error_type': 'RestrictedDelete',
+        'error_message': 'Document can not be deleted.'
+    })
     def test_delete_returns_before_if_before_update_returns_something(self):
-        Collection.before_delete = lambda self: {
-            'error_code': 9, 'error_type': 'RestrictedDelete',
-            'error_message': 'Document can not be deleted.'
-        }
-
         Collection({'_id': 1}).insert()
         errors = Collection({'_id': 1}).delete()
 
@@ -396,8 +611,6 @@ class TestCollection(TestCase):
             }
         )
 
-        Collection.before_delete = lambda self: None
-
     def test_delete_returns_errors_if_document_not_found(self):
         errors = Collection({'_id': 1}).delete()
 
@@ -412,6 +625,105 @@ class TestCollection(TestCase):
             }
         )
 
+    @patch('mongorest.collection.Collection.delete_one')
+    @patch('mongorest.collection.Collection.find_one')
+    def test_delete_only_deletes_if_before_delete_is_not_overridden(
+            self, find_one, delete_one):
+        delete_one.return_value = {'n': 1, 'ok': 1}
+
+        deleted = Collection({'_id': 1}).delete()
+
+        self.assertEqual(deleted, {'_id': 1})
+        delete_one.assert_called_once_with({'_id': 1})
+        self.assertEqual(find_one.call_count, 0)
+
+    @patch('mongorest.collection.Collection.after_delete')
+    @patch('mongorest.collection.Collection.delete_one')
+    def test_delete_returns_not_found_if_nothing_is_deleted(
+            self, delete_one, after_delete):
+        delete_one.return_value = {'n': 0, 'ok': 1}
+
+        errors = Collection({'_id': 1}).delete()
+
+        self.assertEqual(errors['error_type'], 'DocumentNotFoundError')
+        self.assertEqual(after_delete.call_count, 0)
+
+    @patch('mongorest.collection.Collection.delete_one')
+    @patch('mongorest.collection.Collection.find_one_and_delete')
+    @patch('mongorest.collection.Collection.collection')
+    def test_delete_uses_find_one_and_delete_if_writes_are_unacknowledged(
+            self, collection, find_one_and_delete, delete_one):
+        collection.write_concern.acknowledged = False
+        find_one_and_delete.return_value = {'_id': 1}
+
+        self.assertEqual(Collection({'_id': 1}).delete(), {'_id': 1})
+        find_one_and_delete.assert_called_once_with({'_id': 1})
+        self.assertEqual(delete_one.call_count, 0)
+
+    # delete_by_id
+    def test_delete_by_id_is_decorated_with_serializable(self):
+        self.assertIn('serializable', Collection.delete_by_id.decorators)
+
+    @patch('mongorest.collection.Collection.validator')
+    @patch('mongorest.collection.Collection.find_one')
+    @patch('mongorest.collection.Collection.find_one_and_delete')
+    def test_delete_by_id_deletes_with_a_single_find_one_and_delete(
+            self, find_one_and_delete, find_one, validator):
+        find_one_and_delete.return_value = {'_id': 1, 'test': 1}
+
+        deleted = Collection.delete_by_id(1)
+
+        self.assertEqual(deleted, {'_id': 1, 'test': 1})
+        find_one_and_delete.assert_called_once_with({'_id': 1})
+        self.assertEqual(find_one.call_count, 0)
+        self.assertEqual(validator.validate_document.call_count, 0)
+
+    @patch('mongorest.collection.Collection.find_one_and_delete')
+    def test_delete_by_id_returns_not_found_if_nothing_is_deleted(
+            self, find_one_and_delete):
+        find_one_and_delete.return_value = None
+
+        errors = Collection.delete_by_id(1)
+
+        self.assertEqual(errors['error_type'], 'DocumentNotFoundError')
+
+    @patch('mongorest.collection.Collection.validator')
+    @patch('mongorest.collection.Collection.delete_one')
+    @patch('mongorest.collection.Collection.find_one')
+    @patch('mongorest.collection.Collection.find_one_and_delete')
+    def test_delete_by_id_runs_callbacks_if_they_are_overridden(
+            self, find_one_and_delete, find_one, delete_one, validator):
+        deleted = []
+
+        class Test(Collection):
+            def after_delete(self):
+                deleted.append(self._id)
+
+        find_one.return_value = {'_id': 1}
+        delete_one.return_value = {'n': 1, 'ok': 1}
+
+        self.assertEqual(Test.delete_by_id(1), {'_id': 1})
+        self.assertEqual(deleted, [1])
+        find_one.assert_called_once_with(
+            {'_id': 1}, read_preference='primary', cache=False
+        )
+        delete_one.assert_called_once_with({'_id': 1})
+        self.assertEqual(find_one_and_delete.call_count, 0)
+        self.assertEqual(validator.validate_document.call_count, 0)
+
+    @patch('mongorest.collection.Collection.delete_one')
+    @patch('mongorest.collection.Collection.find_one')
+    def test_delete_by_id_does_not_delete_if_before_delete_returns_errors(
+            self, find_one, delete_one):
+        class Test(Collection):
+            def before_delete(self):
+                return {'error_code': 0}
+
+        find_one.return_value = {'_id': 1}
+
+        self.assertEqual(Test.delete_by_id(1), {'error_code': 0})
+        self.assertEqual(delete_one.call_count, 0)
+
     # find_one
     def test_find_one_is_decorated_with_serializable(self):
         self.assertIn('serializable', self.collection.find_one.decorators)
@@ -452,6 +764,75 @@ class TestCollection(TestCase):
 
         self.assertEqual(self.collection.aggregate([]), documents)
 
+    # insert_documents
+    def test_insert_documents_is_decorated_with_serializable(self):
+        self.assertIn(
+            'serializable', self.collection.insert_documents.decorators
+        )
+
+    def test_insert_documents_returns_document_or_errors_of_each_item(self):
+        class Book(Collection):
+            schema = {'name': {'required': True, 'type': 'string'}}
+
+        Book.insert_one({'_id': 2, 'name': 'b'})
+
+        results = Book.insert_documents([
+            Book({'_id': 1, 'name': 'a'}),
+            Book({'_id': 3}),
+            Book({'_id': 2, 'name': 'b'}),
+            Book({'_id': 4, 'name': 'd'}),
+        ], ordered=False)
+
+        self.assertEqual(results[0], {'_id': 1, 'name': 'a'})
+        self.assertEqual(results[1]['error_type'], 'DocumentValidationError')
+        self.assertEqual(results[2]['error_type'], 'PyMongoError')
+        self.assertEqual(results[3], {'_id': 4, 'name': 'd'})
+        self.assertEqual(Book.count(), 3)
+
+    def test_insert_documents_stops_at_first_failed_insertion_if_ordered(self):
+        self.collection.insert_one({'_id': 2})
+
+        results = self.collection.insert_documents([
+            Collection({'_id': 1}),
+            Collection({'_id': 2}),
+            Collection({'_id': 3}),
+        ])
+
+        self.assertEqual(results[0], {'_id': 1})
+        self.assertEqual(results[1]['error_type'], 'PyMongoError')
+        self.assertEqual(
+            results[2]['error_message'],
+            'Not inserted because a previous document could not be inserted.'
+        )
+        self.assertEqual(self.collection.count(), 2)
+
+    @patch('mongorest.collection.Collection.insert_many')
+    def test_insert_documents_inserts_in_batches_of_bulk_batch_size(self, insert_many):
+        with patch('mongorest.collection.settings') as settings:
+            settings.BULK_BATCH_SIZE = 2
+            self.collection.insert_documents(
+                [Collection({'_id': i}) for i in range(5)], False
+            )
+
+        self.assertEqual(
+            [len(call[0][0]) for call in insert_many.call_args_list], [2, 2, 1]
+        )
+        self.assertEqual(insert_many.call_args[0][1], False)
+
+    @patch('mongorest.collection.Collection.after_insert')
+    @patch('mongorest.collection.Collection.before_insert')
+    def test_insert_documents_calls_insert_callbacks(self, before_insert, after_insert):
+        before_insert.side_effect = [None, {'error': 'before'}]
+
+        results = self.collection.insert_documents(
+            [Collection({'_id': 1}), Collection({'_id': 2})]
+        )
+
+        self.assertEqual(results, [{'_id': 1}, {'error': 'before'}])
+        self.assertEqual(before_insert.call_count, 2)
+        self.assertEqual(after_insert.call_count, 1)
+        self.assertEqual(self.collection.count(), 1)
+
     # insert_one
     def test_insert_one_is_decorated_with_serializable(self):
         self.assertIn('serializable', self.collection.insert_one.decorators)
@@ -515,6 +896,55 @@ class TestCollection(TestCase):
 
         self.assertEqual(self.collection.find_one().get('test'), 'test')
 
+    # find_one_and_update
+    def test_find_one_and_update_is_decorated_with_serializable(self):
+        self.assertIn(
+            'serializable', self.collection.find_one_and_update.decorators
+        )
+
+    def test_find_one_and_update_returns_the_document_before_the_update(self):
+        _id = self.collection.insert_one({'test': 1})
+
+        self.assertEqual(
+            self.collection.find_one_and_update(
+                {'_id': _id}, {'$set': {'test': 2}}
+            ),
+            {'_id': _id, 'test': 1}
+        )
+        self.assertEqual(self.collection.find_one()['test'], 2)
+
+    # find_one_and_replace
+    def test_find_one_and_replace_is_decorated_with_serializable(self):
+        self.assertIn(
+            'serializable', self.collection.find_one_and_replace.decorators
+        )
+
+    def test_find_one_and_replace_returns_the_document_before_replacing(self):
+        _id = self.collection.insert_one({'test': 1})
+
+        self.assertEqual(
+            self.collection.find_one_and_replace(
+                {'_id': _id}, {'_id': _id, 'test': 2}
+            ),
+            {'_id': _id, 'test': 1}
+        )
+        self.assertEqual(self.collection.find_one()['test'], 2)
+
+    # find_one_and_delete
+    def test_find_one_and_delete_is_decorated_with_serializable(self):
+        self.assertIn(
+            'serializable', self.collection.find_one_and_delete.decorators
+        )
+
+    def test_find_one_and_delete_returns_the_deleted_document(self):
+        _id = self.collection.insert_one({'test': 1})
+
+        self.assertEqual(
+            self.collection.find_one_and_delete({'_id': _id}),
+            {'_id': _id, 'test': 1}
+        )
+        self.assertIsNone(self.collection.find_one())
+
     # delete_one
     def test_delete_one_is_decorated_with_serializable(self):
         self.assertIn('serializable', self.collection.delete_one.decorators)
@@ -552,6 +982,163 @@ class TestCollection(TestCase):
         self.assertEqual(self.collection.count({'1': '2'}), 1)
         self.assertEqual(self.collection.count(), 4)
 
+    # cache
+    def test_cache_is_none_if_cache_size_is_not_set(self):
+        self.assertIsNone(self.collection.cache)
+
+    def test_cache_is_created_for_each_class_with_cache_size(self):
+        class CachedCollection(Collection):
+            cache_size = 10
+            cache_ttl = 30
+
+        class OtherCachedCollection(CachedCollection):
+            pass
+
+        self.assertEqual(CachedCollection.cache.size, 10)
+        self.assertEqual(CachedCollection.cache.ttl, 30)
+        self.assertIsNot(OtherCachedCollection.cache, CachedCollection.cache)
+
+    def test_find_one_returns_cached_document_until_a_write(self):
+        class CachedCollection(Collection):
+            cache_size = 10
+
+        _id = CachedCollection.insert_one({'test': 1})
+        CachedCollection.find_one(_id)
+        CachedCollection.collection.update_one(
+            {'_id': _id}, {'$set': {'test': 2}}
+        )
+
+        self.assertEqual(CachedCollection.find_one(_id)['test'], 1)
+        self.assertEqual(
+            CachedCollection.find_one(_id, cache=False)['test'], 2
+        )
+        self.assertEqual(
+            CachedCollection.cache.stats(), {'hits': 1, 'misses': 1, 'size': 1}
+        )
+
+        CachedCollection.update_one({'_id': _id}, {'$set': {'test': 3}})
+
+        self.assertEqual(CachedCollection.find_one(_id)['test'], 3)
+
+    @patch('mongorest.collection.watch')
+    def test_find_one_caches_documents_for_each_read_preference(self, watch):
+        class CachedCollection(Collection):
+            cache_size = 10
+
+        readers = {'primary': MagicMock(), 'secondary': MagicMock()}
+        for (mode, reader) in readers.items():
+            reader.read_preference.document = {'mode': mode}
+            reader.find_one.return_value = {'_id': 1, 'mode': mode}
+
+        with patch.object(
+            CachedCollection, 'reader',
+            side_effect=lambda read_preference, max_staleness: readers[
+                read_preference or 'primary'
+            ]
+        ):
+            for mode in ('secondary', 'primary', 'secondary', None):
+                self.assertEqual(
+                    CachedCollection.find_one(1, read_preference=mode),
+                    {'_id': 1, 'mode': mode or 'primary'}
+                )
+
+        self.assertEqual(
+            CachedCollection.cache.stats(), {'hits': 2, 'misses': 2, 'size': 2}
+        )
+
+    @patch('mongorest.collection.DocumentCache.clear')
+    @patch('mongorest.collection.DocumentCache.evict')
+    def test_writes_by_id_evict_the_document_and_others_clear_the_cache(
+            self, evict, clear):
+        class CachedCollection(Collection):
+            cache_size = 10
+
+        _id = CachedCollection.insert_one({})
+        CachedCollection.update_one({'_id': _id}, {'$set': {'test': 1}})
+        CachedCollection.replace_one({'_id': _id}, {})
+        CachedCollection.find_one_and_update(
+            {'_id': _id}, {'$set': {'test': 2}}
+        )
+        CachedCollection.find_one_and_replace({'_id': _id}, {'test': 2})
+        CachedCollection.delete_one({'_id': _id})
+
+        self.assertEqual(evict.call_args_list, [call(_id)] * 6)
+        self.assertEqual(clear.call_count, 0)
+
+        CachedCollection.insert_many([{'test': 2}])
+        CachedCollection.update_many({}, {'$set': {'test': 3}})
+        CachedCollection.find_one_and_delete({'test': 3})
+        CachedCollection.delete_many({})
+
+        self.assertEqual(evict.call_count, 6)
+        self.assertEqual(clear.call_count, 4)
+
+    # reader
+    def test_reader_returns_the_collection_if_no_read_preference(self):
+        self.assertIs(self.collection.reader(), self.collection.collection)
+
+    def test_reader_returns_collection_with_read_preference_and_max_staleness_of_the_class(self):
+        class SecondaryCollection(Collection):
+            default_read_preference = 'secondaryPreferred'
+            default_max_staleness = 120
+
+        reader = SecondaryCollection.reader()
+
+        self.assertEqual(reader.name, 'secondary_collection')
+        self.assertEqual(
+            reader.read_preference,
+            SecondaryPreferred(max_staleness=120)
+        )
+        self.assertIs(SecondaryCollection.reader(), reader)
+
+    def test_reader_returns_collection_with_given_read_preference(self):
+        class SecondaryCollection(Collection):
+            default_read_preference = 'secondaryPreferred'
+            default_max_staleness = 120
+
+        self.assertEqual(
+            SecondaryCollection.reader('primary').read_preference, Primary()
+        )
+        self.assertEqual(
+            SecondaryCollection.reader('nearest', 90).read_preference,
+            Nearest(max_staleness=90)
+        )
+
+    def test_reader_returns_collection_with_given_max_staleness_and_read_preference_of_the_class(self):
+        class SecondaryCollection(Collection):
+            default_read_preference = 'secondaryPreferred'
+            default_max_staleness = 120
+
+        self.assertEqual(
+            SecondaryCollection.reader(None, 90).read_preference,
+            SecondaryPreferred(max_staleness=90)
+        )
+
+    def test_reader_raises_value_error_if_max_staleness_has_no_read_preference(self):
+        with self.assertRaises(ValueError):
+            self.collection.reader(None, 90)
+
+    def test_read_preference_is_delegated_to_the_db_collection(self):
+        class SecondaryCollection(Collection):
+            default_read_preference = 'secondaryPreferred'
+
+        self.assertEqual(SecondaryCollection.read_preference, Primary())
+        self.assertEqual(
+            SecondaryCollection.reader().read_preference,
+            SecondaryPreferred()
+        )
+
+    @patch('mongorest.collection.Collection.reader')
+    def test_reads_use_the_reader_with_the_given_read_preference(self, reader):
+        self.collection.find_one({}, read_preference='secondary')
+        self.collection.find({}, read_preference='secondary')
+        self.collection.aggregate([], read_preference='secondary')
+        self.collection.count({}, read_preference='secondary')
+
+        self.assertEqual(reader.call_count, 4)
+        for call in reader.call_args_list:
+            self.assertEqual(call[0], ('secondary', None))
+
     # get
     def test_get_returns_a_collection_object_if_at_least_one_passes_filter(self):
         self.collection.insert_one({'test': 'test'})
@@ -1,9 +1,12 @@
 # -*- encoding: UTF-8 -*-
 from __future__ import absolute_import, unicode_literals
 
-from mongorest.collection import Collection
+from mock import patch
+
+from mongorest.collection import Collection, CollectionAttributes
+from mongorest.database import resolve
 from mongorest.testcase import TestCase
-from mongorest.validator import Validator
+from mongorest.validator import ThreadLocalValidator, Validator
 
 
 class TestCollectionMeta(TestCase):
@@ -12,8 +15,59 @@ class TestCollectionMeta(TestCase):
         self.assertEqual(Collection.collection, self.db['collection'])
         self.assertEqual(Collection.schema, {})
         self.assertTrue(Collection.allow_unknown)
-        self.assertIsInstance(Collection.validator, Validator)
+        self.assertIsInstance(Collection.validator, ThreadLocalValidator)
+        self.assertIsInstance(Collection.validator.validator, Validator)
+
+    def test_collection_meta_sets_attributes_table_of_the_collection(self):
+        Collection.drop_index
+
+        self.assertIsInstance(Collection._attributes, CollectionAttributes)
+        self.assertIs(
+            Collection._attributes.collection, resolve(Collection.collection)
+        )
+        self.assertIn('drop_index', Collection._attributes.callables)
+
+    def test_collection_meta_builds_attributes_table_on_first_use(self):
+        class TestCollection(Collection):
+            pass
+
+        self.assertIsNone(TestCollection._attributes)
+
+        TestCollection.drop_index
+
+        self.assertIsInstance(TestCollection._attributes, CollectionAttributes)
+
+    def test_get_attr_rebuilds_attributes_table_after_a_fork(self):
+        Collection.drop_index
+        attributes = Collection._attributes
+
+        with patch('os.getpid', return_value=-1):
+            Collection.drop_index
+
+            self.assertIsNot(Collection._attributes, attributes)
+            self.assertIs(
+                Collection._attributes.collection,
+                resolve(Collection.collection)
+            )
 
     def test_get_attr_raises_exception_if_can_not_find_attr(self):
         with self.assertRaises(AttributeError):
             Collection._()
+
+    def test_get_attr_returns_same_attribute_without_listing_the_collection(self):
+        Collection.drop_index
+
+        with patch('mongorest.database.ConnectionFailureProxy.__dir__') as dir:
+            self.assertIs(Collection.drop_index, Collection.drop_index)
+            self.assertEqual(dir.call_count, 0)
+
+    def test_get_attr_rebuilds_attributes_table_if_collection_changes(self):
+        class TestCollection(Collection):
+            pass
+
+        TestCollection.collection = self.db['test_collection']
+
+        self.assertEqual(TestCollection.full_name, 'mongorest.test_collection')
+        self.assertEqual(
+            TestCollection._attributes.collection, self.db['test_collection']
+        )
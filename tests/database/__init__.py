@@ -2,3 +2,6 @@
 from __future__ import absolute_import, unicode_literals
 
 from .database import *
+from .circuit_breaker import *
+from .recovery import *
+from .retry_budget import *
@@ -0,0 +1,161 @@
+# -*- encoding: UTF-8 -*-
+from __future__ import absolute_import, unicode_literals
+
+from os import environ
+
+from mock import Mock, patch
+from pymongo.errors import ConnectionFailure
+
+from mongorest.database import (
+    CircuitBreaker,
+    CircuitOpenError,
+    ConnectionFailureProxy,
+)
+from mongorest.testcase import TestCase
+from tests.fixtures import circuit_breaker_test_settings
+
+__all__ = [
+    'TestCircuitBreaker',
+]
+
+
+class TestCircuitBreaker(TestCase):
+
+    def setUp(self):
+        environ['MONGOREST_SETTINGS_MODULE'] = 'tests.fixtures.circuit_breaker_test_settings'
+        circuit_breaker_test_settings.changes[:] = []
+
+        self.breaker = CircuitBreaker('localhost:27017')
+
+    def tearDown(self):
+        environ.pop('MONGOREST_SETTINGS_MODULE', None)
+
+    def test_circuit_breaker_starts_closed_and_allows_calls(self):
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+        self.assertTrue(self.breaker.allow())
+
+    def test_circuit_breaker_opens_after_failure_threshold(self):
+        self.breaker.failed()
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+
+        self.breaker.failed()
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+        self.assertFalse(self.breaker.allow())
+
+    def test_circuit_breaker_success_resets_failures(self):
+        self.breaker.failed()
+        self.breaker.succeeded()
+        self.breaker.failed()
+
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+
+    @patch('mongorest.database.time.time')
+    def test_circuit_breaker_is_half_open_after_recovery_time_and_allows_only_probes(self, time):
+        time.return_value = 100
+        self.breaker.failed()
+        self.breaker.failed()
+
+        time.return_value = 110
+
+        self.assertTrue(self.breaker.allow())
+        self.assertEqual(self.breaker.state, CircuitBreaker.HALF_OPEN)
+        self.assertFalse(self.breaker.allow())
+
+    @patch('mongorest.database.time.time')
+    def test_circuit_breaker_closes_if_probe_succeeds(self, time):
+        time.return_value = 100
+        self.breaker.failed()
+        self.breaker.failed()
+
+        time.return_value = 110
+        self.breaker.allow()
+        self.breaker.succeeded()
+
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+        self.assertTrue(self.breaker.allow())
+
+    @patch('mongorest.database.time.time')
+    def test_circuit_breaker_reopens_if_probe_fails(self, time):
+        time.return_value = 100
+        self.breaker.failed()
+        self.breaker.failed()
+
+        time.return_value = 110
+        self.breaker.allow()
+        self.breaker.failed()
+
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+        self.assertFalse(self.breaker.allow())
+
+    @patch('mongorest.database.time.time')
+    def test_circuit_breaker_reports_state_changes_to_listener(self, time):
+        time.return_value = 100
+        self.breaker.failed()
+        self.breaker.failed()
+
+        time.return_value = 110
+        self.breaker.allow()
+        self.breaker.succeeded()
+
+        self.assertEqual(
+            circuit_breaker_test_settings.changes,
+            [('closed', 'open'), ('open', 'half-open'), ('half-open', 'closed')]
+        )
+
+    @patch('mongorest.database.ConnectionFailureProxy._recover')
+    def test_proxy_stops_retrying_and_fails_fast_once_circuit_is_open(self, recover):
+        calls = []
+
+        def fail():
+            calls.append(1)
+            raise ConnectionFailure()
+
+        proxy = ConnectionFailureProxy(fail, self.breaker)
+
+        with self.assertRaises(ConnectionFailure):
+            proxy()
+
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(recover.call_count, 1)
+
+        with self.assertRaises(CircuitOpenError):
+            proxy()
+
+        self.assertEqual(len(calls), 2)
+
+    @patch('mongorest.database.ConnectionFailureProxy._recover')
+    def test_proxy_raises_the_connection_failure_if_listener_raises(self, recover):
+        def fail():
+            raise ConnectionFailure()
+
+        self.breaker.listener = Mock(side_effect=RuntimeError())
+
+        with patch.object(self.breaker, 'logger') as logger:
+            with self.assertRaises(ConnectionFailure):
+                ConnectionFailureProxy(fail, self.breaker)()
+
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+        self.assertEqual(logger.exception.call_count, 1)
+
+    def test_circuit_breaker_raises_value_error_if_listener_is_not_found(self):
+        with patch.dict(
+            circuit_breaker_test_settings.CIRCUIT_BREAKER,
+            {'LISTENER': 'tests.fixtures.circuit_breaker_test_settings.missing'}
+        ):
+            with self.assertRaises(ValueError):
+                CircuitBreaker('localhost:27017')
+
+    def test_circuit_breaker_is_disabled_by_default(self):
+        environ.pop('MONGOREST_SETTINGS_MODULE')
+        breaker = CircuitBreaker('localhost:27017')
+
+        for _ in range(10):
+            breaker.failed()
+
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+        self.assertTrue(breaker.allow())
+
+    def test_child_proxies_share_the_circuit_breaker(self):
+        proxy = ConnectionFailureProxy({'collection': len}, self.breaker)
+
+        self.assertIs(proxy['collection'].breaker, self.breaker)
@@ -2,8 +2,15 @@
 from __future__ import absolute_import, unicode_literals
 
 from os import environ
+from types import GeneratorType
 
-from mongorest.database import db, _get_db, ConnectionFailureProxy
+from mock import patch
+from pymongo.errors import ConnectionFailure
+
+from mongorest.collection import Collection
+from mongorest.database import (
+    db, get_db, resolve, _get_db, ConnectionFailureProxy, LazyProxy
+)
 from mongorest.testcase import TestCase
 
 
@@ -38,3 +45,215 @@ class TestDatabase(TestCase):
         self.assertEqual(database.client.HOST, 'localhost')
         self.assertEqual(database.client.PORT, 27017)
         self.assertEqual(database.name, 'mongorest-test')
+
+    def test_get_db_returns_db_if_no_name_is_given(self):
+        self.assertIs(get_db(), db)
+
+    def test_get_db_returns_named_database_from_databases_setting(self):
+        environ['MONGOREST_SETTINGS_MODULE'] = 'tests.fixtures.database_test_databases_settings'
+
+        analytics, reports = get_db('analytics'), get_db('reports')
+
+        self.assertEqual(analytics.name, 'mongorest-analytics')
+        self.assertEqual(reports.name, 'mongorest-reports')
+        self.assertIsNot(analytics.client, db.client)
+        self.assertIsNot(analytics.client, reports.client)
+
+        environ.pop('MONGOREST_SETTINGS_MODULE')
+
+    def test_get_db_creates_each_named_database_once(self):
+        environ['MONGOREST_SETTINGS_MODULE'] = 'tests.fixtures.database_test_databases_settings'
+
+        self.assertIs(get_db('analytics'), get_db('analytics'))
+
+        environ.pop('MONGOREST_SETTINGS_MODULE')
+
+    def test_get_db_raises_error_if_name_is_not_on_databases_setting(self):
+        with self.assertRaises(ValueError):
+            get_db('invalid').name
+
+    def test_get_db_does_not_create_the_client_until_first_use(self):
+        with patch('mongorest.database._get_db') as get:
+            database = get_db('lazy')
+            collection = database['collection']
+
+            self.assertIsInstance(collection, LazyProxy)
+            self.assertEqual(get.call_count, 0)
+
+            collection.find_one
+
+            self.assertEqual(get.call_count, 1)
+            get.return_value.__getitem__.assert_called_once_with('collection')
+
+    def test_lazy_proxy_creates_its_proxy_once_per_process(self):
+        proxy = LazyProxy(lambda: ConnectionFailureProxy(object()))
+
+        self.assertIs(resolve(proxy), resolve(proxy))
+
+    def test_lazy_proxy_creates_its_proxy_again_after_a_fork(self):
+        proxy = LazyProxy(lambda: ConnectionFailureProxy(object()))
+        resolved = resolve(proxy)
+
+        with patch('os.getpid', return_value=-1):
+            self.assertIsNot(resolve(proxy), resolved)
+            self.assertIs(resolve(proxy), resolve(proxy))
+
+    def test_lazy_proxy_items_are_created_again_after_a_fork(self):
+        collection = db['collection']
+        client = resolve(collection).proxied.database.client
+
+        with patch('os.getpid', return_value=-1):
+            self.assertIsNot(
+                resolve(collection).proxied.database.client, client
+            )
+            self.assertEqual(resolve(collection).full_name, 'mongorest.collection')
+
+    def test_resolve_returns_other_objects_as_they_are(self):
+        proxy = ConnectionFailureProxy(object())
+
+        self.assertIs(resolve(proxy), proxy)
+
+    def test_collection_is_bound_to_the_named_database(self):
+        environ['MONGOREST_SETTINGS_MODULE'] = 'tests.fixtures.database_test_databases_settings'
+
+        class Event(Collection):
+            database_name = 'analytics'
+
+        class PageView(Event):
+            pass
+
+        self.assertEqual(Event.collection.full_name, 'mongorest-analytics.event')
+        self.assertEqual(
+            PageView.collection.full_name, 'mongorest-analytics.page_view'
+        )
+
+        environ.pop('MONGOREST_SETTINGS_MODULE')
+
+    def test_collection_database_is_delegated_to_the_db_collection(self):
+        environ['MONGOREST_SETTINGS_MODULE'] = 'tests.fixtures.database_test_databases_settings'
+
+        class Event(Collection):
+            database_name = 'analytics'
+
+        self.assertEqual(Event.database.name, 'mongorest-analytics')
+        self.assertEqual(Collection.database.name, 'mongorest')
+
+        environ.pop('MONGOREST_SETTINGS_MODULE')
+
+    def test_getattr_returns_cached_proxy_of_callable_attributes(self):
+        self.assertIs(db.collection, db.collection)
+        self.assertIs(db.collection.find_one, db.collection.find_one)
+
+    def test_getattr_does_not_cache_non_callable_attributes(self):
+        self.assertEqual(db.name, 'mongorest')
+        self.assertNotIn('name', db._attributes)
+
+    def test_getitem_returns_cached_proxy_of_callable_items(self):
+        self.assertIs(db['collection'], db['collection'])
+
+    def test_cached_proxies_are_bounded_by_cache_size(self):
+        proxy = ConnectionFailureProxy(db.proxied)
+        proxy.cache_size = 2
+
+        first = proxy['first']
+        proxy['second'], proxy['third']
+
+        self.assertEqual(list(proxy._items.keys()), ['second', 'third'])
+        self.assertIsNot(proxy['first'], first)
+
+    def test_stream_returns_lazy_iterator_of_documents_ordered_by_id(self):
+        db.collection.insert_many([{'_id': 3}, {'_id': 1}, {'_id': 2}])
+
+        documents = db.collection.find(stream=True)
+
+        self.assertIsInstance(documents, GeneratorType)
+        self.assertEqual(list(documents), [{'_id': 1}, {'_id': 2}, {'_id': 3}])
+
+    def test_stream_respects_filter_skip_and_limit(self):
+        db.collection.insert_many([{'_id': i, 'even': not i % 2} for i in range(10)])
+
+        documents = db.collection.find(
+            {'even': True}, stream=True, skip=1, limit=2
+        )
+
+        self.assertEqual(
+            list(documents),
+            [{'_id': 2, 'even': True}, {'_id': 4, 'even': True}]
+        )
+
+    @patch('mongorest.database.ConnectionFailureProxy._recover')
+    def test_stream_resumes_after_last_yielded_id_on_connection_failure(self, recover):
+        db.collection.insert_many([{'_id': i} for i in range(1, 6)])
+        specs = []
+
+        def find(spec, *args, **kwargs):
+            specs.append(spec)
+            cursor = db.collection.proxied.find(spec, *args, **kwargs)
+
+            return InterruptedCursor(cursor) if len(specs) == 1 else cursor
+
+        documents = list(ConnectionFailureProxy(find)(stream=True))
+
+        self.assertEqual(documents, [{'_id': i} for i in range(1, 6)])
+        self.assertEqual(
+            specs, [{}, {'$and': [{}, {'$or': [{'_id': {'$gt': 2}}]}]}]
+        )
+        self.assertEqual(recover.call_count, 1)
+
+    @patch('mongorest.database.ConnectionFailureProxy._recover')
+    def test_stream_resumes_after_last_yielded_sort_key_on_connection_failure(self, recover):
+        db.collection.insert_many(
+            [{'_id': i, 'group': i % 2} for i in range(1, 6)]
+        )
+        specs = []
+
+        def find(spec, *args, **kwargs):
+            specs.append(spec)
+            cursor = db.collection.proxied.find(spec, *args, **kwargs)
+
+            return InterruptedCursor(cursor) if len(specs) == 1 else cursor
+
+        documents = list(ConnectionFailureProxy(find)(
+            stream=True, sort=[('group', -1)], projection={'group': 0}
+        ))
+
+        self.assertEqual(documents, [{'_id': i} for i in (1, 3, 5, 2, 4)])
+        self.assertEqual(
+            specs[1],
+            {'$and': [{}, {'$or': [
+                {'$or': [{'group': {'$lt': 1}}, {'group': None}]},
+                {'group': 1, '_id': {'$gt': 3}},
+            ]}]}
+        )
+        self.assertEqual(recover.call_count, 1)
+
+    def test_stream_raises_type_error_if_call_does_not_return_a_cursor(self):
+        with self.assertRaises(TypeError):
+            db.collection.find_one(stream=True)
+
+
+class InterruptedCursor(object):
+
+    def __init__(self, cursor, after=2, error=ConnectionFailure):
+        self.cursor = cursor
+        self.after = after
+        self.error = error
+
+    def sort(self, *args, **kwargs):
+        self.cursor.sort(*args, **kwargs)
+        return self
+
+    def skip(self, *args, **kwargs):
+        self.cursor.skip(*args, **kwargs)
+        return self
+
+    def limit(self, *args, **kwargs):
+        self.cursor.limit(*args, **kwargs)
+        return self
+
+    def __iter__(self):
+        for i, document in enumerate(self.cursor):
+            if i == self.after:
+                raise self.error()
+
+            yield document
@@ -0,0 +1,113 @@
+# -*- encoding: UTF-8 -*-
+from __future__ import absolute_import, unicode_literals
+
+from os import environ
+from threading import Thread
+
+from mock import Mock, patch
+from pymongo.errors import AutoReconnect
+
+from mongorest.database import ConnectionFailureProxy, db
+from mongorest.testcase import TestCase
+
+__all__ = [
+    'TestRecovery',
+]
+
+
+class TestRecovery(TestCase):
+
+    def setUp(self):
+        environ['MONGOREST_SETTINGS_MODULE'] = 'tests.fixtures.database_test_recovery_settings'
+
+        self.mongo_client = db.proxied.client
+        self.proxy = ConnectionFailureProxy(db.collection.proxied.find_one)
+
+        db.collection.insert_one({'_id': 1})
+
+    def tearDown(self):
+        environ.pop('MONGOREST_SETTINGS_MODULE', None)
+
+    def pool(self):
+        return self.mongo_client._topology.select_server_by_address(
+            ('localhost', 27017)
+        ).pool
+
+    @patch('mongorest.database.time.sleep')
+    def test_recover_keeps_in_flight_operations_on_the_failed_server(self, sleep):
+        results = []
+        in_flight = Thread(
+            target=lambda: results.append(
+                db.collection.find_one({'$where': 'sleep(200) || true'})
+            )
+        )
+
+        in_flight.start()
+        in_flight.join(0.1)
+        self.assertTrue(in_flight.is_alive())
+
+        with patch.object(
+            self.mongo_client, 'close', wraps=self.mongo_client.close
+        ) as close, patch.object(
+            self.mongo_client, '_reset_server_and_request_check',
+            wraps=self.mongo_client._reset_server_and_request_check
+        ) as reset:
+            self.proxy._recover(
+                1, AutoReconnect('localhost:27017: timed out')
+            )
+        in_flight.join()
+
+        self.assertEqual(close.call_count, 0)
+        reset.assert_called_once_with(('localhost', 27017))
+        self.assertEqual(results, [{'_id': 1}])
+        self.assertEqual(db.collection.find_one(), {'_id': 1})
+
+    @patch('mongorest.database.time.sleep')
+    def test_recover_keeps_the_pool_of_healthy_servers(self, sleep):
+        sockets = set(self.pool().sockets)
+
+        self.proxy._recover(1, AutoReconnect('otherhost:27017: timed out'))
+
+        self.assertTrue(sockets.issubset(self.pool().sockets))
+        self.assertEqual(db.collection.find_one(), {'_id': 1})
+
+    @patch('mongorest.database.time.sleep')
+    def test_recover_resets_only_the_pool_of_the_failed_server(self, sleep):
+        with patch.object(self.mongo_client, '_reset_server_and_request_check') as reset:
+            self.proxy._recover(1, AutoReconnect('otherhost:27017: timed out'))
+
+        reset.assert_called_once_with(('otherhost', 27017))
+
+    @patch('mongorest.database.time.sleep')
+    def test_recover_closes_client_if_failed_server_is_unknown(self, sleep):
+        with patch.object(self.mongo_client, 'close') as close:
+            self.proxy._recover(1, AutoReconnect('connection closed'))
+
+        self.assertEqual(close.call_count, 1)
+
+    @patch('mongorest.database.time.sleep')
+    def test_recover_closes_client_if_it_cannot_reset_a_server(self, sleep):
+        client = Mock(spec=['close'])
+
+        with patch.object(self.proxy, '_client', return_value=client):
+            self.proxy._recover(1, AutoReconnect('otherhost:27017: timed out'))
+
+        self.assertEqual(client.close.call_count, 1)
+
+    @patch('mongorest.database.time.sleep')
+    def test_recover_raises_value_error_if_recovery_mode_is_unknown(self, sleep):
+        environ['MONGOREST_SETTINGS_MODULE'] = 'tests.fixtures.database_test_invalid_recovery_settings'
+
+        with self.assertRaises(ValueError):
+            self.proxy._recover(1, AutoReconnect('otherhost:27017: timed out'))
+
+        self.assertEqual(sleep.call_count, 0)
+
+    @patch('mongorest.database.time.sleep')
+    def test_recover_closes_client_in_client_recovery_mode(self, sleep):
+        environ.pop('MONGOREST_SETTINGS_MODULE')
+
+        with patch.object(self.mongo_client, 'close') as close:
+            self.proxy._recover(1, AutoReconnect('otherhost:27017: timed out'))
+
+        self.assertEqual(close.call_count, 1)
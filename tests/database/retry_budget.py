@@ -0,0 +1,144 @@
+# -*- encoding: UTF-8 -*-
+from __future__ import absolute_import, unicode_literals
+
+import threading
+from os import environ
+
+from mock import PropertyMock, patch
+from pymongo.errors import AutoReconnect, ServerSelectionTimeoutError
+
+from mongorest.database import (
+    CircuitBreaker,
+    ConnectionFailureProxy,
+    RetryBudget,
+)
+from mongorest.testcase import TestCase
+
+__all__ = [
+    'TestRetryBudget',
+]
+
+
+class TestRetryBudget(TestCase):
+
+    def setUp(self):
+        environ['MONGOREST_SETTINGS_MODULE'] = 'tests.fixtures.database_test_retry_settings'
+        self.budget = RetryBudget()
+
+    def tearDown(self):
+        environ.pop('MONGOREST_SETTINGS_MODULE', None)
+
+    def test_retry_budget_starts_full(self):
+        self.assertTrue(self.budget.withdraw())
+        self.assertTrue(self.budget.withdraw())
+        self.assertFalse(self.budget.withdraw())
+
+    def test_retry_budget_deposits_ratio_of_a_token_per_call(self):
+        self.budget.withdraw()
+        self.budget.withdraw()
+
+        for _ in range(3):
+            self.budget.deposit()
+        self.assertFalse(self.budget.withdraw())
+
+        self.budget.deposit()
+        self.assertTrue(self.budget.withdraw())
+
+    def test_retry_budget_counts_the_calls_of_each_thread(self):
+        self.budget.withdraw()
+        self.budget.withdraw()
+
+        for _ in range(3):
+            self.budget.deposit()
+
+        thread = threading.Thread(target=self.budget.deposit)
+        thread.start()
+        thread.join()
+
+        self.assertFalse(self.budget.withdraw())
+        self.assertEqual(self.budget.local.calls, 3)
+
+    @patch(
+        'mongorest.database.RetryBudget.config', new_callable=PropertyMock,
+        return_value={'ENABLED': False}
+    )
+    def test_retry_budget_does_nothing_if_disabled(self, config):
+        with patch.object(self.budget, 'lock') as lock:
+            for _ in range(100):
+                self.budget.deposit()
+
+        self.assertIsNone(self.budget.tokens)
+        self.assertEqual(lock.__enter__.call_count, 0)
+
+    def test_retry_budget_does_not_exceed_capacity(self):
+        for _ in range(100):
+            self.budget.deposit()
+
+        self.assertEqual(self.budget.tokens, 2)
+
+    @patch('mongorest.database.ConnectionFailureProxy._recover')
+    @patch('mongorest.database.retry_budget', new_callable=RetryBudget)
+    def test_proxy_does_not_retry_once_retry_budget_is_exhausted(self, budget, recover):
+        calls = []
+
+        def find_one():
+            calls.append(1)
+            raise AutoReconnect()
+
+        with self.assertRaises(AutoReconnect):
+            ConnectionFailureProxy(find_one, CircuitBreaker())()
+
+        self.assertEqual(len(calls), 3)
+        self.assertEqual(recover.call_count, 2)
+
+    @patch('mongorest.database.ConnectionFailureProxy._recover')
+    def test_proxy_retries_writes_like_other_calls_by_default(self, recover):
+        calls = []
+
+        def insert_one():
+            calls.append(1)
+
+            if len(calls) == 1:
+                raise AutoReconnect()
+
+        ConnectionFailureProxy(insert_one, CircuitBreaker())()
+
+        self.assertEqual(len(calls), 2)
+
+    @patch('mongorest.database.ConnectionFailureProxy._recover')
+    def test_proxy_does_not_retry_writes_if_write_retry_limit_is_0(self, recover):
+        environ['MONGOREST_SETTINGS_MODULE'] = 'tests.fixtures.database_test_write_retry_settings'
+        calls = []
+
+        def insert_one():
+            calls.append(1)
+            raise AutoReconnect()
+
+        with self.assertRaises(AutoReconnect):
+            ConnectionFailureProxy(insert_one, CircuitBreaker())()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(recover.call_count, 0)
+
+    @patch('mongorest.database.ConnectionFailureProxy._recover')
+    def test_proxy_retries_writes_if_no_server_could_be_selected(self, recover):
+        environ['MONGOREST_SETTINGS_MODULE'] = 'tests.fixtures.database_test_write_retry_settings'
+        calls = []
+
+        def insert_one():
+            calls.append(1)
+
+            if len(calls) == 1:
+                raise ServerSelectionTimeoutError()
+
+        ConnectionFailureProxy(insert_one, CircuitBreaker())()
+
+        self.assertEqual(len(calls), 2)
+
+    @patch('mongorest.database.time.sleep')
+    @patch('mongorest.database.random.uniform', return_value=0.5)
+    def test_recover_sleeps_for_a_full_jitter_of_the_backoff(self, uniform, sleep):
+        ConnectionFailureProxy(len)._recover(3)
+
+        uniform.assert_called_once_with(0, 4)
+        sleep.assert_called_once_with(0.5)
@@ -7,6 +7,7 @@ from .pymongo_error import *
 from .document_error import *
 from .unidentified_document_error import *
 from .document_not_found_error import *
+from .invalid_document_error import *
 from .document_validation_error import *
 from .schema_validation_error import *
 from .unknown_field_error import *
@@ -21,3 +22,4 @@ from .value_not_allowed_error import *
 from .values_not_allowed_error import *
 from .min_value_error import *
 from .max_value_error import *
+from .invalid_page_token_error import *
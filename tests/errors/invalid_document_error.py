@@ -0,0 +1,21 @@
+# -*- encoding: UTF-8 -*-
+from __future__ import absolute_import, unicode_literals
+
+from mongorest.errors import InvalidDocumentError
+from mongorest.testcase import TestCase
+
+
+class TestInvalidDocumentError(TestCase):
+
+    def test_invalid_document_error_sets_correct_fields(self):
+        self.assertEqual(
+            InvalidDocumentError('collection', 1),
+            {
+                'error_code': 13,
+                'error_type': 'InvalidDocumentError',
+                'error_message': 'The given document from collection '
+                                 '\'collection\' is not an object.',
+                'collection': 'collection',
+                'document': 1,
+            }
+        )
@@ -0,0 +1,19 @@
+# -*- encoding: UTF-8 -*-
+from __future__ import absolute_import, unicode_literals
+
+from mongorest.errors import InvalidPageTokenError
+from mongorest.testcase import TestCase
+
+
+class TestInvalidPageTokenError(TestCase):
+
+    def test_invalid_page_token_error_sets_correct_fields(self):
+        self.assertEqual(
+            InvalidPageTokenError('token'),
+            {
+                'error_code': 100,
+                'error_type': 'InvalidPageTokenError',
+                'error_message': '\'token\' is not a valid page token.',
+                'page_token': 'token',
+            }
+        )
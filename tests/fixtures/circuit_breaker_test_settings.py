@@ -0,0 +1,16 @@
+# -*- encoding: UTF-8 -*-
+from __future__ import absolute_import, unicode_literals
+
+CIRCUIT_BREAKER = {
+    'ENABLED': True,
+    'FAILURE_THRESHOLD': 2,
+    'RECOVERY_TIME': 10,
+    'HALF_OPEN_PROBES': 1,
+    'LISTENER': 'tests.fixtures.circuit_breaker_test_settings.listener',
+}
+
+changes = []
+
+
+def listener(breaker, old_state, new_state):
+    changes.append((old_state, new_state))
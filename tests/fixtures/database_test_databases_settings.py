@@ -0,0 +1,11 @@
+# -*- encoding: UTF-8 -*-
+from __future__ import absolute_import, unicode_literals
+
+DATABASES = {
+    'analytics': {
+        'URI': 'mongodb://localhost:27017/mongorest-analytics',
+    },
+    'reports': {
+        'DATABASE': 'mongorest-reports',
+    },
+}
@@ -0,0 +1,16 @@
+# -*- encoding: UTF-8 -*-
+from __future__ import absolute_import, unicode_literals
+
+RETRY_JITTER = True
+
+WRITE_RETRY_LIMIT = None
+
+RETRY_BUDGET = {
+    'ENABLED': True,
+    'RATIO': 0.25,
+    'CAPACITY': 2,
+}
+
+CIRCUIT_BREAKER = {
+    'ENABLED': False,
+}
@@ -0,0 +1,4 @@
+# -*- encoding: UTF-8 -*-
+from __future__ import absolute_import, unicode_literals
+
+WRITE_RETRY_LIMIT = 0
@@ -0,0 +1,5 @@
+# -*- encoding: UTF-8 -*-
+from __future__ import absolute_import, unicode_literals
+
+PAGE_SIZE = 2
+MAX_PAGE_SIZE = 3
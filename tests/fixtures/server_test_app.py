@@ -0,0 +1,10 @@
+# -*- encoding: UTF-8 -*-
+from __future__ import absolute_import, unicode_literals
+
+import os
+
+
+def application(environ, start_response):
+    start_response(str('200 OK'), [(str('Content-Type'), str('text/plain'))])
+
+    return [str(os.getpid()).encode('utf-8')]
@@ -0,0 +1,7 @@
+# -*- encoding: UTF-8 -*-
+from __future__ import absolute_import, unicode_literals
+
+WARMUP = {
+    'ENABLED': True,
+    'MIN_CONNECTIONS': 2,
+}
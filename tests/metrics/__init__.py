@@ -0,0 +1,6 @@
+# -*- encoding: UTF-8 -*-
+from __future__ import absolute_import, unicode_literals
+
+from .command_listener import *
+from .histogram import *
+from .metrics import *
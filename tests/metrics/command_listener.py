@@ -0,0 +1,87 @@
+# -*- encoding: UTF-8 -*-
+from __future__ import absolute_import, unicode_literals
+
+from os import environ
+
+from mock import Mock, patch
+
+from mongorest.database import _get_db
+from mongorest.metrics import CommandListener, Metrics, listener
+from mongorest.testcase import TestCase
+
+__all__ = [
+    'TestCommandListener',
+]
+
+
+class TestCommandListener(TestCase):
+
+    def setUp(self):
+        environ['MONGOREST_SETTINGS_MODULE'] = 'tests.fixtures.metrics_test_settings'
+        self.metrics = Metrics()
+        self.listener = CommandListener(self.metrics)
+
+    def tearDown(self):
+        environ.pop('MONGOREST_SETTINGS_MODULE', None)
+
+    def event(self, command_name, command=None, **kwargs):
+        return Mock(
+            command_name=command_name, command=command or {},
+            connection_id=('localhost', 27017), request_id=1, **kwargs
+        )
+
+    def test_listener_records_succeeded_commands_of_their_collection(self):
+        self.listener.started(self.event('find', {'find': 'books'}))
+        self.listener.succeeded(
+            self.event('find', duration_micros=2500, reply={'ok': 1})
+        )
+
+        command = self.metrics.snapshot()['commands']['books.find']
+        self.assertEqual(command['latency']['sum'], 2.5)
+        self.assertEqual(command['reply_size']['sum'], 13)
+        self.assertEqual(self.listener.collections, {})
+
+    @patch('mongorest.metrics.BSON.encode')
+    def test_listener_does_not_encode_replies_by_default(self, encode):
+        environ.pop('MONGOREST_SETTINGS_MODULE')
+
+        self.listener.started(self.event('find', {'find': 'books'}))
+        self.listener.succeeded(
+            self.event('find', duration_micros=2500, reply={'ok': 1})
+        )
+
+        command = self.metrics.snapshot()['commands']['books.find']
+        self.assertEqual(command['reply_size']['count'], 0)
+        self.assertEqual(encode.call_count, 0)
+
+    def test_listener_records_get_more_commands_of_their_collection(self):
+        self.listener.started(
+            self.event('getMore', {'getMore': 1, 'collection': 'books'})
+        )
+        self.listener.succeeded(
+            self.event('getMore', duration_micros=1000, reply={})
+        )
+
+        self.assertIn('books.getMore', self.metrics.snapshot()['commands'])
+
+    def test_listener_records_failed_commands_as_errors(self):
+        self.listener.started(self.event('ping', {'ping': 1}))
+        self.listener.failed(self.event('ping', duration_micros=1000))
+
+        self.assertEqual(self.metrics.snapshot()['commands']['ping']['errors'], 1)
+
+    def test_get_db_registers_the_listener_if_metrics_are_enabled(self):
+        with patch('mongorest.database.MongoClient') as client:
+            _get_db()
+
+        self.assertEqual(
+            client.call_args[1]['event_listeners'], [listener]
+        )
+
+    def test_get_db_does_not_register_the_listener_by_default(self):
+        environ.pop('MONGOREST_SETTINGS_MODULE')
+
+        with patch('mongorest.database.MongoClient') as client:
+            _get_db()
+
+        self.assertEqual(client.call_args[1]['event_listeners'], [])
@@ -0,0 +1,28 @@
+# -*- encoding: UTF-8 -*-
+from __future__ import absolute_import, unicode_literals
+
+from mongorest.metrics import Histogram
+from mongorest.testcase import TestCase
+
+__all__ = [
+    'TestHistogram',
+]
+
+
+class TestHistogram(TestCase):
+
+    def test_observe_counts_the_value_on_its_bucket(self):
+        histogram = Histogram()
+
+        histogram.observe(0.5)
+        histogram.observe(1)
+        histogram.observe(3)
+        histogram.observe(20000)
+
+        snapshot = histogram.snapshot()
+        self.assertEqual(snapshot['count'], 4)
+        self.assertEqual(snapshot['sum'], 20004.5)
+        self.assertEqual(snapshot['buckets']['1'], 2)
+        self.assertEqual(snapshot['buckets']['5'], 1)
+        self.assertEqual(snapshot['buckets']['inf'], 1)
+        self.assertEqual(sum(snapshot['buckets'].values()), 4)
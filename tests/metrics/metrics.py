@@ -0,0 +1,87 @@
+# -*- encoding: UTF-8 -*-
+from __future__ import absolute_import, unicode_literals
+
+from os import environ
+
+from mock import PropertyMock, patch
+from mongorest.metrics import Metrics
+from mongorest.testcase import TestCase
+
+__all__ = [
+    'TestMetrics',
+]
+
+
+class TestMetrics(TestCase):
+
+    def setUp(self):
+        environ['MONGOREST_SETTINGS_MODULE'] = 'tests.fixtures.metrics_test_settings'
+        self.metrics = Metrics()
+
+    def tearDown(self):
+        environ.pop('MONGOREST_SETTINGS_MODULE', None)
+
+    def test_command_records_latency_errors_and_reply_size(self):
+        self.metrics.command('books', 'find', 3, 100)
+        self.metrics.command('books', 'find', 7, 300)
+        self.metrics.command('books', 'find', 2, failed=True)
+        self.metrics.command('', 'ping', 1, 10)
+
+        commands = self.metrics.snapshot()['commands']
+        self.assertEqual(set(commands), set(['books.find', 'ping']))
+        self.assertEqual(commands['books.find']['latency']['count'], 3)
+        self.assertEqual(commands['books.find']['latency']['sum'], 12)
+        self.assertEqual(commands['books.find']['errors'], 1)
+        self.assertEqual(
+            commands['books.find']['reply_size'],
+            {'count': 2, 'sum': 400, 'max': 300}
+        )
+
+    def test_request_attributes_its_commands_to_the_endpoint(self):
+        started = self.metrics.start_request('books')
+        self.metrics.command('books', 'find', 3)
+        self.metrics.command('books', 'find', 2)
+        self.metrics.command('authors', 'find', 5)
+        self.metrics.finish_request(started)
+
+        self.metrics.command('books', 'find', 100)
+
+        endpoint = self.metrics.snapshot()['endpoints']['books']
+        self.assertEqual(endpoint['requests']['count'], 1)
+        self.assertEqual(endpoint['database']['count'], 1)
+        self.assertEqual(endpoint['database']['sum'], 10)
+        self.assertEqual(
+            endpoint['commands'], {'books.find': 2, 'authors.find': 1}
+        )
+
+    def test_start_request_returns_none_if_metrics_are_disabled(self):
+        environ.pop('MONGOREST_SETTINGS_MODULE')
+
+        started = self.metrics.start_request('books')
+        self.metrics.finish_request(started)
+
+        self.assertIsNone(started)
+        self.assertEqual(self.metrics.snapshot()['endpoints'], {})
+
+    def test_config_reads_the_settings_once_for_each_settings_module(self):
+        with patch('mongorest.metrics.settings') as settings:
+            metrics = PropertyMock(return_value={'ENABLED': True})
+            type(settings).METRICS = metrics
+
+            self.assertTrue(self.metrics.enabled)
+            self.assertTrue(self.metrics.enabled)
+            self.assertEqual(metrics.call_count, 1)
+
+            environ.pop('MONGOREST_SETTINGS_MODULE')
+            metrics.return_value = {}
+
+            self.assertFalse(self.metrics.enabled)
+            self.assertEqual(metrics.call_count, 2)
+
+    def test_reset_forgets_the_metrics(self):
+        self.metrics.command('books', 'find', 3)
+        self.metrics.reset()
+
+        self.assertEqual(
+            self.metrics.snapshot(), {'commands': {}, 'endpoints': {}}
+        )
@@ -4,6 +4,8 @@ from __future__ import absolute_import, unicode_literals
 from .create_resource_mixin import *
 from .delete_resource_mixin import *
 from .list_resource_mixin import *
+from .metrics_resource import *
+from .patch_resource_mixin import *
 from .resource import *
 from .resource_meta import *
 from .retrieve_resource_mixin import *
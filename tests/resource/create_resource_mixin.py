@@ -81,3 +81,55 @@ class TestCreateResourceMixin(TestCase):
         self.assertEqual(response.status_code, 201)
         self.assertEqual(data, {'test': 1, '_id': 1})
         self.assertEqual(self.db.test.find_one({'_id': 1})['test'], 1)
+
+    def test_create_mixin_creates_each_document_of_a_list(self):
+        response = self.create_client.post(
+            '/', data=serialize([{'_id': 1, 'test': 1}, {'_id': 2, 'test': 2}])
+        )
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(
+            [document['_id'] for document in response.json], [1, 2]
+        )
+        self.assertIn('created_at', response.json[0])
+        self.assertEqual(self.db.test.count(), 2)
+
+    def test_create_mixin_returns_207_if_some_documents_of_a_list_fail(self):
+        response = self.create_client.post(
+            '/?ordered=false',
+            data=serialize([{'_id': 1}, {'_id': 2, 'test': 2}])
+        )
+
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual(
+            response.json[0]['error_type'], 'DocumentValidationError'
+        )
+        self.assertEqual(response.json[1]['_id'], 2)
+
+    def test_create_mixin_returns_400_if_all_documents_of_a_list_fail(self):
+        response = self.create_client.post('/', data=serialize([{}, {}]))
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(len(response.json), 2)
+
+    def test_create_mixin_returns_an_error_for_a_null_item_of_a_list(self):
+        response = self.create_client.post(
+            '/?ordered=false', data=serialize([None, {'_id': 2, 'test': 2}])
+        )
+
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual(
+            response.json[0]['error_type'], 'InvalidDocumentError'
+        )
+        self.assertEqual(response.json[1]['_id'], 2)
+        self.assertEqual(self.db.test.count(), 1)
+
+    def test_create_mixin_returns_an_error_for_a_scalar_item_of_a_list(self):
+        response = self.create_client.post('/', data=serialize([1, 'x']))
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            [error['error_type'] for error in response.json],
+            ['InvalidDocumentError', 'InvalidDocumentError']
+        )
+        self.assertEqual(self.db.test.count(), 0)
@@ -1,6 +1,7 @@
 # -*- encoding: UTF-8 -*-
 from __future__ import absolute_import, unicode_literals
 
+from mongorest.collection import Collection
 from mongorest.resource import DeleteResourceMixin
 from mongorest.testcase import TestCase
 from mongorest.wrappers import Response
@@ -56,3 +57,21 @@ class TestDeleteResourceMixin(TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.json, {'_id': 1})
         self.assertIsNone(self.db.collection.find_one({'_id': 1}))
+
+    def test_delete_does_not_validate_the_deleted_document(self):
+        class Test(Collection):
+            schema = {'test': {'required': True}}
+
+        class TestCollectionDelete(DeleteResourceMixin):
+            collection = Test
+
+        client = self.client(
+            WSGIDispatcher(resources=[TestCollectionDelete]), Response
+        )
+        self.db.test.insert_one({'_id': 1})
+
+        response = client.delete('/1/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json, {'_id': 1})
+        self.assertIsNone(self.db.test.find_one({'_id': 1}))
@@ -1,10 +1,18 @@
 # -*- encoding: UTF-8 -*-
 from __future__ import absolute_import, unicode_literals
 
+from datetime import datetime
+from os import environ
+
+from mock import Mock, patch
+from pymongo.errors import AutoReconnect
+
+from mongorest.database import ConnectionFailureProxy
 from mongorest.resource import ListResourceMixin
 from mongorest.testcase import TestCase
 from mongorest.wrappers import Response
 from mongorest.wsgi import WSGIDispatcher
+from tests.database.database import InterruptedCursor
 
 
 class TestListResourceMixin(TestCase):
@@ -15,6 +23,9 @@ class TestListResourceMixin(TestCase):
             Response
         )
 
+    def tearDown(self):
+        environ.pop('MONGOREST_SETTINGS_MODULE', None)
+
     def test_list_mixin_rule(self):
         rules = ListResourceMixin.rules
 
@@ -83,3 +94,237 @@ class TestListResourceMixin(TestCase):
                 {'number': 2, 'test': 2},
             ]
         )
+
+    def test_list_mixin_returns_first_page_and_next_page_token_if_more_documents_than_page_size(self):
+        environ['MONGOREST_SETTINGS_MODULE'] = 'tests.fixtures.list_resource_mixin_test_settings'
+        self.db.collection.insert_many([{'_id': i} for i in range(1, 6)])
+
+        response = self.documents_client.get('/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json, [{'_id': 1}, {'_id': 2}])
+        self.assertIn('X-Next-Page-Token', response.headers)
+
+    def test_list_mixin_does_not_return_next_page_token_on_last_page(self):
+        environ['MONGOREST_SETTINGS_MODULE'] = 'tests.fixtures.list_resource_mixin_test_settings'
+        self.db.collection.insert_many([{'_id': 1}, {'_id': 2}])
+
+        response = self.documents_client.get('/')
+
+        self.assertEqual(response.json, [{'_id': 1}, {'_id': 2}])
+        self.assertNotIn('X-Next-Page-Token', response.headers)
+
+    def test_list_mixin_returns_next_page_when_page_token_is_passed(self):
+        environ['MONGOREST_SETTINGS_MODULE'] = 'tests.fixtures.list_resource_mixin_test_settings'
+        self.db.collection.insert_many([{'_id': i} for i in range(1, 6)])
+
+        token = self.documents_client.get('/').headers['X-Next-Page-Token']
+        response = self.documents_client.get('/?page_token={0}'.format(token))
+
+        self.assertEqual(response.json, [{'_id': 3}, {'_id': 4}])
+
+        token = response.headers['X-Next-Page-Token']
+        response = self.documents_client.get('/?page_token={0}'.format(token))
+
+        self.assertEqual(response.json, [{'_id': 5}])
+        self.assertNotIn('X-Next-Page-Token', response.headers)
+
+    def test_list_mixin_paginates_on_sort_keys_with_id_as_tiebreaker(self):
+        environ['MONGOREST_SETTINGS_MODULE'] = 'tests.fixtures.list_resource_mixin_test_settings'
+        self.db.collection.insert_many([
+            {'_id': 1, 'number': 1}, {'_id': 2, 'number': 2},
+            {'_id': 3, 'number': 2}, {'_id': 4, 'number': 1},
+        ])
+
+        response = self.documents_client.get('/?sort={"number": -1}&project={"_id": 1}')
+
+        self.assertEqual(response.json, [{'_id': 2}, {'_id': 3}])
+
+        token = response.headers['X-Next-Page-Token']
+        response = self.documents_client.get(
+            '/?sort={{"number": -1}}&project={{"_id": 1}}&page_token={0}'.format(token)
+        )
+
+        self.assertEqual(response.json, [{'_id': 1}, {'_id': 4}])
+
+    def test_list_mixin_paginates_on_sort_keys_missing_from_documents(self):
+        environ['MONGOREST_SETTINGS_MODULE'] = 'tests.fixtures.list_resource_mixin_test_settings'
+        self.db.collection.insert_many([
+            {'_id': 1, 'number': 2}, {'_id': 2}, {'_id': 3, 'number': None},
+            {'_id': 4, 'number': 1}, {'_id': 5},
+        ])
+
+        for (sort, expected) in [
+            ('{"number": 1}', [2, 3, 5, 4, 1]),
+            ('{"number": -1}', [1, 4, 2, 3, 5]),
+        ]:
+            response = self.documents_client.get('/?sort={0}'.format(sort))
+            ids = [document['_id'] for document in response.json]
+
+            while 'X-Next-Page-Token' in response.headers:
+                response = self.documents_client.get(
+                    '/?sort={0}&page_token={1}'.format(
+                        sort, response.headers['X-Next-Page-Token']
+                    )
+                )
+                ids.extend(document['_id'] for document in response.json)
+
+            self.assertEqual(ids, expected)
+
+    def test_list_mixin_paginates_on_sort_keys_inside_excluded_fields(self):
+        environ['MONGOREST_SETTINGS_MODULE'] = 'tests.fixtures.list_resource_mixin_test_settings'
+        self.db.collection.insert_many([
+            {'_id': i, 'a': {'b': 4 - i}, 'c': i} for i in range(1, 4)
+        ])
+
+        response = self.documents_client.get('/?sort={"a.b": 1}&project={"a": 0}')
+
+        self.assertEqual(response.json, [{'_id': 3, 'c': 3}, {'_id': 2, 'c': 2}])
+
+        token = response.headers['X-Next-Page-Token']
+        response = self.documents_client.get(
+            '/?sort={{"a.b": 1}}&project={{"a": 0}}&page_token={0}'.format(token)
+        )
+
+        self.assertEqual(response.json, [{'_id': 1, 'c': 1}])
+
+    def test_list_mixin_uses_given_limit_up_to_max_page_size(self):
+        environ['MONGOREST_SETTINGS_MODULE'] = 'tests.fixtures.list_resource_mixin_test_settings'
+        self.db.collection.insert_many([{'_id': i} for i in range(1, 6)])
+
+        response = self.documents_client.get('/?limit=1')
+        self.assertEqual(response.json, [{'_id': 1}])
+
+        response = self.documents_client.get('/?limit=10')
+        self.assertEqual(response.json, [{'_id': 1}, {'_id': 2}, {'_id': 3}])
+
+    def test_list_mixin_returns_error_if_page_token_is_invalid(self):
+        response = self.documents_client.get('/?page_token=invalid')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.json,
+            {
+                'error_code': 100,
+                'error_type': 'InvalidPageTokenError',
+                'error_message': '\'invalid\' is not a valid page token.',
+                'page_token': 'invalid',
+            }
+        )
+
+    def test_list_mixin_streams_json_array_of_all_documents_if_streaming(self):
+        class StreamingResource(ListResourceMixin):
+            streaming = True
+
+        self.db.collection.insert_many([{'_id': i} for i in range(1, 4)])
+
+        response = self.client(
+            WSGIDispatcher(resources=[StreamingResource]), Response
+        ).get('/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, 'application/json')
+        self.assertNotIn('Content-Length', response.headers)
+        self.assertEqual(response.json, [{'_id': 1}, {'_id': 2}, {'_id': 3}])
+
+    def test_list_mixin_streams_ndjson_if_streaming_and_client_accepts_ndjson(self):
+        class StreamingResource(ListResourceMixin):
+            streaming = True
+
+        self.db.collection.insert_many([{'_id': 1, 'test': 1}, {'_id': 2, 'test': 2}])
+
+        response = self.client(
+            WSGIDispatcher(resources=[StreamingResource]), Response
+        ).get(
+            '/?project={"_id": 0}', headers={'Accept': 'application/x-ndjson'}
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, 'application/x-ndjson')
+        self.assertEqual(response.data, b'{"test": 1}\n{"test": 2}\n')
+
+    @patch('mongorest.database.ConnectionFailureProxy._recover')
+    def test_list_mixin_resumes_stream_if_connection_fails_mid_stream(self, recover):
+        class StreamingResource(ListResourceMixin):
+            streaming = True
+
+        self.db.collection.insert_many([{'_id': i} for i in range(1, 6)])
+        specs = []
+
+        def find(spec, *args, **kwargs):
+            specs.append(spec)
+            cursor = self.db.collection.proxied.find(spec, *args, **kwargs)
+
+            if len(specs) == 1:
+                return InterruptedCursor(cursor, error=AutoReconnect)
+
+            return cursor
+
+        with patch(
+            'mongorest.collection.Collection.reader',
+            return_value=Mock(find=ConnectionFailureProxy(find))
+        ):
+            response = self.client(
+                WSGIDispatcher(resources=[StreamingResource]), Response
+            ).get('/')
+
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.json, [{'_id': i} for i in range(1, 6)])
+
+        self.assertEqual(len(specs), 2)
+        self.assertEqual(recover.call_count, 1)
+
+    def test_list_mixin_returns_page_if_not_streaming_and_client_accepts_ndjson(self):
+        environ['MONGOREST_SETTINGS_MODULE'] = 'tests.fixtures.list_resource_mixin_test_settings'
+        self.db.collection.insert_many([{'_id': i} for i in range(1, 6)])
+
+        response = self.documents_client.get(
+            '/', headers={'Accept': 'application/x-ndjson'}
+        )
+
+        self.assertEqual(response.mimetype, 'application/json')
+        self.assertEqual(response.json, [{'_id': 1}, {'_id': 2}])
+        self.assertIn('X-Next-Page-Token', response.headers)
+
+    def test_list_mixin_returns_not_modified_if_etag_of_page_matches(self):
+        self.db.collection.insert_many([
+            {'_id': 1, 'updated_at': datetime(2020, 1, 1)},
+            {'_id': 2, 'updated_at': datetime(2020, 1, 1)},
+        ])
+        etag = self.documents_client.get('/').headers['ETag']
+
+        response = self.documents_client.get(
+            '/', headers={'If-None-Match': etag}
+        )
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.data, b'')
+
+    def test_list_mixin_returns_page_if_any_of_its_documents_changed(self):
+        self.db.collection.insert_many([
+            {'_id': 1, 'updated_at': datetime(2020, 1, 1)},
+            {'_id': 2, 'updated_at': datetime(2020, 1, 1)},
+        ])
+        etag = self.documents_client.get('/').headers['ETag']
+        self.db.collection.delete_one({'_id': 2})
+
+        response = self.documents_client.get(
+            '/', headers={'If-None-Match': etag}
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [document['_id'] for document in response.json], [1]
+        )
+
+    def test_list_mixin_returns_etag_of_body_if_documents_have_no_updated_at(self):
+        self.db.collection.insert_many([{'_id': 1}, {'_id': 2}])
+        etag = self.documents_client.get('/').headers['ETag']
+        self.db.collection.update_one({'_id': 1}, {'$set': {'test': 1}})
+
+        response = self.documents_client.get(
+            '/', headers={'If-None-Match': etag}
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers['ETag'], etag)
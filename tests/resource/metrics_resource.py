@@ -0,0 +1,68 @@
+# -*- encoding: UTF-8 -*-
+from __future__ import absolute_import, unicode_literals
+
+from os import environ
+
+from mock import patch
+
+from mongorest.metrics import metrics
+from mongorest.resource import ListResourceMixin, MetricsResource
+from mongorest.testcase import TestCase
+from mongorest.wrappers import Response
+from mongorest.wsgi import WSGIDispatcher
+
+
+class TestMetricsResource(TestCase):
+
+    def setUp(self):
+        environ['MONGOREST_SETTINGS_MODULE'] = 'tests.fixtures.metrics_test_settings'
+        metrics.reset()
+
+        self.metrics_client = self.client(
+            WSGIDispatcher(resources=[MetricsResource]), Response
+        )
+
+    def tearDown(self):
+        environ.pop('MONGOREST_SETTINGS_MODULE', None)
+        metrics.reset()
+
+    def test_metrics_resource_returns_the_metrics(self):
+        metrics.command('books', 'find', 3)
+
+        response = self.metrics_client.get('/metrics/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json['commands']['books.find']['errors'], 0
+        )
+
+    def test_metrics_resource_records_the_requests_of_each_endpoint(self):
+        self.metrics_client.get('/metrics/')
+
+        self.assertEqual(
+            metrics.snapshot()['endpoints']['metrics']['requests']['count'], 1
+        )
+
+    def test_metrics_resource_records_commands_of_streamed_responses(self):
+        class StreamingResource(ListResourceMixin):
+            endpoint = 'streaming'
+            streaming = True
+
+        def find(*args, **kwargs):
+            for _id in range(1, 3):
+                metrics.command('collection', 'getMore', 5)
+                yield {'_id': _id}
+
+        with patch('mongorest.collection.Collection.find', side_effect=find):
+            response = self.client(
+                WSGIDispatcher(resources=[StreamingResource]), Response
+            ).get('/streaming/', buffered=False)
+
+            self.assertNotIn('streaming', metrics.snapshot()['endpoints'])
+            self.assertEqual(response.json, [{'_id': 1}, {'_id': 2}])
+            response.close()
+
+        endpoint = metrics.snapshot()['endpoints']['streaming']
+        self.assertEqual(endpoint['requests']['count'], 1)
+        self.assertEqual(endpoint['database']['sum'], 10)
+        self.assertEqual(endpoint['commands'], {'collection.getMore': 2})
@@ -0,0 +1,176 @@
+# -*- encoding: UTF-8 -*-
+from __future__ import absolute_import, unicode_literals
+
+from mongorest.collection import Collection
+from mongorest.resource import PatchResourceMixin
+from mongorest.testcase import TestCase
+from mongorest.wrappers import Response
+from mongorest.utils import serialize
+from mongorest.wsgi import WSGIDispatcher
+
+
+class TestPatchResourceMixin(TestCase):
+
+    def setUp(self):
+        class Test(Collection):
+            schema = {
+                'test': {'required': True, 'type': 'integer'},
+                'other': {'type': 'integer'},
+                'nested': {'type': 'dict', 'schema': {
+                    'test': {'required': True, 'type': 'integer'},
+                    'other': {'type': 'integer'},
+                }},
+            }
+            allow_unknown = True
+
+        class TestCollectionPatch(PatchResourceMixin):
+            collection = Test
+
+        self.patch_client = self.client(
+            WSGIDispatcher(resources=[TestCollectionPatch]),
+            Response
+        )
+
+    def test_patch_mixin_rule(self):
+        rules = PatchResourceMixin.rules
+
+        self.assertEqual(len(rules), 1)
+        self.assertEqual(rules[0].rule, '/<_id>/')
+        self.assertEqual(rules[0].methods, set(['PATCH']))
+        self.assertEqual(rules[0].endpoint, 'patch')
+
+    def test_patch_mixin_url_map(self):
+        urls = list(PatchResourceMixin.url_map.iter_rules())
+
+        self.assertEqual(len(urls), 1)
+        self.assertEqual(urls[0].rule, '/<_id>/')
+        self.assertEqual(urls[0].methods, set(['PATCH']))
+        self.assertEqual(urls[0].endpoint, 'patch')
+
+    def test_patch_mixin_returns_errors_if_data_is_not_valid(self):
+        self.db.test.insert_one({'_id': 1, 'test': 1})
+
+        response = self.patch_client.patch(
+            '/1/', data=serialize({'test': '1'})
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json['error_type'], 'DocumentValidationError')
+        self.assertEqual(
+            response.json['errors'][0]['error_type'], 'FieldTypeError'
+        )
+        self.assertEqual(self.db.test.find_one({'_id': 1})['test'], 1)
+
+    def test_patch_mixin_returns_errors_if_required_field_is_unset(self):
+        self.db.test.insert_one({'_id': 1, 'test': 1})
+
+        response = self.patch_client.patch(
+            '/1/', data=serialize({'test': None})
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.json['errors'][0]['error_type'], 'RequiredFieldError'
+        )
+        self.assertEqual(self.db.test.find_one({'_id': 1})['test'], 1)
+
+    def test_patch_mixin_returns_not_found_if_no_document_matches_id(self):
+        response = self.patch_client.patch(
+            '/1/', data=serialize({'other': 1})
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.json,
+            {
+                'error_code': 12,
+                'error_type': 'DocumentNotFoundError',
+                'error_message': '1 is not a valid _id for a document from collection \'Test\'.',
+                'collection': 'Test',
+                '_id': 1,
+            }
+        )
+
+    def test_patch_mixin_validates_only_the_given_fields(self):
+        self.db.test.insert_one({'_id': 1, 'test': 1, 'extra': 'a'})
+
+        response = self.patch_client.patch(
+            '/1/', data=serialize({'other': 2})
+        )
+        data = response.json
+        data.pop('updated_at')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(data, {'_id': 1, 'test': 1, 'other': 2, 'extra': 'a'})
+
+    def test_patch_mixin_sets_and_unsets_fields(self):
+        self.db.test.insert_one({'_id': 1, 'test': 1, 'extra': 'a'})
+
+        response = self.patch_client.patch(
+            '/1/', data=serialize({'test': 2, 'extra': None})
+        )
+        data = response.json
+        data.pop('updated_at')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(data, {'_id': 1, 'test': 2})
+
+        saved = self.db.test.find_one({'_id': 1})
+        saved.pop('updated_at')
+        self.assertEqual(saved, {'_id': 1, 'test': 2})
+
+    def test_patch_mixin_merges_nested_objects(self):
+        self.db.test.insert_one(
+            {'_id': 1, 'test': 1, 'nested': {'test': 1, 'other': 1}}
+        )
+
+        response = self.patch_client.patch(
+            '/1/', data=serialize({'nested': {'other': None, 'extra': 2}})
+        )
+        data = response.json
+        data.pop('updated_at')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            data, {'_id': 1, 'test': 1, 'nested': {'test': 1, 'extra': 2}}
+        )
+
+        saved = self.db.test.find_one({'_id': 1})
+        saved.pop('updated_at')
+        self.assertEqual(saved, data)
+
+    def test_patch_mixin_returns_errors_if_nested_required_field_is_unset(self):
+        self.db.test.insert_one({'_id': 1, 'test': 1, 'nested': {'test': 1}})
+
+        response = self.patch_client.patch(
+            '/1/', data=serialize({'nested': {'test': None}})
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            [(error['error_type'], error['field']) for error in response.json['errors']],
+            [('RequiredFieldError', 'nested.test')]
+        )
+
+    def test_patch_mixin_keeps_nested_objects_patched_with_empty_objects(self):
+        self.db.test.insert_one({'_id': 1, 'test': 1, 'extra': {'a': 1}})
+
+        response = self.patch_client.patch(
+            '/1/', data=serialize({'test': 2, 'extra': {}})
+        )
+        data = response.json
+        data.pop('updated_at')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(data, {'_id': 1, 'test': 2, 'extra': {'a': 1}})
+
+        saved = self.db.test.find_one({'_id': 1})
+        saved.pop('updated_at')
+        self.assertEqual(saved, data)
+
+    def test_patch_mixin_returns_400_if_data_is_not_an_object(self):
+        response = self.patch_client.patch('/1/', data=serialize([1]))
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json['error_type'], 'InvalidDocumentError')
+        self.assertEqual(response.json['document'], [1])
@@ -1,6 +1,10 @@
 # -*- encoding: UTF-8 -*-
 from __future__ import absolute_import, unicode_literals
 
+from datetime import datetime
+
+from mock import patch
+
 from mongorest.resource import RetrieveResourceMixin
 from mongorest.testcase import TestCase
 from mongorest.wrappers import Response
@@ -56,3 +60,103 @@ class TestRetrieveResourceMixin(TestCase):
             response.json,
             {'_id': 1}
         )
+
+    def test_retrieve_mixin_returns_etag_and_last_modified_of_document(self):
+        self.db.collection.insert_one(
+            {'_id': 1, 'updated_at': datetime(2020, 1, 1, 12, 30, 15, 5000)}
+        )
+
+        response = self.retrieve_client.get('/1/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNotNone(response.headers.get('ETag'))
+        self.assertEqual(
+            response.headers['Last-Modified'], 'Wed, 01 Jan 2020 12:30:15 GMT'
+        )
+
+    def test_retrieve_mixin_returns_not_modified_if_etag_matches(self):
+        self.db.collection.insert_one(
+            {'_id': 1, 'updated_at': datetime(2020, 1, 1)}
+        )
+        etag = self.retrieve_client.get('/1/').headers['ETag']
+
+        with patch('mongorest.collection.Collection.find_one',
+                   return_value={'_id': 1, 'updated_at': datetime(2020, 1, 1)}
+                   ) as find_one:
+            response = self.retrieve_client.get(
+                '/1/', headers={'If-None-Match': etag}
+            )
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.data, b'')
+        self.assertEqual(response.headers['ETag'], etag)
+        find_one.assert_called_once_with(
+            {'_id': 1}, {'_id': 1, 'updated_at': 1},
+            read_preference=None, max_staleness=None
+        )
+
+    def test_retrieve_mixin_returns_document_if_etag_does_not_match(self):
+        self.db.collection.insert_one(
+            {'_id': 1, 'updated_at': datetime(2020, 1, 1)}
+        )
+        etag = self.retrieve_client.get('/1/').headers['ETag']
+        self.db.collection.update_one(
+            {'_id': 1}, {'$set': {'updated_at': datetime(2020, 1, 2)}}
+        )
+
+        response = self.retrieve_client.get(
+            '/1/', headers={'If-None-Match': etag}
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers['ETag'], etag)
+
+    def test_retrieve_mixin_returns_not_modified_if_not_modified_since(self):
+        self.db.collection.insert_one(
+            {'_id': 1, 'updated_at': datetime(2020, 1, 1, 12, 0, 0, 5000)}
+        )
+
+        not_modified = self.retrieve_client.get(
+            '/1/', headers={'If-Modified-Since': 'Wed, 01 Jan 2020 12:00:00 GMT'}
+        )
+        modified = self.retrieve_client.get(
+            '/1/', headers={'If-Modified-Since': 'Wed, 01 Jan 2020 11:59:59 GMT'}
+        )
+
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(modified.status_code, 200)
+
+    def test_retrieve_mixin_returns_etag_of_body_if_no_updated_at(self):
+        self.db.collection.insert_one({'_id': 1})
+        etag = self.retrieve_client.get('/1/').headers['ETag']
+
+        response = self.retrieve_client.get(
+            '/1/', headers={'If-None-Match': etag}
+        )
+
+        self.assertEqual(response.status_code, 304)
+        self.assertNotIn('Last-Modified', response.headers)
+
+    def test_retrieve_mixin_returns_headers_without_body_on_head(self):
+        self.db.collection.insert_one({'_id': 1})
+
+        response = self.retrieve_client.head('/1/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, b'')
+        self.assertIsNotNone(response.headers.get('ETag'))
+
+    @patch('mongorest.collection.Collection.find_one', return_value={'_id': 1})
+    def test_retrieve_mixin_reads_with_read_preference_of_the_resource(self, find_one):
+        class SecondaryResource(RetrieveResourceMixin):
+            read_preference = 'secondaryPreferred'
+            max_staleness = 120
+
+        response = self.client(
+            WSGIDispatcher(resources=[SecondaryResource]), Response
+        ).get('/1/')
+
+        self.assertEqual(response.status_code, 200)
+        find_one.assert_called_once_with(
+            {'_id': 1}, read_preference='secondaryPreferred', max_staleness=120
+        )
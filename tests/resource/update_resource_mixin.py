@@ -1,6 +1,8 @@
 # -*- encoding: UTF-8 -*-
 from __future__ import absolute_import, unicode_literals
 
+from mock import patch
+
 from mongorest.collection import Collection
 from mongorest.resource import UpdateResourceMixin
 from mongorest.testcase import TestCase
@@ -99,3 +101,11 @@ class TestUpdateResourceMixin(TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertEqual(data, {'_id': 1, 'test': 2})
         self.assertEqual(self.db.test.find_one({'_id': 1})['test'], 2)
+
+    @patch('mongorest.collection.Collection.find_one', return_value=None)
+    def test_update_mixin_does_not_read_the_document_from_the_cache(self, find_one):
+        self.update_client.put('/1/', data=serialize({'test': 2}))
+
+        find_one.assert_called_once_with(
+            {'_id': 1}, read_preference='primary', cache=False
+        )
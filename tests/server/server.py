@@ -0,0 +1,150 @@
+# -*- encoding: UTF-8 -*-
+from __future__ import absolute_import, unicode_literals
+
+import re
+import signal
+import socket
+import subprocess
+import sys
+import time
+from multiprocessing import cpu_count
+
+from mock import patch
+from six.moves.urllib.error import URLError
+from six.moves.urllib.request import urlopen
+
+from mongorest.__main__ import main
+from mongorest.server import Server
+from mongorest.testcase import TestCase
+from tests.fixtures.server_test_app import application
+
+
+class TestServer(TestCase):
+
+    def start(self, *args):
+        process = subprocess.Popen(
+            [
+                sys.executable, '-m', 'mongorest', 'serve',
+                'tests.fixtures.server_test_app.application', '--port', '0',
+                '--workers', '2'
+            ] + list(args),
+            stderr=subprocess.PIPE
+        )
+        self.addCleanup(process.wait)
+        self.addCleanup(process.terminate)
+
+        line = process.stderr.readline().decode('utf-8')
+        url = 'http://127.0.0.1:{0}/'.format(
+            re.search(r':(\d+) ', line).group(1)
+        )
+
+        for _ in range(50):
+            try:
+                urlopen(url)
+                break
+            except URLError:
+                time.sleep(0.1)
+
+        return process, url
+
+    def pids(self, url, requests=20):
+        return set(urlopen(url).read() for _ in range(requests))
+
+    def test_server_uses_server_setting_by_default(self):
+        server = Server(application)
+
+        self.assertEqual(server.host, '127.0.0.1')
+        self.assertEqual(server.port, 5000)
+        self.assertEqual(server.workers, cpu_count())
+        self.assertFalse(server.reuse_port)
+        self.assertEqual(server.graceful_timeout, 30)
+
+    def test_bind_returns_listening_socket(self):
+        sock = Server(application, port=0).bind()
+        self.addCleanup(sock.close)
+
+        self.assertNotEqual(sock.getsockname()[1], 0)
+        self.assertTrue(
+            sock.getsockopt(socket.SOL_SOCKET, socket.SO_ACCEPTCONN)
+        )
+
+    def test_bind_sets_reuse_port_if_reuse_port(self):
+        if not hasattr(socket, 'SO_REUSEPORT'):
+            self.skipTest('SO_REUSEPORT is not supported')
+
+        sock = Server(application, port=0, reuse_port=True).bind()
+        self.addCleanup(sock.close)
+
+        self.assertTrue(
+            sock.getsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT)
+        )
+
+    def test_reap_forgets_exited_workers_and_kills_the_late_ones(self):
+        server = Server(application)
+        server.children = {1: 0, 2: 0}
+        server.stopping = {2: time.time() - 1}
+
+        with patch('os.waitpid', side_effect=[(1, 0), (0, 0)]), \
+                patch('os.kill') as kill:
+            server.reap()
+
+        self.assertEqual(list(server.children), [2])
+        kill.assert_called_once_with(2, signal.SIGKILL)
+
+    def test_main_exits_if_app_can_not_be_found(self):
+        with self.assertRaises(SystemExit):
+            main(['serve', 'tests.fixtures.invalid.application'])
+
+    def test_serve_serves_the_app_on_every_worker(self):
+        process, url = self.start()
+
+        self.assertEqual(len(self.pids(url)), 2)
+
+    def test_serve_serves_the_app_on_every_worker_with_reuse_port(self):
+        if not hasattr(socket, 'SO_REUSEPORT'):
+            self.skipTest('SO_REUSEPORT is not supported')
+
+        process, url = self.start('--reuse-port')
+
+        self.assertTrue(self.pids(url))
+
+    def test_serve_replaces_the_workers_on_sighup(self):
+        process, url = self.start()
+        pids = self.pids(url)
+
+        process.send_signal(signal.SIGHUP)
+        time.sleep(2)
+
+        self.assertFalse(self.pids(url) & pids)
+
+    def test_serve_stops_if_the_master_dies(self):
+        server = Server(application, port=0)
+        server.socket = server.bind()
+
+        with patch('mongorest.server.signal.signal'), \
+                patch('os.getppid', side_effect=[1, 1, 2]):
+            server.serve(master=1)
+
+        self.assertTrue(server.running)
+
+    def test_serve_warms_up_before_binding_the_socket_of_the_worker(self):
+        server, calls = Server(application, port=0, reuse_port=True), []
+        bind = server.bind
+
+        with patch('mongorest.server.signal.signal'), \
+                patch('os.getppid', return_value=2), \
+                patch('mongorest.server.warmup',
+                      side_effect=lambda *args: calls.append('warmup')), \
+                patch.object(server, 'bind',
+                             side_effect=lambda: calls.append('bind') or bind()):
+            server.serve(master=1)
+
+        self.assertEqual(calls, ['warmup', 'bind'])
+
+    def test_serve_stops_gracefully_on_sigterm(self):
+        process, url = self.start()
+        self.pids(url)
+
+        process.send_signal(signal.SIGTERM)
+
+        self.assertEqual(process.wait(), 0)
@@ -12,7 +12,25 @@ class TestSettings(TestCase):
     def test_settings_default_values(self):
         environ.pop('MONGOREST_SETTINGS_MODULE', None)
 
+        self.assertEqual(settings.ASYNC_WORKERS, 32)
         self.assertEqual(settings.AUTH_COLLECTION, '')
+        self.assertEqual(settings.BULK_BATCH_SIZE, 1000)
+
+        self.assertEqual(
+            settings.CACHE_WATCHER,
+            {'ENABLED': False, 'INTERVAL': 1, 'RETRY_TIME': 60}
+        )
+
+        self.assertEqual(
+            settings.CIRCUIT_BREAKER,
+            {
+                'ENABLED': False,
+                'FAILURE_THRESHOLD': 5,
+                'RECOVERY_TIME': 30,
+                'HALF_OPEN_PROBES': 1,
+                'LISTENER': '',
+            }
+        )
 
         self.assertIsNotNone(settings.CORS)
         self.assertEqual(
@@ -32,6 +50,11 @@ class TestSettings(TestCase):
             settings.CORS['Access-Control-Allow-Credentials'], 'true'
         )
 
+        self.assertEqual(settings.DATABASES, {})
+
+        self.assertEqual(
+            settings.METRICS, {'ENABLED': False, 'REPLY_SIZES': False}
+        )
         self.assertEqual(settings.MIDDLEWARES, [])
 
         self.assertIsNotNone(settings.MONGODB)
@@ -45,12 +68,35 @@ class TestSettings(TestCase):
         self.assertEqual(settings.MONGODB['DATABASE'], 'mongorest')
         self.assertEqual(settings.MONGODB['OPTIONS'], [])
 
+        self.assertEqual(settings.PAGE_SIZE, 100)
+        self.assertEqual(settings.MAX_PAGE_SIZE, 1000)
+
+        self.assertEqual(settings.RECOVERY_MODE, 'client')
         self.assertEqual(settings.RETRY_LIMIT, 5)
+        self.assertIsNone(settings.WRITE_RETRY_LIMIT)
         self.assertEqual(settings.BASE_RETRY_TIME, 2)
         self.assertEqual(settings.LINEAR_RETRIES, False)
+        self.assertEqual(settings.RETRY_JITTER, False)
+        self.assertEqual(
+            settings.RETRY_BUDGET,
+            {'ENABLED': False, 'RATIO': 0.1, 'CAPACITY': 10}
+        )
 
+        self.assertEqual(
+            settings.SERVER, {
+                'HOST': '127.0.0.1',
+                'PORT': 5000,
+                'WORKERS': 0,
+                'REUSE_PORT': False,
+                'GRACEFUL_TIMEOUT': 30,
+            }
+        )
         self.assertEqual(settings.SESSION_STORE, '')
 
+        self.assertEqual(
+            settings.WARMUP, {'ENABLED': False, 'MIN_CONNECTIONS': 1}
+        )
+
     def test_a_default_setting_can_be_overwritten(self):
         environ.pop('MONGOREST_SETTINGS_MODULE', None)
 
@@ -3,3 +3,4 @@ from __future__ import absolute_import, unicode_literals
 
 from .deserialize import *
 from .serialize import *
+from .serialize_stream import *
@@ -0,0 +1,36 @@
+# -*- encoding: UTF-8 -*-
+from __future__ import absolute_import, unicode_literals
+
+from bson.objectid import ObjectId
+from types import GeneratorType
+
+from mongorest.testcase import TestCase
+from mongorest.utils import serialize_stream
+
+
+class TestSerializeStream(TestCase):
+
+    def test_serialize_stream_returns_a_generator(self):
+        self.assertIsInstance(serialize_stream([]), GeneratorType)
+
+    def test_serialize_stream_of_empty_iterable_returns_empty_json_array(self):
+        self.assertEqual(list(serialize_stream(iter([]))), ['[]'])
+
+    def test_serialize_stream_returns_json_array_of_the_documents(self):
+        oid = ObjectId('0123456789ab0123456789ab')
+
+        self.assertEqual(
+            ''.join(serialize_stream(iter([{'_id': oid}, {'test': 1}]))),
+            '[{"_id": {"$oid": "0123456789ab0123456789ab"}}, {"test": 1}]'
+        )
+
+    def test_serialize_stream_returns_ndjson_of_the_documents_if_ndjson(self):
+        self.assertEqual(
+            ''.join(serialize_stream(iter([{'test': 1}, {'test': 2}]), True)),
+            '{"test": 1}\n{"test": 2}\n'
+        )
+
+    def test_serialize_stream_yields_a_chunk_whenever_chunk_size_is_reached(self):
+        chunks = list(serialize_stream([{'a': 1}] * 3, chunk_size=10))
+
+        self.assertEqual(chunks, ['[{"a": 1}, {"a": 1}', ', {"a": 1}', ']'])
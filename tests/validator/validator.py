@@ -1,16 +1,23 @@
 # -*- encoding: UTF-8 -*-
 from __future__ import absolute_import, unicode_literals
 
+import threading
+
 from bson.objectid import ObjectId
+from datetime import datetime
 from mock import patch
 
 from mongorest.collection import Collection
 from mongorest.errors import *
 from mongorest.testcase import TestCase
-from mongorest.validator import Validator
+from mongorest.validator import (
+    ErrorTranslator, ThreadLocalValidator, Validator, compile_schema
+)
 
 __all__ = [
     'TestValidator',
+    'TestThreadLocalValidator',
+    'TestErrorTranslator',
 ]
 
 
@@ -296,6 +303,116 @@ class TestValidator(TestCase):
             )
         )
 
+    def test_compile_schema_returns_same_errors_as_the_validator(self):
+        schemas = [
+            {'a': {'type': 'string', 'required': True, 'regex': '^[a-z]+$'}},
+            {'a': {'type': ['string', 'integer'], 'min': 3, 'maxlength': 2}},
+            {'a': {'nullable': True, 'allowed': ['x', 1]}, 'b': {'min': 2}},
+            {'a': {'readonly': True}, 'b': {'type': 'objectid'}},
+            {'a': {'type': 'list', 'schema': {'type': 'integer', 'max': 5}}},
+            {'a': {'type': 'dict', 'schema': {'b': {'required': True}}}},
+            {'a': {'type': 'dict', 'schema': {'b': {'type': 'integer'}}},
+             'b': {'type': 'datetime', 'empty': False}},
+        ]
+        values = [
+            None, '', 'ab', 'abc1', 1, 7, 2.5, True, [], [1, 9], ['x', 2],
+            {}, {'b': 1}, {'b': 'x', 'c': 1}, ObjectId(), datetime.utcnow(),
+        ]
+
+        for allow_unknown in (True, False):
+            for schema in schemas:
+                validator = Validator(schema, allow_unknown=allow_unknown)
+                check = compile_schema(validator, schema, allow_unknown)
+
+                for a in values:
+                    for b in values:
+                        document = {'a': a, 'b': b, 'c': a}
+                        validator.validate(document)
+
+                        self.assertEqual(
+                            check(document), validator.errors,
+                            (schema, document)
+                        )
+
+    def test_compile_schema_with_update_returns_same_errors_as_the_validator(self):
+        schemas = [
+            {'a': {'type': 'string', 'required': True}, 'b': {'min': 2}},
+            {'a': {'type': 'dict', 'schema': {'b': {'required': True}}}},
+            {'a': {'type': 'list', 'schema': {
+                'type': 'dict', 'schema': {'b': {'required': True}}
+            }}},
+        ]
+        values = [None, 'ab', 1, 7, [], [{}], [{'b': 1}], {}, {'b': 1}]
+
+        for schema in schemas:
+            validator = Validator(schema, allow_unknown=False)
+            check = compile_schema(validator, schema, False, True)
+
+            for a in values:
+                for document in ({'a': a}, {'b': a}, {}):
+                    validator.validate(document, update=True)
+
+                    self.assertEqual(
+                        check(document), validator.errors, (schema, document)
+                    )
+
+    def test_validate_document_does_not_check_required_fields_if_partial(self):
+        document = Collection({'other': 'a'}, partial=True)
+        document.schema = {
+            'test': {'required': True}, 'other': {'type': 'integer'}
+        }
+
+        self.assertFalse(self.validator.validate_document(document, True))
+        self.assertEqual(
+            self.validator.errors, {'other': 'must be of integer type'}
+        )
+
+        document = Collection({'other': 1}, partial=True)
+        document.schema = {
+            'test': {'required': True}, 'other': {'type': 'integer'}
+        }
+
+        self.assertTrue(self.validator.validate_document(document, True))
+        self.assertFalse(self.validator.validate_document(document))
+
+    def test_compile_schema_returns_none_if_schema_has_rules_not_compiled(self):
+        for schema in [
+            {'a': {'coerce': int}},
+            {'a': {'dependencies': ['b']}},
+            {'a': {'type': 'list', 'items': [{'type': 'string'}]}},
+            {'a': {'anyof': [{'type': 'string'}, {'type': 'integer'}]}},
+            {'a': {'type': 'dict', 'schema': {'b': {'coerce': int}}}},
+        ]:
+            self.assertIsNone(compile_schema(self.validator, schema, True))
+
+    def test_validate_document_uses_the_compiled_schema(self):
+        document = Collection({'test': 'a'})
+        document.schema = {'test': {'type': 'integer'}}
+
+        with patch('mongorest.validator.Validator.validate') as validate:
+            self.assertFalse(self.validator.validate_document(document))
+            self.assertEqual(validate.call_count, 0)
+
+        self.assertEqual(
+            self.validator.errors, {'test': 'must be of integer type'}
+        )
+        self.assertEqual(document.errors['errors'][0]['field'], 'test')
+
+    def test_validate_document_compiles_each_schema_once(self):
+        document = Collection({'test': 1})
+        document.schema = {'test': {'type': 'integer'}}
+
+        with patch('mongorest.validator.compile_schema',
+                   return_value=None) as compile:
+            self.validator.validate_document(document)
+            self.validator.validate_document(document, partial=True)
+            self.validator.validate_document(document)
+
+        self.assertEqual(compile.call_count, 2)
+        self.assertEqual(
+            [call[0][3:] for call in compile.call_args_list], [(), (True,)]
+        )
+
     @patch('mongorest.validator.Validator.flatten')
     def test_flattened_errors_returns_flaten_call(self, flatten):
         with self.validator.flattened_errors:
@@ -334,3 +451,147 @@ class TestValidator(TestCase):
         self.assertEqual(
             self.validator.get_field_schema('test.1'), {'type': 'integer'}
         )
+
+
+class TestThreadLocalValidator(TestCase):
+
+    def test_validator_is_created_once_for_each_thread(self):
+        validator = ThreadLocalValidator(schema={'test': {'type': 'integer'}})
+        validators = []
+
+        thread = threading.Thread(
+            target=lambda: validators.append(validator.validator)
+        )
+        thread.start()
+        thread.join()
+
+        self.assertIs(validator.validator, validator.validator)
+        self.assertIsNot(validators[0], validator.validator)
+        self.assertEqual(
+            validators[0].schema, {'test': {'type': 'integer'}}
+        )
+
+    def test_schema_is_compiled_once_for_all_threads(self):
+        schema = {'test': {'type': 'integer'}}
+        validator = ThreadLocalValidator(schema=schema)
+        validators = []
+
+        with patch('mongorest.validator.compile_schema') as compile:
+            thread = threading.Thread(
+                target=lambda: validators.append(validator.validator)
+            )
+            thread.start()
+            thread.join()
+
+            self.assertIs(
+                validators[0].compile(schema), validator.compile(schema)
+            )
+            self.assertEqual(compile.call_count, 0)
+
+    def test_attributes_are_the_ones_of_the_validator_of_the_thread(self):
+        validator = ThreadLocalValidator()
+
+        self.assertTrue(validator.validate({'test': 1}))
+        self.assertEqual(validator.document, {'test': 1})
+        self.assertTrue(validator.allow_unknown)
+
+    def test_documents_are_validated_concurrently(self):
+        class Test(Collection):
+            schema = {'test': {'type': 'integer', 'min': 0}}
+
+        results, barrier = {}, threading.Event()
+
+        def validate(i):
+            barrier.wait()
+            for _ in range(50):
+                document = Test({'test': i})
+                if document.is_valid != (i >= 0) or \
+                        (document.is_valid and document.test != i):
+                    results[i] = False
+                    return
+
+            results[i] = True
+
+        threads = [
+            threading.Thread(target=validate, args=(i,))
+            for i in range(-5, 5)
+        ]
+        for thread in threads:
+            thread.start()
+        barrier.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(results, dict((i, True) for i in range(-5, 5)))
+
+
+class TestErrorTranslator(TestCase):
+
+    def setUp(self):
+        self.translator = ErrorTranslator({
+            'name': {'type': 'string', 'maxlength': 10},
+            'author': {
+                'type': 'dict',
+                'schema': {'age': {'type': 'integer', 'min': 0}},
+            },
+            'tags': {'type': 'list', 'schema': {'type': 'string'}},
+        })
+
+    def test_paths_index_schemas_of_named_fields(self):
+        self.assertEqual(
+            self.translator.paths,
+            {
+                'name': {'type': 'string', 'maxlength': 10},
+                'author': {
+                    'type': 'dict',
+                    'schema': {'age': {'type': 'integer', 'min': 0}},
+                },
+                'author.age': {'type': 'integer', 'min': 0},
+                'tags': {'type': 'list', 'schema': {'type': 'string'}},
+            }
+        )
+
+    def test_field_schema_resolves_fields_that_are_not_indexed(self):
+        self.assertEqual(
+            self.translator.field_schema('tags.3'), {'type': 'string'}
+        )
+
+    def test_translate_returns_error_of_the_message(self):
+        self.assertEqual(
+            self.translator.translate('Book', 'author.age', 'min value is 0'),
+            MinValueError('Book', 'author.age', 0)
+        )
+        self.assertEqual(
+            self.translator.translate(
+                'Book', 'tags.3', 'must be of string type'
+            ),
+            FieldTypeError('Book', 'tags.3', 'string')
+        )
+        self.assertEqual(
+            self.translator.translate('Book', 'other', 'unknown field'),
+            UnknownFieldError('Book', 'other')
+        )
+
+    def test_translate_returns_none_if_message_has_no_error(self):
+        self.assertIsNone(
+            self.translator.translate('Book', 'name', 'null value not allowed')
+        )
+
+    def test_translate_caches_rule_of_each_field_and_message(self):
+        self.translator.translate('Book', 'name', 'max length is 10')
+
+        with patch('mongorest.validator.ERRORS', []):
+            self.assertEqual(
+                self.translator.translate('Book', 'name', 'max length is 10'),
+                MaxLengthError('Book', 'name', 10)
+            )
+
+    def test_translate_clears_cache_if_full(self):
+        self.translator.cache_size = 2
+
+        for field in ('a', 'b', 'c'):
+            self.translator.translate('Book', field, 'unknown field')
+
+        self.assertEqual(
+            list(self.translator.rules), [('c', 'unknown field')]
+        )
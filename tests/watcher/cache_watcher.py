@@ -0,0 +1,239 @@
+# -*- encoding: UTF-8 -*-
+from __future__ import absolute_import, unicode_literals
+
+import time
+import unittest
+from os import environ
+
+from bson.timestamp import Timestamp
+from mock import MagicMock, Mock, PropertyMock, patch
+
+from mongorest.cache import DocumentCache
+from mongorest.collection import Collection
+from mongorest.testcase import TestCase
+from mongorest.watcher import (
+    CacheWatcher, watch, _configs, _failures, _watchers
+)
+
+__all__ = [
+    'TestCacheWatcher',
+]
+
+
+class TestCacheWatcher(TestCase):
+
+    def setUp(self):
+        environ['MONGOREST_SETTINGS_MODULE'] = 'tests.fixtures.watcher_test_settings'
+
+        self.watcher = CacheWatcher(MagicMock(), 0.1)
+        self.books = Mock(cache=DocumentCache(10, 60))
+        self.authors = Mock(cache=DocumentCache(10, 60))
+        self.watcher.add(self.books, 'mongorest.books')
+        self.watcher.add(self.authors, 'other.authors')
+
+        for cache in (self.books.cache, self.authors.cache):
+            cache.get('1', lambda: {'_id': 1}, 1)
+            cache.get('2', lambda: {'_id': 2}, 2)
+            cache.get('filter', lambda: {'_id': 2})
+
+    def tearDown(self):
+        environ.pop('MONGOREST_SETTINGS_MODULE', None)
+        _configs.clear()
+        _failures.clear()
+        _watchers.clear()
+
+    def test_apply_evicts_written_document_from_caches_of_its_namespace(self):
+        for entry in [
+            {'op': 'i', 'ns': 'mongorest.books', 'o': {'_id': 1}},
+            {'op': 'u', 'ns': 'mongorest.books', 'o': {}, 'o2': {'_id': 1}},
+            {'op': 'd', 'ns': 'mongorest.books', 'o': {'_id': 1}},
+        ]:
+            self.setUp()
+            self.watcher.apply(entry)
+
+            self.assertEqual(list(self.books.cache._documents), ['2'])
+            self.assertEqual(len(self.authors.cache), 3)
+
+    def test_apply_clears_caches_of_the_database_of_a_command(self):
+        self.watcher.apply({
+            'op': 'c', 'ns': 'mongorest.$cmd', 'o': {'drop': 'books'}
+        })
+
+        self.assertEqual(len(self.books.cache), 0)
+        self.assertEqual(len(self.authors.cache), 3)
+
+    def test_apply_ignores_noops(self):
+        self.watcher.apply({'op': 'n', 'ns': '', 'o': {'msg': 'noop'}})
+
+        self.assertEqual(len(self.books.cache), 3)
+
+    def test_tail_clears_caches_if_oplog_does_not_have_the_missed_entries(self):
+        self.watcher.token = Timestamp(1, 0)
+        self.watcher.client['local']['oplog.rs'].find_one.return_value = {
+            'ts': Timestamp(2, 0)
+        }
+        self.watcher.client['local']['oplog.rs'].find.return_value \
+            .max_await_time_ms.return_value.alive = False
+
+        self.watcher.tail()
+
+        self.assertEqual(len(self.books.cache), 0)
+        self.assertEqual(len(self.authors.cache), 0)
+
+    def test_tail_resumes_after_the_last_entry_applied(self):
+        oplog = self.watcher.client['local']['oplog.rs']
+        oplog.find_one.return_value = {'ts': Timestamp(1, 0)}
+        cursor = oplog.find.return_value.max_await_time_ms.return_value
+        cursor.alive = True
+        cursor.__iter__.side_effect = lambda: iter([{
+            'ts': Timestamp(3, 0), 'op': 'd', 'ns': 'mongorest.books',
+            'o': {'_id': 1},
+        }])
+        self.watcher.token = Timestamp(2, 0)
+        self.watcher.running = True
+
+        with patch.object(self.watcher, 'apply') as apply:
+            apply.side_effect = lambda entry: self.watcher.stop()
+            self.watcher.tail()
+
+        self.assertEqual(self.watcher.token, Timestamp(3, 0))
+        self.assertEqual(
+            oplog.find.call_args[0], ({'ts': {'$gt': Timestamp(2, 0)}},)
+        )
+
+    def test_start_raises_value_error_if_not_connected_to_a_replica_set(self):
+        self.watcher.client.admin.command.return_value = {'ismaster': True}
+
+        with self.assertRaises(ValueError):
+            self.watcher.start()
+
+    def test_watch_returns_none_if_disabled(self):
+        environ.pop('MONGOREST_SETTINGS_MODULE')
+
+        class CachedCollection(Collection):
+            cache_size = 10
+
+        self.assertIsNone(watch(CachedCollection))
+
+    @patch('mongorest.watcher.CacheWatcher.start')
+    def test_watch_starts_one_watcher_for_each_client_and_process(self, start):
+        class CachedCollection(Collection):
+            cache_size = 10
+
+        class OtherCachedCollection(Collection):
+            cache_size = 10
+
+        watcher = watch(CachedCollection)
+
+        self.assertIs(watch(OtherCachedCollection), watcher)
+        self.assertEqual(start.call_count, 1)
+        self.assertEqual(
+            watcher.collections,
+            {
+                'mongorest.cached_collection': set([CachedCollection]),
+                'mongorest.other_cached_collection': set(
+                    [OtherCachedCollection]
+                ),
+            }
+        )
+
+        with patch('os.getpid', return_value=-1):
+            self.assertIsNot(watch(CachedCollection), watcher)
+
+        self.assertEqual(start.call_count, 2)
+
+    @patch('mongorest.watcher.CacheWatcher.start')
+    def test_watch_retries_a_watcher_that_could_not_be_started(self, start):
+        start.side_effect = ValueError('Watching caches requires a replica set')
+
+        class CachedCollection(Collection):
+            cache_size = 10
+
+        with patch('mongorest.watcher.logging.getLogger') as getLogger:
+            self.assertIs(watch(CachedCollection), False)
+            self.assertIs(watch(CachedCollection), False)
+
+            self.assertEqual(start.call_count, 1)
+            self.assertEqual(getLogger.return_value.exception.call_count, 1)
+
+            start.side_effect = None
+            with patch('mongorest.watcher.time.time', return_value=2 ** 40):
+                watcher = watch(CachedCollection)
+
+        self.assertIsInstance(watcher, CacheWatcher)
+        self.assertEqual(start.call_count, 2)
+        self.assertEqual(_failures, {})
+
+    @patch('mongorest.watcher.CacheWatcher.start')
+    def test_watch_reads_the_setting_once_for_each_collection(self, start):
+        class CachedCollection(Collection):
+            cache_size = 10
+
+        with patch('mongorest.watcher.settings') as settings:
+            cache_watcher = PropertyMock(return_value={'ENABLED': True})
+            type(settings).CACHE_WATCHER = cache_watcher
+
+            self.assertIsInstance(watch(CachedCollection), CacheWatcher)
+            self.assertIsInstance(watch(CachedCollection), CacheWatcher)
+            self.assertEqual(cache_watcher.call_count, 1)
+
+            environ.pop('MONGOREST_SETTINGS_MODULE')
+            cache_watcher.return_value = {}
+
+            self.assertIsNone(watch(CachedCollection))
+            self.assertEqual(cache_watcher.call_count, 2)
+
+    @patch('mongorest.watcher.CacheWatcher.stop')
+    @patch('mongorest.watcher.CacheWatcher.start')
+    def test_watch_keeps_the_first_watcher_started_for_a_client(
+            self, start, stop):
+        class CachedCollection(Collection):
+            cache_size = 10
+
+        def start_other(*args, **kwargs):
+            start.side_effect = None
+            watch(CachedCollection)
+
+        start.side_effect = start_other
+        watcher = watch(CachedCollection)
+
+        self.assertEqual(list(_watchers.values()), [watcher])
+        self.assertEqual(start.call_count, 2)
+        self.assertEqual(stop.call_count, 1)
+
+    @patch('mongorest.collection.Collection.reader')
+    @patch('mongorest.collection.watch', return_value=False)
+    def test_find_one_skips_the_cache_if_watcher_could_not_be_started(
+            self, watch, reader):
+        class CachedCollection(Collection):
+            cache_size = 10
+
+        reader.return_value.find_one.return_value = {'_id': 1}
+
+        self.assertEqual(CachedCollection.find_one(1), {'_id': 1})
+        self.assertEqual(CachedCollection.find_one(1), {'_id': 1})
+        self.assertEqual(reader.return_value.find_one.call_count, 2)
+        self.assertEqual(len(CachedCollection.cache), 0)
+
+    def test_watcher_evicts_documents_written_by_other_processes(self):
+        if not self.db.client.admin.command('ismaster').get('setName'):
+            raise unittest.SkipTest('Requires a replica set')
+
+        class CachedCollection(Collection):
+            cache_size = 10
+
+        _id = CachedCollection.insert_one({'test': 1})
+        CachedCollection.find_one(_id)
+
+        self.db['cached_collection'].update_one(
+            {'_id': _id}, {'$set': {'test': 2}}
+        )
+
+        deadline = time.time() + 5
+        while len(CachedCollection.cache) and time.time() < deadline:
+            time.sleep(0.1)
+
+        self.assertEqual(CachedCollection.find_one(_id)['test'], 2)
+
+        for watcher in _watchers.values():
+            watcher.stop()
@@ -3,3 +3,4 @@ from __future__ import absolute_import, unicode_literals
 
 from .wsgi_dispatcher import *
 from .wsgi_wrapper import *
+from .warmup import *
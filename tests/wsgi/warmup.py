@@ -0,0 +1,84 @@
+# -*- encoding: UTF-8 -*-
+from __future__ import absolute_import, unicode_literals
+
+from os import environ
+
+from mock import patch
+from pymongo.errors import AutoReconnect
+
+from mongorest.database import db
+from mongorest.resource import ListResourceMixin
+from mongorest.testcase import TestCase
+from mongorest.wrappers import Response
+from mongorest.wsgi import WSGIDispatcher, warmup
+
+
+class TestWarmup(TestCase):
+
+    def tearDown(self):
+        environ.pop('MONGOREST_SETTINGS_MODULE', None)
+
+    def test_warmup_opens_pooled_connections_to_the_database(self):
+        client = db.client
+        client.close()
+
+        warmup([ListResourceMixin], 2)
+
+        pool = client._topology.select_server_by_address(
+            ('localhost', 27017)
+        ).pool
+        self.assertGreaterEqual(len(pool.sockets), 1)
+
+    @patch('pymongo.database.Database.command')
+    def test_warmup_pings_each_client_once_per_connection(self, command):
+        warmup([ListResourceMixin], 3)
+
+        self.assertEqual(command.call_count, 3)
+        command.assert_called_with('ping')
+
+    @patch('pymongo.database.Database.command')
+    def test_warmup_does_not_ping_if_connections_is_zero(self, command):
+        warmup([ListResourceMixin], 0)
+
+        self.assertEqual(command.call_count, 0)
+
+    @patch('pymongo.database.Database.command', side_effect=AutoReconnect())
+    def test_warmup_does_not_raise_if_ping_fails(self, command):
+        warmup([ListResourceMixin], 1)
+
+        self.assertEqual(command.call_count, 1)
+
+    @patch('werkzeug.routing.Map.update')
+    def test_warmup_compiles_the_url_map_of_every_resource(self, update):
+        warmup([ListResourceMixin], 1)
+
+        self.assertEqual(update.call_count, 1)
+
+    @patch('mongorest.wsgi.warmup')
+    def test_wsgi_dispatcher_does_not_warmup_by_default(self, warmup):
+        app = WSGIDispatcher(resources=[ListResourceMixin])
+        self.client(app, Response).get('/')
+
+        self.assertEqual(warmup.call_count, 0)
+
+    @patch('mongorest.wsgi.warmup')
+    def test_wsgi_dispatcher_warms_up_resources_if_enabled(self, warmup):
+        environ['MONGOREST_SETTINGS_MODULE'] = 'tests.fixtures.wsgi_test_warmup_settings'
+
+        app = WSGIDispatcher(resources=[ListResourceMixin])
+        self.client(app, Response).get('/')
+        self.client(app, Response).get('/')
+
+        warmup.assert_called_once_with([ListResourceMixin], None)
+
+    @patch('mongorest.wsgi.warmup')
+    def test_wsgi_dispatcher_warms_up_again_in_forked_processes(self, warmup):
+        environ['MONGOREST_SETTINGS_MODULE'] = 'tests.fixtures.wsgi_test_warmup_settings'
+
+        app = WSGIDispatcher(resources=[ListResourceMixin])
+        self.client(app, Response).get('/')
+
+        with patch('mongorest.wsgi.os.getpid', return_value=-1):
+            self.client(app, Response).get('/')
+
+        self.assertEqual(warmup.call_count, 2)